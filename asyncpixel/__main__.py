@@ -0,0 +1,6 @@
+"""Run the caching proxy with ``python -m asyncpixel``."""
+
+from .server import main
+
+if __name__ == "__main__":
+    main()
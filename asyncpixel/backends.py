@@ -0,0 +1,274 @@
+"""Coordination backends shared by clients using the same api key.
+
+A backend holds the token bucket of a key and a cache of raw responses.
+Clients in different processes that use the same backend draw from one
+request budget and fill one cache. Other stores, such as a redis server,
+can be supported by implementing the Backend interface.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from .scheduler import TokenBucket
+
+
+def request_key(path: str, params: Mapping[str, Any]) -> str:
+    """Build the key identifying a request, leaving out the api key.
+
+    Args:
+        path (str): api path
+        params (Mapping[str, Any]): query parameters
+
+    Returns:
+        str: key shared by identical requests
+    """
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(params.items()) if name != "key"
+    )
+    return f"{path}?{query}"
+
+
+class Backend:
+    """Interface of the store shared between clients."""
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> float:
+        """Take a token from the shared bucket of a key.
+
+        Args:
+            key (str): bucket name
+            rate (float): tokens added per second
+            capacity (float): maximum tokens stored
+
+        Raises:
+            NotImplementedError: if not overridden
+        """
+        raise NotImplementedError
+
+    async def cache_get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Get a cached response body.
+
+        Args:
+            key (str): cache key
+
+        Raises:
+            NotImplementedError: if not overridden
+        """
+        raise NotImplementedError
+
+    async def cache_set(self, key: str, body: bytes, ttl: float) -> None:
+        """Cache a response body.
+
+        Args:
+            key (str): cache key
+            body (bytes): raw response body
+            ttl (float): seconds the body stays cached
+
+        Raises:
+            NotImplementedError: if not overridden
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release the resources of the backend."""
+
+
+class MemoryBackend(Backend):
+    """Backend kept in memory, shared by the clients of one process."""
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """Init object.
+
+        Args:
+            max_size (int, optional): responses cached at most, the oldest
+                are dropped first. Defaults to 10000.
+        """
+        self.max_size = max_size
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._cache: Dict[str, Tuple[bytes, float, float]] = {}
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> float:
+        """Take a token from the shared bucket of a key.
+
+        Args:
+            key (str): bucket name
+            rate (float): tokens added per second
+            capacity (float): maximum tokens stored
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is ready
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, capacity)
+        return bucket.take()
+
+    async def cache_get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Get a cached response body.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            Optional[Tuple[bytes, float]]: body and unix time it was stored,
+            None if missing or expired
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        body, stored, expires = entry
+        if expires <= time.time():
+            del self._cache[key]
+            return None
+        return body, stored
+
+    async def cache_set(self, key: str, body: bytes, ttl: float) -> None:
+        """Cache a response body.
+
+        Args:
+            key (str): cache key
+            body (bytes): raw response body
+            ttl (float): seconds the body stays cached
+        """
+        now = time.time()
+        self._cache.pop(key, None)
+        self._cache[key] = (body, now, now + ttl)
+        if len(self._cache) > self.max_size:
+            del self._cache[next(iter(self._cache))]
+
+
+class SQLiteBackend(Backend):
+    """Backend stored in a sqlite database shared by processes on a host.
+
+    Every operation is a short transaction run on a dedicated thread, the
+    bucket update takes the write lock so concurrent processes never hand
+    out the same token twice.
+    """
+
+    def __init__(self, path: str, purge_every: int = 1000) -> None:
+        """Init object.
+
+        Args:
+            path (str): database file, created if missing.
+            purge_every (int, optional): cache writes between removals of
+                expired responses. Defaults to 1000.
+        """
+        self.path = path
+        self.purge_every = purge_every
+        self._writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, body BLOB, stored REAL, expires REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, function: Callable, *args: Any) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    def _take_token(self, key: str, rate: float, capacity: float) -> float:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                delay = 0.0
+            else:
+                delay = (1 - tokens) / rate
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (key, tokens, now)
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return delay
+
+    async def take_token(self, key: str, rate: float, capacity: float) -> float:
+        """Take a token from the shared bucket of a key.
+
+        Args:
+            key (str): bucket name
+            rate (float): tokens added per second
+            capacity (float): maximum tokens stored
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is ready
+        """
+        return await self._run(self._take_token, key, rate, capacity)
+
+    def _cache_get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT body, stored FROM cache WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return (bytes(row[0]), row[1]) if row is not None else None
+
+    async def cache_get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Get a cached response body.
+
+        Args:
+            key (str): cache key
+
+        Returns:
+            Optional[Tuple[bytes, float]]: body and unix time it was stored,
+            None if missing or expired
+        """
+        return await self._run(self._cache_get, key)
+
+    def _cache_set(self, key: str, body: bytes, ttl: float) -> None:
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (key, body, now, now + ttl),
+        )
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            connection.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+    async def cache_set(self, key: str, body: bytes, ttl: float) -> None:
+        """Cache a response body.
+
+        Args:
+            key (str): cache key
+            body (bytes): raw response body
+            ttl (float): seconds the body stays cached
+        """
+        await self._run(self._cache_set, key, body, ttl)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await self._run(self._close)
+        self._executor.shutdown()
@@ -0,0 +1,90 @@
+"""Circuit breaker stopping requests while the api is down."""
+
+import enum
+import time
+from typing import Callable, Optional
+
+
+class CircuitState(enum.Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail at once, or are answered from stale cache entries, for
+    ``reset_timeout`` seconds. A single trial request is then let through,
+    closing the circuit when it succeeds and opening it again when it
+    fails. A trial that never reports back, such as a cancelled request,
+    is replaced by a new one after another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init object.
+
+        Args:
+            failure_threshold (int, optional): consecutive failures opening
+                the circuit. Defaults to 5.
+            reset_timeout (float, optional): seconds the circuit stays open
+                before a trial request. Defaults to 30.
+            clock (Callable[[], float], optional): time source.
+                Defaults to time.monotonic.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_at: Optional[float] = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit.
+
+        Returns:
+            CircuitState: state
+        """
+        if self.failures < self.failure_threshold:
+            return CircuitState.CLOSED
+        if self.clock() - self._opened_at < self.reset_timeout:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent, claiming the trial if so.
+
+        Returns:
+            bool: if the request may be sent
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.OPEN:
+            return False
+        now = self.clock()
+        if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+            return False
+        self._trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self._trial_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._trial_at = None
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._opened_at = self.clock()
@@ -1,19 +1,42 @@
 """A Python HypixelAPI wrapper."""
 
+import asyncio
+from concurrent.futures import Executor
+from contextlib import contextmanager
+import contextvars
 import datetime as dt
-from typing import Dict, List, Optional
+import functools
+import hashlib
+import json
+import re
+import time
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+)
 
 import aiohttp
 
-from .exceptions.exceptions import ApiNoSuccess, InvalidApiKey, RateLimitError
-from .models.auctions import Auction, Auction_item
-from .models.bazaar import (
-    Bazaar,
-    Bazaar_buy_summary,
-    Bazaar_item,
-    Bazaar_quick_status,
-    Bazaar_sell_summary,
+from .backends import Backend, MemoryBackend, request_key
+from .circuit import CircuitBreaker
+from .exceptions.exceptions import (
+    ApiNoSuccess,
+    CircuitOpen,
+    DeadlineExceeded,
+    InvalidApiKey,
+    RateLimitError,
 )
+from .latency import LatencyTracker
+from .models.auctions import Auction, Auction_item, Ended_auctions
+from .models.bazaar import Bazaar
 from .models.booster import Booster, Boosters
 from .models.friends import Friend
 from .models.games import Game
@@ -21,32 +44,327 @@ from .models.guild import Guild
 from .models.key import Key
 from .models.news import News
 from .models.player import Player
+from .models.profile import Profile
+from .models.raw import RawResponse
 from .models.status import Status
 from .models.watchdog import WatchDog
+from .names import NameIndex
+from .progression import network_level
+from .scheduler import AdaptiveLimiter, Priority, PriorityScheduler
+from .schema import (
+    AUCTION_ITEM,
+    BAZAAR_ITEM,
+    ENDED_AUCTION,
+    from_millis,
+    GAME,
+    GUILD,
+    PLAYER,
+)
 
 BASE_URL = "https://api.hypixel.net/"
 
+_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "asyncpixel_priority", default=None
+)
+_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "asyncpixel_deadline", default=None
+)
+
+# Hypixel starts every successful body with the success flag.
+_SUCCESS = re.compile(rb'\s*\{\s*"success"\s*:\s*true\b')
+
+# Keys whose cache hits are counted for refresh ahead before counts reset.
+_MAX_HIT_COUNTS = 10000
+
+T = TypeVar("T")
+
+
+def _is_success(body: bytes) -> bool:
+    """Check whether a body reports success, decoding it only if unusual.
+
+    Args:
+        body (bytes): undecoded response body
+
+    Returns:
+        bool: if the body has a true success flag
+    """
+    if _SUCCESS.match(body):
+        return True
+    try:
+        response = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(response, dict) and response.get("success") is True
+
+
+def _decode(body: bytes, build: Optional[Callable[[Dict], Any]] = None) -> Any:
+    """Decode and check a json body, then build a model from it.
+
+    Large bodies are decoded in an executor, so this only uses arguments
+    and module level functions that can be sent to another process.
+
+    Args:
+        body (bytes): undecoded response body
+        build (Callable[[Dict], Any], optional): builds the model from the
+            decoded response. Defaults to None which returns the response.
+
+    Returns:
+        Any: the decoded response or the model
+    """
+    response = json.loads(body)
+    Client._check(response)
+    return response if build is None else build(response)
+
+
+def _project(
+    build: Callable[..., T], fields: Optional[Collection[str]]
+) -> Callable[[Dict], T]:
+    """Bind a field projection to a model builder.
+
+    Args:
+        build (Callable[..., T]): builder taking the response and fields
+        fields (Collection[str], optional): model arguments to parse
+
+    Returns:
+        Callable[[Dict], T]: builder taking the response, still picklable
+    """
+    if fields is None:
+        return build
+    return functools.partial(build, fields=tuple(fields))
+
+
+def _bazaar(data: Dict, fields: Optional[Collection[str]] = None) -> Bazaar:
+    return Bazaar(
+        lastUpdated=from_millis(data["lastUpdated"]),
+        bazaar_items=BAZAAR_ITEM.parse_mapping(data["products"], fields),
+    )
+
+
+def _auction_page(data: Dict, fields: Optional[Collection[str]] = None) -> Auction:
+    return Auction(
+        page=data["page"],
+        totalPages=data["totalPages"],
+        totalAuctions=data["totalAuctions"],
+        lastUpdated=from_millis(data["lastUpdated"]),
+        auctions=AUCTION_ITEM.parse_many(data["auctions"], fields),
+    )
+
+
+def _ended_auctions(
+    data: Dict, fields: Optional[Collection[str]] = None
+) -> Ended_auctions:
+    return Ended_auctions(
+        lastUpdated=from_millis(data["lastUpdated"]),
+        auctions=ENDED_AUCTION.parse_many(data["auctions"], fields),
+    )
+
+
+def _games(data: Dict, fields: Optional[Collection[str]] = None) -> List[Game]:
+    return GAME.parse_many(data["games"], fields)
+
+
+def _player(data: Dict, fields: Optional[Collection[str]] = None) -> Player:
+    return PLAYER.parse(data["player"], fields)
 
-class Client:
-    """Client class for hypixel wrapper."""
 
-    def __init__(self, api_key: str) -> None:
+def _profile(data: Dict) -> Optional[Profile]:
+    profile = data["profile"]
+    return None if profile is None else Profile(profile)
+
+
+def _profiles(data: Dict) -> List[Profile]:
+    return [Profile(profile) for profile in data["profiles"] or []]
+
+
+class Client:
+    """Client class for hypixel wrapper.
+
+    Methods built on a declarative schema take ``fields`` to parse only
+    some model arguments: get_player, get_recent_games, the get_guild_by_*
+    methods, get_bazaar, auctions, get_auctions_ended and the
+    get_auction_from_* methods. The other methods always parse every
+    field.
+    """
+
+    # Priority of paths when neither the call nor the context sets one.
+    DEFAULT_PRIORITIES = {
+        "player": Priority.INTERACTIVE,
+        "status": Priority.INTERACTIVE,
+        "skyblock/auctions": Priority.BULK,
+    }
+
+    def __init__(
+        self,
+        api_key: str,
+        names: Optional[NameIndex] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        timeout: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_budget: float = 0.05,
+        backend: Optional[Backend] = None,
+        cache_ttl: Optional[Mapping[str, float]] = None,
+        offload_threshold: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0,
+        refresh_ahead: Optional[float] = None,
+        hot_after: int = 3,
+        breaker: Optional[CircuitBreaker] = None,
+        base_url: str = BASE_URL,
+    ) -> None:
         """Initialise base class by storing keys and creating session.
 
         Args:
             api_key (str): hypixel api key
+            names (NameIndex, optional): index of player names filled by
+                get_player. Defaults to an in memory index.
+            scheduler (PriorityScheduler, optional): scheduler every request
+                is queued in. Defaults to one sized for a standard key.
+            timeout (float, optional): seconds any request may take.
+                Defaults to None which waits indefinitely.
+            hedge_percentile (float, optional): latency percentile, such as
+                0.95, after which idempotent lookups send a second attempt.
+                Defaults to None which disables hedging.
+            hedge_budget (float, optional): maximum fraction of hedgeable
+                requests that may be hedged. Defaults to 0.05.
+            backend (Backend, optional): store shared with other clients
+                using the key, every request then takes a token from its
+                shared bucket. Defaults to None which caches in memory
+                without a shared bucket.
+            cache_ttl (Mapping[str, float], optional): seconds responses of
+                each path are cached in the backend, paths left out are not
+                cached. Defaults to None which caches nothing.
+            offload_threshold (int, optional): size in bytes from which
+                bodies are decoded and turned into models in the executor
+                instead of on the event loop. Defaults to None which
+                decodes every body inline.
+            executor (Executor, optional): pool large bodies are decoded
+                in, a process pool keeps the decoding from competing with
+                the event loop for the GIL. Defaults to None which uses the
+                default executor of the loop.
+            limiter (AdaptiveLimiter, optional): tunes the concurrency of
+                the scheduler from latency, 429s and rate limit headers.
+                Defaults to None which keeps the concurrency fixed.
+            stale_while_revalidate (float, optional): seconds past its ttl
+                a cached body is still served at once while a background
+                request refreshes it. Defaults to 0.
+            stale_if_error (float, optional): seconds past its ttl a cached
+                body is served when the api fails or the circuit is open.
+                Defaults to 0.
+            refresh_ahead (float, optional): fraction of the ttl after which
+                hot cached bodies are refreshed in the background before
+                they expire. Defaults to None which disables it.
+            hot_after (int, optional): cache hits since the last refresh
+                that make a body hot. Defaults to 3.
+            breaker (CircuitBreaker, optional): stops requests after
+                repeated failures, cached bodies are then served within
+                stale_if_error. Defaults to None.
+            base_url (str, optional): url the api paths are appended to,
+                such as a caching proxy or a stub server. Defaults to
+                BASE_URL.
         """
         # Handles the instance of a singular key
 
         self.api_key = api_key
+        self.base_url = base_url
 
         self.session = aiohttp.ClientSession()
 
+        self.names = names if names is not None else NameIndex()
+
+        self.scheduler = scheduler if scheduler is not None else PriorityScheduler()
+
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.latency = LatencyTracker()
+        self._hedgeable = 0
+        self._hedged = 0
+
+        self.cache_ttl = dict(cache_ttl or {})
+        self.shared_limit = backend is not None
+        self._owns_backend = backend is None
+        self.backend = MemoryBackend() if backend is None else backend
+        self._bucket_key = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+
+        self.limiter = limiter
+        if limiter is not None:
+            self.scheduler.set_concurrency(limiter.limit)
+
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.refresh_ahead = refresh_ahead
+        self.hot_after = hot_after
+        self.breaker = breaker
+        self._hits: Dict[str, int] = {}
+        self._refreshing: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    @contextmanager
+    def priority(priority: Priority) -> Iterator[None]:
+        """Set the priority of every request made inside the block.
+
+        Args:
+            priority (Priority): request class to use
+
+        Yields:
+            None: while the priority is set
+        """
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def deadline(seconds: float) -> Iterator[None]:
+        """Set a deadline for every request made inside the block.
+
+        Nested deadlines can only make the deadline earlier. Requests still
+        running when the deadline passes are cancelled and raise
+        DeadlineExceeded.
+
+        Args:
+            seconds (float): seconds from now until the deadline
+
+        Yields:
+            None: while the deadline is set
+        """
+        deadline = time.monotonic() + seconds
+        current = _deadline.get()
+        if current is not None:
+            deadline = min(deadline, current)
+        token = _deadline.set(deadline)
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+
     async def close(self) -> None:
         """Used for safe client cleanup and stuff."""
+        refreshing = list(self._refreshing.values())
+        for task in refreshing:
+            task.cancel()
+        await asyncio.gather(*refreshing, return_exceptions=True)
         await self.session.close()
-
-    async def get(self, path: str, params: Optional[Dict] = None) -> dict:
+        if self._owns_backend:
+            await self.backend.close()
+        if self.names.path is not None:
+            self.names.save()
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict] = None,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = False,
+    ) -> dict:
         """Base function to get raw data from hypixel.
 
         Args:
@@ -54,26 +372,480 @@ class Client:
                 path that you wish to request from
             params (Dict, optional):
                 parameters to pass into request defaults to empty dictionary
+            priority (Priority, optional):
+                scheduling class of the request, defaults to the class set
+                with Client.priority or else the default for the path
+            timeout (float, optional):
+                seconds the request may take, combined with any deadline set
+                with Client.deadline and the client wide timeout
+            hedge (bool, optional):
+                allow a second attempt if this one is slow, only takes effect
+                when the client has hedging enabled, defaults to False
 
         Raises:
             RateLimitError: error if ratelimit has been reached
             InvalidApiKey: error if api key is invalid
             ApiNoSuccess: error if api throughs an error
+            DeadlineExceeded: error if the deadline passed before a response
 
         Returns:
             dict: returns a dictionary of the json response
+
+        # noqa: DAR402 RateLimitError InvalidApiKey ApiNoSuccess DeadlineExceeded
+        """
+        return await self._get(path, params, priority, timeout, hedge)
+
+    async def get_model(
+        self,
+        path: str,
+        build: Callable[[Dict], T],
+        params: Optional[Dict] = None,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = False,
+    ) -> T:
+        """Get a response and build a model from it.
+
+        Bodies of at least offload_threshold bytes are decoded and built in
+        the executor of the client, smaller ones on the event loop.
+
+        Args:
+            path (str):
+                path that you wish to request from
+            build (Callable[[Dict], T]):
+                builds the model from the decoded response, must be a module
+                level function when the executor is a process pool
+            params (Dict, optional):
+                parameters to pass into request defaults to empty dictionary
+            priority (Priority, optional):
+                scheduling class of the request, defaults to the class set
+                with Client.priority or else the default for the path
+            timeout (float, optional):
+                seconds the request may take, combined with any deadline set
+                with Client.deadline and the client wide timeout
+            hedge (bool, optional):
+                allow a second attempt if this one is slow, only takes effect
+                when the client has hedging enabled, defaults to False
+
+        Raises:
+            RateLimitError: error if ratelimit has been reached
+            InvalidApiKey: error if api key is invalid
+            ApiNoSuccess: error if api throughs an error
+            DeadlineExceeded: error if the deadline passed before a response
+
+        Returns:
+            T: the model
+
+        # noqa: DAR402 RateLimitError InvalidApiKey ApiNoSuccess DeadlineExceeded
+        """
+        return await self._get(path, params, priority, timeout, hedge, build)
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict],
+        priority: Optional[Priority],
+        timeout: Optional[float],
+        hedge: bool,
+        build: Optional[Callable[[Dict], Any]] = None,
+    ) -> Any:
+        """Send a request and decode it, see get_model.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict, optional): parameters to pass into request
+            priority (Priority, optional): scheduling class of the request
+            timeout (float, optional): seconds the request may take
+            hedge (bool): allow a second attempt if this one is slow
+            build (Callable[[Dict], Any], optional): builds the model from
+                the decoded response. Defaults to None.
+
+        Returns:
+            Any: the decoded response or the model
         """
         if params is None:
             params = {}
 
         params["key"] = self.api_key
 
-        response = await self.session.get(f"{BASE_URL}{path}", params=params)
+        priority = self._priority(path, priority)
+
+        if hedge and self.hedge_percentile is not None:
+            request = self._hedged_request(path, params, priority, build)
+        else:
+            request = self._request(path, params, priority, build)
+        return await self._within_deadline(request, timeout)
+
+    async def get_raw(
+        self,
+        path: str,
+        params: Optional[Dict] = None,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        check: bool = True,
+    ) -> RawResponse:
+        """Get the undecoded response of a request, for relaying it as is.
+
+        The body is not parsed. Successful responses are recognised from
+        their first bytes and only error responses are decoded to raise the
+        matching error.
+
+        Args:
+            path (str):
+                path that you wish to request from
+            params (Dict, optional):
+                parameters to pass into request defaults to empty dictionary
+            priority (Priority, optional):
+                scheduling class of the request, defaults to the class set
+                with Client.priority or else the default for the path
+            timeout (float, optional):
+                seconds the request may take, combined with any deadline set
+                with Client.deadline and the client wide timeout
+            check (bool, optional):
+                raise the matching error for error responses, else they are
+                returned like any other response, defaults to True
+
+        Raises:
+            RateLimitError: error if ratelimit has been reached
+            InvalidApiKey: error if api key is invalid and check is set
+            ApiNoSuccess: error if api throughs an error and check is set
+            DeadlineExceeded: error if the deadline passed before a response
+
+        Returns:
+            RawResponse: status, headers and body of the response
+
+        # noqa: DAR402 RateLimitError InvalidApiKey ApiNoSuccess DeadlineExceeded
+        """
+        params = dict(params or {})
+        params["key"] = self.api_key
+        priority = self._priority(path, priority)
+        if check:
+            request = self._raw_request(path, params, priority)
+        else:
+            request = self._fetch_raw(path, params, priority)
+        return await self._within_deadline(request, timeout)
+
+    def _priority(self, path: str, priority: Optional[Priority]) -> Priority:
+        """Resolve the priority of a request.
+
+        Args:
+            path (str): path that you wish to request from
+            priority (Priority, optional): priority given by the caller
+
+        Returns:
+            Priority: the given priority, else the one set with
+            Client.priority, else the default for the path
+        """
+        if priority is None:
+            priority = _priority.get()
+        if priority is None:
+            priority = self.DEFAULT_PRIORITIES.get(path, Priority.NORMAL)
+        return priority
+
+    async def _within_deadline(
+        self, request: Coroutine[Any, Any, T], timeout: Optional[float]
+    ) -> T:
+        """Await a request, cancelling it when the deadline passes.
+
+        Args:
+            request (Coroutine[Any, Any, T]): coroutine sending the request
+            timeout (float, optional): seconds the call may take
+
+        Raises:
+            DeadlineExceeded: error if the deadline passed before a response
+
+        Returns:
+            T: result of the request
+        """
+        deadline = self._deadline(timeout)
+        if deadline is None:
+            return await request
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            request.close()
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(request, remaining)
+        except asyncio.TimeoutError as error:
+            raise DeadlineExceeded() from error
+
+    def _deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """Combine the context deadline with a per call timeout.
+
+        Args:
+            timeout (float, optional): seconds the call may take
+
+        Returns:
+            Optional[float]: monotonic deadline or None if there is none
+        """
+        deadline = _deadline.get()
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            return deadline
+        call_deadline = time.monotonic() + timeout
+        return call_deadline if deadline is None else min(deadline, call_deadline)
+
+    async def _take_shared_token(self) -> None:
+        """Wait for a token of the bucket shared through the backend."""
+        bucket = self.scheduler.bucket
+        while True:
+            delay = await self.backend.take_token(
+                self._bucket_key, bucket.rate, bucket.capacity
+            )
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _fetch_raw(
+        self, path: str, params: Dict, priority: Priority
+    ) -> RawResponse:
+        """Get a response from the cache or else through the scheduler.
+
+        Paths with a cache ttl are answered from the backend when cached.
+        Bodies past their ttl are served for stale_while_revalidate more
+        seconds while a background request refreshes them, and for
+        stale_if_error seconds when the api fails.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+
+        Returns:
+            RawResponse: undecoded response
+        """
+        ttl = self.cache_ttl.get(path)
+        if not ttl:
+            return await self._fetch_network(path, params, priority)
+        cache_key = request_key(path, params)
+        cached = await self.backend.cache_get(cache_key)
+        if cached is None:
+            return await self._fetch_network(path, params, priority, cache_key, ttl)
+        body, stored = cached
+        age = time.time() - stored
+        if age < ttl:
+            if self._is_hot(cache_key, age, ttl):
+                self._refresh(path, params, priority, cache_key, ttl)
+            return RawResponse(200, {}, body, cached=True)
+        stale = RawResponse(200, {}, body, cached=True, stale=True)
+        if age < ttl + self.stale_while_revalidate:
+            self._refresh(path, params, priority, cache_key, ttl)
+            return stale
+        if age < ttl + self.stale_if_error:
+            return await self._fetch_or_stale(
+                path, params, priority, cache_key, ttl, stale
+            )
+        return await self._fetch_network(path, params, priority, cache_key, ttl)
+
+    async def _fetch_or_stale(
+        self,
+        path: str,
+        params: Dict,
+        priority: Priority,
+        cache_key: str,
+        ttl: float,
+        stale: RawResponse,
+    ) -> RawResponse:
+        """Send a request, answering with a stale body if the api fails.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+            cache_key (str): key of the cached body
+            ttl (float): seconds responses of the path are fresh
+            stale (RawResponse): cached response past its ttl
+
+        Returns:
+            RawResponse: the new response, or the stale one on failure
+        """
+        try:
+            response = await self._fetch_network(path, params, priority, cache_key, ttl)
+        except (
+            CircuitOpen,
+            RateLimitError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ):
+            return stale
+        return stale if response.status >= 500 else response
+
+    def _is_hot(self, cache_key: str, age: float, ttl: float) -> bool:
+        """Count a cache hit and check whether to refresh the body early.
+
+        Args:
+            cache_key (str): key of the cached body
+            age (float): seconds since the body was stored
+            ttl (float): seconds the body is fresh
+
+        Returns:
+            bool: if the body should be refreshed ahead of expiry
+        """
+        if self.refresh_ahead is None:
+            return False
+        if len(self._hits) >= _MAX_HIT_COUNTS:
+            self._hits.clear()
+        hits = self._hits[cache_key] = self._hits.get(cache_key, 0) + 1
+        return hits >= self.hot_after and age >= ttl * self.refresh_ahead
+
+    def _refresh(
+        self, path: str, params: Dict, priority: Priority, cache_key: str, ttl: float
+    ) -> None:
+        """Refresh a cached body in the background, once per key at a time.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+            cache_key (str): key of the cached body
+            ttl (float): seconds responses of the path are fresh
+        """
+        if cache_key in self._refreshing:
+            return
+        self._hits.pop(cache_key, None)
+        task = asyncio.ensure_future(
+            self._fetch_network(path, dict(params), priority, cache_key, ttl)
+        )
+        self._refreshing[cache_key] = task
 
-        if response.status == 429:
-            raise RateLimitError("Hypixel")
+        def done(task: asyncio.Future) -> None:
+            self._refreshing.pop(cache_key, None)
+            if not task.cancelled():
+                task.exception()
 
-        response = await response.json()
+        task.add_done_callback(done)
+
+    async def _fetch_network(
+        self,
+        path: str,
+        params: Dict,
+        priority: Priority,
+        cache_key: Optional[str] = None,
+        ttl: float = 0,
+    ) -> RawResponse:
+        """Send a single request through the scheduler and read its body.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+            cache_key (str, optional): key successful bodies are cached
+                under. Defaults to None which caches nothing.
+            ttl (float, optional): seconds the body is fresh. Defaults to 0.
+
+        Raises:
+            CircuitOpen: if the circuit breaker stops requests
+
+        Returns:
+            RawResponse: undecoded response
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpen()
+        started = time.monotonic()
+        async with self.scheduler.request(priority):
+            if self.shared_limit:
+                await self._take_shared_token()
+            response = await self._send(path, params)
+        self.latency.record(path, time.monotonic() - started)
+        if (
+            cache_key is not None
+            and response.status == 200
+            and _is_success(response.body)
+        ):
+            keep = ttl + max(self.stale_while_revalidate, self.stale_if_error)
+            await self.backend.cache_set(cache_key, response.body, keep)
+        return response
+
+    async def _send(self, path: str, params: Dict) -> RawResponse:
+        """Send a request while holding a scheduler slot.
+
+        The outcome is reported to the limiter, whose new limit becomes the
+        concurrency of the scheduler.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+
+        Raises:
+            RateLimitError: error if ratelimit has been reached
+            aiohttp.ClientError: if the request failed
+            asyncio.TimeoutError: if the session timed out
+
+        Returns:
+            RawResponse: undecoded response
+        """
+        sent = time.monotonic()
+        try:
+            async with self.session.get(f"{self.base_url}{path}", params=params) as raw:
+                if raw.status == 429:
+                    raise RateLimitError("Hypixel")
+
+                response = RawResponse(raw.status, raw.headers, await raw.read())
+        except RateLimitError:
+            self._record_failure(outage=False)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._record_failure(outage=True)
+            raise
+        self._record_response(response, time.monotonic() - sent)
+        return response
+
+    def _record_failure(self, outage: bool) -> None:
+        """Report a failed request to the limiter and circuit breaker.
+
+        Args:
+            outage (bool): if the api could not be reached, rather than
+                refusing the request
+        """
+        if self.limiter is not None:
+            self.scheduler.set_concurrency(self.limiter.on_drop())
+        if outage and self.breaker is not None:
+            self.breaker.record_failure()
+
+    def _record_response(self, response: RawResponse, latency: float) -> None:
+        """Report a response to the limiter and circuit breaker.
+
+        Args:
+            response (RawResponse): the response
+            latency (float): seconds the request took once sent
+        """
+        if self.breaker is not None:
+            if response.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        if self.limiter is not None:
+            limit = self.limiter.on_success(
+                latency, self.scheduler.in_flight, response.headers
+            )
+            self.scheduler.set_concurrency(limit)
+
+    async def _fetch(self, path: str, params: Dict, priority: Priority) -> bytes:
+        """Send a single request through the scheduler and read its body.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+
+        Returns:
+            bytes: undecoded response body
+        """
+        return (await self._fetch_raw(path, params, priority)).body
+
+    @staticmethod
+    def _check(response: Dict) -> None:
+        """Raise the error described by a decoded response.
+
+        Args:
+            response (Dict): decoded json response
+
+        Raises:
+            InvalidApiKey: error if api key is invalid
+            ApiNoSuccess: error if api throughs an error
+        """
         if "cause" in response:
             if response["cause"] == "Invalid API key":
                 raise InvalidApiKey()
@@ -81,8 +853,108 @@ class Client:
         if not response["success"]:
             raise ApiNoSuccess()
 
+    async def _request(
+        self,
+        path: str,
+        params: Dict,
+        priority: Priority,
+        build: Optional[Callable[[Dict], Any]] = None,
+    ) -> Any:
+        """Send a single request and decode its json body.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+            build (Callable[[Dict], Any], optional): builds the model from
+                the decoded response. Defaults to None.
+
+        Returns:
+            Any: the decoded response or the model
+        """
+        body = await self._fetch(path, params, priority)
+        if self.offload_threshold is not None and len(body) >= self.offload_threshold:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, _decode, body, build)
+        return _decode(body, build)
+
+    async def _raw_request(
+        self, path: str, params: Dict, priority: Priority
+    ) -> RawResponse:
+        """Send a single request and check it without decoding success.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+
+        Returns:
+            RawResponse: undecoded response
+        """
+        response = await self._fetch_raw(path, params, priority)
+        if not _SUCCESS.match(response.body):
+            self._check(json.loads(response.body))
         return response
 
+    def _may_hedge(self) -> bool:
+        """Check the hedge budget and that the rate limit has room.
+
+        Returns:
+            bool: if a hedged attempt may be sent now
+        """
+        if self._hedged >= self.hedge_budget * self._hedgeable:
+            return False
+        return self.scheduler.bucket.available()
+
+    async def _hedged_request(
+        self,
+        path: str,
+        params: Dict,
+        priority: Priority,
+        build: Optional[Callable[[Dict], Any]] = None,
+    ) -> Any:
+        """Send a request and race a second attempt if the first is slow.
+
+        Args:
+            path (str): path that you wish to request from
+            params (Dict): parameters to pass into request
+            priority (Priority): scheduling class of the request
+            build (Callable[[Dict], Any], optional): builds the model from
+                the decoded response. Defaults to None.
+
+        Returns:
+            Any: the first successful decoded response or model
+        """
+        self._hedgeable += 1
+        attempts = [asyncio.ensure_future(self._request(path, params, priority, build))]
+        try:
+            percentile = self.hedge_percentile
+            delay = None
+            if percentile is not None:
+                delay = self.latency.percentile(path, percentile)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                if not done and self._may_hedge():
+                    self._hedged += 1
+                    attempts.append(
+                        asyncio.ensure_future(
+                            self._request(path, params, priority, build)
+                        )
+                    )
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
     async def get_watchdog_stats(self) -> WatchDog:
         """Get current watchdog stats.
 
@@ -190,7 +1062,7 @@ class Client:
             Status: Status object of player
         """
         uuid = uuid.replace("-", "")
-        data = await self.get("status", params={"uuid": uuid})
+        data = await self.get("status", params={"uuid": uuid}, hedge=True)
         if data["session"]["online"]:
             return Status(
                 online=True,
@@ -226,186 +1098,118 @@ class Client:
 
         return friend_list
 
-    async def get_bazaar(self) -> Bazaar:
+    async def get_bazaar(self, fields: Optional[Collection[str]] = None) -> Bazaar:
         """Get info of the items in the bazaar.
 
+        Args:
+            fields (Collection[str], optional): Bazaar_item arguments to parse,
+                the others are None. Defaults to None which parses all.
+
         Returns:
             Bazaar: object for bazzar
         """
-        data = await self.get("skyblock/bazaar")
-
-        bazaar_items = []
+        return await self.get_model("skyblock/bazaar", _project(_bazaar, fields))
 
-        for name in data["products"]:
-            elements = data["products"][name]
-            sell_summary = []
-            buy_summary = []
-            for sell in elements["sell_summary"]:
-                sell_summary.append(
-                    Bazaar_sell_summary(
-                        amount=sell["amount"],
-                        pricePerUnit=sell["pricePerUnit"],
-                        orders=sell["orders"],
-                    )
-                )
-            for buy in elements["buy_summary"]:
-                buy_summary.append(
-                    Bazaar_buy_summary(
-                        amount=buy["amount"],
-                        pricePerUnit=buy["pricePerUnit"],
-                        orders=buy["orders"],
-                    )
-                )
-            quick = elements["quick_status"]
-            bazaar_quick_status = Bazaar_quick_status(
-                productId=quick["productId"],
-                sellPrice=quick["sellPrice"],
-                sellVolume=quick["sellVolume"],
-                sellMovingWeek=quick["sellMovingWeek"],
-                sellOrders=quick["sellOrders"],
-                buyPrice=quick["buyPrice"],
-                buyVolume=quick["buyVolume"],
-                buyMovingWeek=quick["buyMovingWeek"],
-                buyOrders=quick["buyOrders"],
-            )
-            bazaar_items.append(
-                Bazaar_item(
-                    name=name,
-                    product_id=elements["product_id"],
-                    sell_summary=sell_summary,
-                    buy_summary=buy_summary,
-                    quick_status=bazaar_quick_status,
-                )
-            )
+    async def auctions(
+        self, page: int = 0, fields: Optional[Collection[str]] = None
+    ) -> Auction:
+        """Get the auctions available.
 
-        return Bazaar(
-            lastUpdated=dt.datetime.fromtimestamp(1590854517479 / 1000),
-            bazaar_items=bazaar_items,
-        )
+        Only the fields needed can be requested, a price crawl keeps a small
+        part of the memory of full auctions::
 
-    async def auctions(self, page: int = 0) -> Auction:
-        """Get the auctions available.
+            await client.auctions(page, ("uuid", "item_name", "starting_bid"))
 
         Args:
             page (int, optional): Page of auction list you want. Defaults to 0.
+            fields (Collection[str], optional): Auction_item arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Auction: Auction object.
         """
         params = {"page": page}
-        data = await self.get("skyblock/auctions", params=params)
-        auction_list = []
-        for auc in data["auctions"]:
-            auction_list.append(
-                Auction_item(
-                    uuid=auc["uuid"],
-                    auctioneer=auc["auctioneer"],
-                    profile_id=auc["profile_id"],
-                    coop=auc["coop"],
-                    start=dt.datetime.fromtimestamp(auc["start"] / 1000),
-                    end=dt.datetime.fromtimestamp(auc["end"] / 1000),
-                    item_name=auc["item_name"],
-                    item_lore=auc["item_lore"],
-                    extra=auc["extra"],
-                    category=auc["category"],
-                    tier=auc["tier"],
-                    starting_bid=auc["starting_bid"],
-                    item_bytes=auc["item_bytes"],
-                    claimed=auc["claimed"],
-                    claimed_bidders=auc["claimed_bidders"],
-                    highest_bid_amount=auc["highest_bid_amount"],
-                    bids=auc["bids"],
-                )
-            )
-        return Auction(
-            page=data["page"],
-            totalPages=data["totalPages"],
-            totalAuctions=data["totalAuctions"],
-            lastUpdated=dt.datetime.fromtimestamp(data["lastUpdated"] / 1000),
-            auctions=auction_list,
-        )
+        build = _project(_auction_page, fields)
+        return await self.get_model("skyblock/auctions", build, params)
 
-    async def get_recent_games(self, uuid: str) -> List[Game]:
+    async def get_auctions_ended(
+        self, fields: Optional[Collection[str]] = None
+    ) -> Ended_auctions:
+        """Get auctions which ended in the last 60 seconds.
+
+        Args:
+            fields (Collection[str], optional): Ended_auction arguments to parse,
+                the others are None. Defaults to None which parses all.
+
+        Returns:
+            Ended_auctions: recently ended auctions
+        """
+        build = _project(_ended_auctions, fields)
+        return await self.get_model("skyblock/auctions_ended", build)
+
+    async def get_recent_games(
+        self, uuid: str, fields: Optional[Collection[str]] = None
+    ) -> List[Game]:
         """Get recent games of a player.
 
         Args:
             uuid (str): uuid of player
+            fields (Collection[str], optional): Game arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             List[Game]: list of recent games
         """
         uuid = uuid.replace("-", "")
         params = {"uuid": uuid}
-        data = await self.get("recentGames", params=params)
-
-        games_list = []
-        for game in data["games"]:
-            if "ended" in game:
-                games_list.append(
-                    Game(
-                        date=dt.datetime.fromtimestamp(game["date"] / 1000),
-                        gameType=game["gameType"],
-                        mode=game["Mode"],
-                        _map=game["map"],
-                        ended=dt.datetime.fromtimestamp(game["ended"] / 1000),
-                    )
-                )
-            else:
-                games_list.append(
-                    Game(
-                        date=dt.datetime.fromtimestamp(game["date"] / 1000),
-                        gameType=game["gameType"],
-                        mode=game["Mode"],
-                        _map=game["map"],
-                    )
-                )
+        return await self.get_model("recentGames", _project(_games, fields), params)
 
-        return games_list
-
-    async def get_player(self, uuid: str) -> Player:
+    async def get_player(
+        self, uuid: str, fields: Optional[Collection[str]] = None
+    ) -> Player:
         """Get information about a player from their uuid.
 
         Args:
             uuid (str): uuid of player
+            fields (Collection[str], optional): Player arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Player: player object
         """
         uuid = uuid.replace("-", "")
         params = {"uuid": uuid}
-        data = await self.get("player", params=params)
-
-        return Player(
-            _id=data["player"]["_id"],
-            uuid=data["player"]["uuid"],
-            firstLogin=dt.datetime.fromtimestamp(data["player"]["firstLogin"] / 1000),
-            playername=data["player"]["playername"],
-            lastLogin=dt.datetime.fromtimestamp(data["player"]["lastLogin"] / 1000),
-            displayname=data["player"]["displayname"],
-            knownAliases=data["player"]["knownAliases"],
-            knownAliasesLower=data["player"]["knownAliasesLower"],
-            achievementsOneTime=data["player"]["achievementsOneTime"],
-            mcVersionRp=data["player"]["mcVersionRp"],
-            networkExp=data["player"]["networkExp"],
-            karma=data["player"]["karma"],
-            spec_always_flying=data["player"]["spec_always_flying"],
-            lastAdsenseGenerateTime=data["player"]["lastAdsenseGenerateTime"],
-            lastClaimedReward=data["player"]["lastClaimedReward"],
-            totalRewards=data["player"]["totalRewards"],
-            totalDailyRewards=data["player"]["totalDailyRewards"],
-            rewardStreak=data["player"]["rewardStreak"],
-            rewardScore=data["player"]["rewardScore"],
-            rewardHighScore=data["player"]["rewardHighScore"],
-            lastLogout=dt.datetime.fromtimestamp(data["player"]["lastLogout"] / 1000),
-            friendRequestsUuid=data["player"]["friendRequestsUuid"],
-            network_update_book=data["player"]["network_update_book"],
-            achievementTracking=data["player"]["achievementTracking"],
-            achievementPoints=data["player"]["achievementPoints"],
-            currentGadget=data["player"]["currentGadget"],
-            channel=data["player"]["channel"],
-            mostRecentGameType=data["player"]["mostRecentGameType"],
-            level=self.calcPlayerLevel(data["player"]["networkExp"]),
+        build = _project(_player, fields)
+        player = await self.get_model("player", build, params, hedge=True)
+        if player.uuid is not None:
+            self.names.add_player(player)
+        return player
+
+    async def get_uuid(self, name: str) -> Optional[str]:
+        """Get the uuid of a player from their name.
+
+        Names seen by get_player are resolved locally, otherwise the player
+        is looked up and their names are added to the index.
+
+        Args:
+            name (str): name of player in any case
+
+        Returns:
+            Optional[str]: undashed uuid or None if no player has the name
+        """
+        uuid = self.names.get(name)
+        if uuid is not None:
+            return uuid
+        data = await self.get("player", params={"name": name})
+        player = data["player"]
+        if player is None:
+            return None
+        self.names.add_names(
+            player["uuid"],
+            player.get("displayname"),
+            player.get("knownAliases", []),
         )
+        return player["uuid"]
 
     @staticmethod
     def calcPlayerLevel(xp: int) -> int:
@@ -417,7 +1221,7 @@ class Client:
         Returns:
             int: current level of player
         """
-        return int(1 + (-8750.0 + (8750 ** 2 + 5000 * xp) ** 0.5) / 2500)
+        return network_level(xp)
 
     async def find_guild_by_name(self, name: str) -> str:
         """Find guild id by name.
@@ -446,83 +1250,75 @@ class Client:
         data = await self.get("findGuild", params=params)
         return data["guild"]
 
-    async def get_guild_by_name(self, guild_name: str) -> Guild:
+    async def get_guild_by_name(
+        self, guild_name: str, fields: Optional[Collection[str]] = None
+    ) -> Guild:
         """Get guild by name.
 
         Args:
             guild_name (str): name of guild
+            fields (Collection[str], optional): Guild arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Guild: guild object
         """
         params = {"name": guild_name}
-        data = await self.get("guild", params=params)
-        guild_object = self.create_guild_object(data)
-        return guild_object
+        build = _project(self.create_guild_object, fields)
+        return await self.get_model("guild", build, params)
 
-    async def get_guild_by_id(self, guild_id: int) -> Guild:
+    async def get_guild_by_id(
+        self, guild_id: int, fields: Optional[Collection[str]] = None
+    ) -> Guild:
         """Get guild by id.
 
         Args:
             guild_id (int): id of guild
+            fields (Collection[str], optional): Guild arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Guild: guild object
         """
         params = {"id": guild_id}
-        data = await self.get("guild", params=params)
-        guild_object = self.create_guild_object(data)
-        return guild_object
+        build = _project(self.create_guild_object, fields)
+        return await self.get_model("guild", build, params)
 
-    async def get_guild_by_player(self, player_uuid: str) -> Guild:
+    async def get_guild_by_player(
+        self, player_uuid: str, fields: Optional[Collection[str]] = None
+    ) -> Guild:
         """Get guild by player.
 
         Args:
             player_uuid (str): uuid of a player in the guild
+            fields (Collection[str], optional): Guild arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Guild: guild object
         """
         player_uuid = player_uuid.replace("-", "")
         params = {"player": player_uuid}
-        data = await self.get("guild", params=params)
-        guild_object = self.create_guild_object(data)
-        return guild_object
+        build = _project(self.create_guild_object, fields)
+        return await self.get_model("guild", build, params)
 
     @staticmethod
-    def create_guild_object(data: Dict) -> Guild:
+    def create_guild_object(
+        data: Dict, fields: Optional[Collection[str]] = None
+    ) -> Guild:
         """Create guild object from json.
 
         Args:
             data (dict): json
+            fields (Collection[str], optional): Guild arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             Guild: guild object
         """
-        guild = data["guild"]
-        return Guild(
-            _id=guild["_id"],
-            created=dt.datetime.fromtimestamp(guild["created"] / 1000),
-            name=guild["name"],
-            name_lower=guild["name_lower"],
-            description=guild["description"],
-            tag=guild["tag"],
-            tagColor=guild["tagColor"],
-            exp=guild["exp"],
-            members=guild["members"],
-            achievements=guild["achievements"],
-            ranks=guild["ranks"],
-            joinable=guild["joinable"],
-            legacyRanking=guild["legacyRanking"],
-            publiclyListed=guild["publiclyListed"],
-            hideGmTag=guild["hideGmTag"],
-            preferredGames=guild["preferredGames"],
-            chatMute=guild["chatMute"],
-            guildExpByGameType=guild["guildExpByGameType"],
-            banner=guild["banner"],
-        )
+        return GUILD.parse(data["guild"], fields)
 
-    async def get_profile(self, profile: str) -> Dict:
+    async def get_profile(self, profile: str) -> Optional[Profile]:
         """Get profile info of a skyblock player.
 
         Args:
@@ -530,103 +1326,90 @@ class Client:
                             running get_profiles
 
         Returns:
-            Dict: json response
+            Optional[Profile]: profile object, None for an unknown profile
         """
         params = {"profile": profile}
-        data = await self.get("skyblock/profile", params=params)
-        return data["profile"]
+        return await self.get_model("skyblock/profile", _profile, params)
 
-    async def get_profiles(self, uuid: str) -> Dict:
+    async def get_profiles(self, uuid: str) -> List[Profile]:
         """Get info on a profile.
 
         Args:
             uuid (str): uuid of player
 
         Returns:
-            Dict: json response
+            List[Profile]: profiles of the player
         """
         uuid = uuid.replace("-", "")
         params = {"uuid": uuid}
-        data = await self.get("skyblock/profiles", params=params)
-        return data["profiles"]
+        return await self.get_model("skyblock/profiles", _profiles, params)
 
-    async def get_auction_from_uuid(self, uuid: str) -> List[Auction_item]:
+    async def get_auction_from_uuid(
+        self, uuid: str, fields: Optional[Collection[str]] = None
+    ) -> List[Auction_item]:
         """Get auction from uuid.
 
         Args:
             uuid (str): minecraft uuid
+            fields (Collection[str], optional): Auction_item arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             List[Auction_item]: list of auctions
         """
         params = {"uuid": uuid}
-        data = await self.get("skyblock/auction", params=params)
-        auction_items = self.create_auction_object(data)
-        return auction_items
+        build = _project(self.create_auction_object, fields)
+        return await self.get_model("skyblock/auction", build, params)
 
-    async def get_auction_from_player(self, player: str) -> List[Auction_item]:
+    async def get_auction_from_player(
+        self, player: str, fields: Optional[Collection[str]] = None
+    ) -> List[Auction_item]:
         """Get auction data from player.
 
         Args:
             player (str): player
+            fields (Collection[str], optional): Auction_item arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             List[Auction_item]: list of auction items
         """
         params = {"player": player}
-        data = await self.get("skyblock/auction", params=params)
-        auction_items = self.create_auction_object(data)
-        return auction_items
+        build = _project(self.create_auction_object, fields)
+        return await self.get_model("skyblock/auction", build, params)
 
-    async def get_auction_from_profile(self, profile_id: str) -> List[Auction_item]:
+    async def get_auction_from_profile(
+        self, profile_id: str, fields: Optional[Collection[str]] = None
+    ) -> List[Auction_item]:
         """Get auction data from profile.
 
         Args:
             profile_id (str): profile id
+            fields (Collection[str], optional): Auction_item arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             List[Auction_item]: list of auction items
         """
         params = {"profile": profile_id}
-        data = await self.get("skyblock/auction", params=params)
-        auction_items = self.create_auction_object(data)
-        return auction_items
+        build = _project(self.create_auction_object, fields)
+        return await self.get_model("skyblock/auction", build, params)
 
     @staticmethod
-    def create_auction_object(data: Dict) -> List[Auction_item]:
+    def create_auction_object(
+        data: Dict, fields: Optional[Collection[str]] = None
+    ) -> List[Auction_item]:
         """Create auction object.
 
         Args:
             data (Dict): json input
+            fields (Collection[str], optional): Auction_item arguments to parse,
+                the others are None. Defaults to None which parses all.
 
         Returns:
             List[Auction_item]: auction object list
         """
-        auction_list = []
-        for auc in data["auctions"]:
-            auction_list.append(
-                Auction_item(
-                    _id=auc["_id"],
-                    uuid=auc["uuid"],
-                    auctioneer=auc["auctioneer"],
-                    profile_id=auc["profile_id"],
-                    coop=auc["coop"],
-                    start=dt.datetime.fromtimestamp(auc["start"] / 1000),
-                    end=dt.datetime.fromtimestamp(auc["end"] / 1000),
-                    item_name=auc["item_name"],
-                    item_lore=auc["item_lore"],
-                    extra=auc["extra"],
-                    category=auc["category"],
-                    tier=auc["tier"],
-                    starting_bid=auc["starting_bid"],
-                    item_bytes=auc["item_bytes"],
-                    claimed=auc["claimed"],
-                    claimed_bidders=auc["claimed_bidders"],
-                    highest_bid_amount=auc["highest_bid_amount"],
-                    bids=auc["bids"],
-                )
-            )
-        return auction_list
+        return AUCTION_ITEM.parse_many(data["auctions"], fields)
 
     # NOT FULLY IMPLEMENTED
 
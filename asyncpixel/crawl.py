@@ -0,0 +1,337 @@
+"""Auction house crawls with parsing spread over a process pool.
+
+Pages are downloaded on the event loop and the raw bytes are handed to
+worker processes, which decode the json, normalise every auction and send
+back compact columns instead of one object per auction.
+"""
+
+import array
+import asyncio
+import collections
+from concurrent.futures import Executor, ProcessPoolExecutor
+import datetime as dt
+import itertools
+import json
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .client import Client
+from .models.auctions import Auction_item
+from .scheduler import Priority
+
+# Numeric columns and the array typecode used to store them.
+NUMERIC_FIELDS = {
+    "start": "d",
+    "end": "d",
+    "starting_bid": "q",
+    "highest_bid_amount": "q",
+    "bin": "b",
+    "claimed": "b",
+}
+TEXT_FIELDS = (
+    "uuid",
+    "auctioneer",
+    "profile_id",
+    "item_name",
+    "item_lore",
+    "extra",
+    "category",
+    "tier",
+    "item_bytes",
+)
+DEFAULT_FIELDS = (
+    "uuid",
+    "auctioneer",
+    "profile_id",
+    "item_name",
+    "category",
+    "tier",
+    "start",
+    "end",
+    "starting_bid",
+    "highest_bid_amount",
+    "bin",
+    "claimed",
+)
+
+Predicate = Callable[[Dict], bool]
+
+
+class AuctionColumns:
+    """Auctions stored column by column.
+
+    Numeric fields are kept in typed arrays, timestamps as unix seconds.
+    """
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_FIELDS) -> None:
+        """Init object.
+
+        Args:
+            fields (Sequence[str], optional): fields to store.
+                Defaults to DEFAULT_FIELDS.
+
+        Raises:
+            ValueError: if a field is unknown
+        """
+        self.columns: Dict[str, Union[array.array, List]] = {}
+        for field in fields:
+            if field in NUMERIC_FIELDS:
+                self.columns[field] = array.array(NUMERIC_FIELDS[field])
+            elif field in TEXT_FIELDS:
+                self.columns[field] = []
+            else:
+                raise ValueError(f"Unknown auction field {field}.")
+
+    def __len__(self) -> int:
+        """Amount of auctions stored.
+
+        Returns:
+            int: amount of auctions
+        """
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    @property
+    def fields(self) -> List[str]:
+        """Fields stored.
+
+        Returns:
+            List[str]: field names
+        """
+        return list(self.columns)
+
+    def append(self, auction: Dict) -> None:
+        """Normalise and store a raw auction.
+
+        Args:
+            auction (Dict): auction json as sent by hypixel
+        """
+        for field, column in self.columns.items():
+            if field == "start" or field == "end":
+                column.append(auction[field] / 1000)
+            elif field == "bin" or field == "claimed":
+                column.append(bool(auction.get(field, False)))
+            else:
+                column.append(auction.get(field))
+
+    def extend(self, other: "AuctionColumns") -> None:
+        """Append every auction of another set of columns.
+
+        Args:
+            other (AuctionColumns): columns with the same fields
+        """
+        for field, column in self.columns.items():
+            column.extend(other.columns[field])
+
+    def rows(self) -> Iterator[Dict]:
+        """Iterate over the auctions as dictionaries.
+
+        Yields:
+            Dict: field values of a single auction
+        """
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def to_items(self) -> List[Auction_item]:
+        """Build auction objects, fields not stored are left as None.
+
+        Returns:
+            List[Auction_item]: auction objects
+        """
+        items = []
+        for row in self.rows():
+            start = row.get("start")
+            end = row.get("end")
+            items.append(
+                Auction_item(
+                    uuid=row.get("uuid"),
+                    auctioneer=row.get("auctioneer"),
+                    profile_id=row.get("profile_id"),
+                    coop=None,
+                    start=dt.datetime.fromtimestamp(start) if start else None,
+                    end=dt.datetime.fromtimestamp(end) if end else None,
+                    item_name=row.get("item_name"),
+                    item_lore=row.get("item_lore"),
+                    extra=row.get("extra"),
+                    category=row.get("category"),
+                    tier=row.get("tier"),
+                    starting_bid=row.get("starting_bid"),
+                    item_bytes=row.get("item_bytes"),
+                    claimed=bool(row.get("claimed")),
+                    claimed_bidders=None,
+                    highest_bid_amount=row.get("highest_bid_amount"),
+                    bids=None,
+                )
+            )
+        return items
+
+
+def parse_auction_page(
+    body: bytes,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    predicate: Optional[Predicate] = None,
+) -> Tuple[Dict, AuctionColumns]:
+    """Decode and normalise a page of the auction house.
+
+    Runs inside worker processes, so the predicate must be picklable such
+    as a module level function.
+
+    Args:
+        body (bytes): raw body of a skyblock/auctions response
+        fields (Sequence[str], optional): fields to keep.
+            Defaults to DEFAULT_FIELDS.
+        predicate (Predicate, optional): only auctions for which it returns
+            True are kept. Defaults to None.
+
+    Returns:
+        Tuple[Dict, AuctionColumns]: page metadata, or the success flag and
+        cause if the request failed, and the auction columns
+    """
+    columns = AuctionColumns(fields)
+    data = json.loads(body)
+    if not data.get("success"):
+        return {"success": False, "cause": data.get("cause")}, columns
+    append = columns.append
+    for auction in data["auctions"]:
+        if predicate is None or predicate(auction):
+            append(auction)
+    meta = {
+        "success": True,
+        "page": data["page"],
+        "totalPages": data["totalPages"],
+        "totalAuctions": data["totalAuctions"],
+        "lastUpdated": data["lastUpdated"],
+    }
+    return meta, columns
+
+
+class AuctionCrawler:
+    """Crawl the whole auction house, parsing pages in a process pool."""
+
+    def __init__(
+        self,
+        client: Client,
+        executor: Optional[Executor] = None,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        predicate: Optional[Predicate] = None,
+        concurrency: int = 8,
+    ) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to download pages.
+            executor (Executor, optional): pool pages are parsed in. Defaults
+                to a process pool with one worker per core, closed by close.
+            fields (Sequence[str], optional): fields to keep.
+                Defaults to DEFAULT_FIELDS.
+            predicate (Predicate, optional): picklable filter applied to each
+                raw auction. Defaults to None.
+            concurrency (int, optional): pages downloaded at once.
+                Defaults to 8.
+        """
+        self.client = client
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ProcessPoolExecutor()
+        self.fields = tuple(fields)
+        self.predicate = predicate
+        self.concurrency = concurrency
+        self.last_updated: Optional[dt.datetime] = None
+
+    async def _download(self, page: int) -> bytes:
+        """Download the raw body of a page.
+
+        Args:
+            page (int): page number
+
+        Returns:
+            bytes: undecoded response body
+        """
+        params = {"page": page, "key": self.client.api_key}
+        return await self.client._fetch("skyblock/auctions", params, Priority.BULK)
+
+    async def _parse(self, body: bytes) -> Tuple[Dict, AuctionColumns]:
+        """Parse a page in the pool.
+
+        Args:
+            body (bytes): undecoded response body
+
+        Returns:
+            Tuple[Dict, AuctionColumns]: page metadata and columns
+        """
+        loop = asyncio.get_event_loop()
+        meta, columns = await loop.run_in_executor(
+            self.executor, parse_auction_page, body, self.fields, self.predicate
+        )
+        self.client._check(meta)
+        return meta, columns
+
+    async def _page(self, number: int) -> AuctionColumns:
+        """Download and parse a page.
+
+        Args:
+            number (int): page number
+
+        Returns:
+            AuctionColumns: auctions of the page
+        """
+        return (await self._parse(await self._download(number)))[1]
+
+    async def pages(self) -> AsyncIterator[AuctionColumns]:
+        """Download and parse every page, yielding them in page order.
+
+        At most ``concurrency`` pages are downloaded or held ahead of the
+        consumer, so a slow consumer stops the downloads instead of letting
+        parsed pages pile up in memory.
+
+        Yields:
+            AuctionColumns: auctions of the next page
+        """
+        meta, first = await self._parse(await self._download(0))
+        self.last_updated = dt.datetime.fromtimestamp(meta["lastUpdated"] / 1000)
+        numbers = iter(range(1, meta["totalPages"]))
+        pending: Deque[asyncio.Future] = collections.deque(
+            asyncio.ensure_future(self._page(number))
+            for number in itertools.islice(numbers, self.concurrency)
+        )
+        try:
+            yield first
+            while pending:
+                columns = await pending.popleft()
+                number = next(numbers, None)
+                if number is not None:
+                    pending.append(asyncio.ensure_future(self._page(number)))
+                yield columns
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def crawl(self) -> AuctionColumns:
+        """Download and parse every page of the auction house.
+
+        Downloads are limited to ``concurrency`` at once while parsing of
+        finished pages overlaps with the remaining downloads.
+
+        Returns:
+            AuctionColumns: auctions of all pages in page order
+        """
+        result = AuctionColumns(self.fields)
+        async for columns in self.pages():
+            result.extend(columns)
+        return result
+
+    def close(self) -> None:
+        """Shut down the process pool if the crawler created it."""
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -1,5 +1,7 @@
 """All exceptions for asyncpixel."""
 
+import asyncio
+
 
 class RateLimitError(Exception):
     """Raised when a ratelimit is reached."""
@@ -54,3 +56,37 @@ class InvalidApiKey(Exception):
             str: string version of error
         """
         return self.message
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a request does not finish before its deadline."""
+
+    def __init__(self) -> None:
+        """Create error."""
+        self.message = "The request did not finish before its deadline."
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """Return error in readable format.
+
+        Returns:
+            str: string version of error
+        """
+        return self.message
+
+
+class CircuitOpen(Exception):
+    """Raised when requests are stopped after repeated api failures."""
+
+    def __init__(self) -> None:
+        """Create error."""
+        self.message = "The hypixel api is failing, requests are paused."
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """Return error in readable format.
+
+        Returns:
+            str: string version of error
+        """
+        return self.message
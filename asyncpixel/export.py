@@ -0,0 +1,307 @@
+"""Streaming export of auction house snapshots.
+
+Pages are written as soon as they are parsed while the next pages are
+downloaded, so an export needs memory for a few pages rather than for the
+whole auction house. Parquet files additionally need pyarrow, which is an
+optional dependency installed with ``pip install pyarrow``.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+import csv
+import json
+import os
+from types import TracebackType
+from typing import Any, AsyncIterable, Dict, IO, List, Optional, Sequence, Type
+
+from .client import Client
+from .crawl import (
+    AuctionColumns,
+    AuctionCrawler,
+    DEFAULT_FIELDS,
+    NUMERIC_FIELDS,
+    Predicate,
+)
+
+BOOL_FIELDS = ("bin", "claimed")
+
+
+class AuctionWriter:
+    """Base class of writers receiving auctions page by page.
+
+    Writers are called from a worker thread, one page at a time.
+    """
+
+    def write(self, columns: AuctionColumns) -> None:
+        """Write a page of auctions.
+
+        Args:
+            columns (AuctionColumns): auctions to write
+
+        Raises:
+            NotImplementedError: if not overridden
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and close the output."""
+
+    def __enter__(self) -> "AuctionWriter":
+        """Use the writer as a context manager.
+
+        Returns:
+            AuctionWriter: the writer
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the writer.
+
+        Args:
+            exc_type (Type[BaseException], optional): exception type
+            exc (BaseException, optional): exception raised
+            traceback (TracebackType, optional): traceback
+        """
+        self.close()
+
+
+class _FileWriter(AuctionWriter):
+    """Writer of a text file opened from a path."""
+
+    def __init__(self, path: str) -> None:
+        self.file: IO[str] = open(path, "w", newline="", encoding="utf-8")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _bool_rows(columns: AuctionColumns) -> List[Dict[str, Any]]:
+    flags = [field for field in BOOL_FIELDS if field in columns.columns]
+    rows = []
+    for row in columns.rows():
+        for field in flags:
+            row[field] = bool(row[field])
+        rows.append(row)
+    return rows
+
+
+class NdjsonWriter(_FileWriter):
+    """Write one json object per auction and line."""
+
+    def __init__(self, path: str) -> None:
+        """Init object.
+
+        Args:
+            path (str): file to write
+        """
+        super().__init__(path)
+
+    def write(self, columns: AuctionColumns) -> None:
+        """Write a page of auctions.
+
+        Args:
+            columns (AuctionColumns): auctions to write
+        """
+        dumps = json.dumps
+        self.file.writelines(dumps(row) + "\n" for row in _bool_rows(columns))
+
+
+class CsvWriter(_FileWriter):
+    """Write auctions as csv with a header row."""
+
+    def __init__(self, path: str) -> None:
+        """Init object.
+
+        Args:
+            path (str): file to write
+        """
+        super().__init__(path)
+        self._writer = csv.writer(self.file)
+        self._header = False
+
+    def write(self, columns: AuctionColumns) -> None:
+        """Write a page of auctions.
+
+        Args:
+            columns (AuctionColumns): auctions to write
+        """
+        if not self._header:
+            self._writer.writerow(columns.fields)
+            self._header = True
+        self._writer.writerows(row.values() for row in _bool_rows(columns))
+
+
+class ParquetWriter(AuctionWriter):
+    """Write auctions to parquet in row groups of ``row_group_size`` rows.
+
+    Requires pyarrow, which is imported when the writer is created.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        row_group_size: int = 100000,
+    ) -> None:
+        """Init object.
+
+        Args:
+            path (str): file to write
+            fields (Sequence[str], optional): fields of the pages written.
+                Defaults to DEFAULT_FIELDS.
+            row_group_size (int, optional): rows buffered per row group.
+                Defaults to 100000.
+
+        Raises:
+            ImportError: if pyarrow is not installed
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "Parquet export requires pyarrow to be installed."
+            ) from None
+        self._pa = pyarrow
+        types = {"d": pyarrow.float64(), "q": pyarrow.int64(), "b": pyarrow.bool_()}
+        self.schema = pyarrow.schema(
+            [
+                (
+                    (field, types[NUMERIC_FIELDS[field]])
+                    if field in NUMERIC_FIELDS
+                    else (field, pyarrow.string())
+                )
+                for field in fields
+            ]
+        )
+        self.row_group_size = row_group_size
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        self._buffer = AuctionColumns(fields)
+
+    def write(self, columns: AuctionColumns) -> None:
+        """Buffer a page and write full row groups.
+
+        Args:
+            columns (AuctionColumns): auctions to write
+        """
+        self._buffer.extend(columns)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not len(self._buffer):
+            return
+        arrays = []
+        for field in self.schema:
+            column = self._buffer.columns[field.name]
+            if field.type == self._pa.bool_():
+                column = [bool(flag) for flag in column]
+            arrays.append(self._pa.array(column, type=field.type))
+        self._writer.write_table(
+            self._pa.Table.from_arrays(arrays, schema=self.schema),
+            row_group_size=self.row_group_size,
+        )
+        self._buffer = AuctionColumns(self._buffer.fields)
+
+    def close(self) -> None:
+        """Write the last row group and close the file."""
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {".ndjson": NdjsonWriter, ".jsonl": NdjsonWriter, ".csv": CsvWriter}
+
+
+def open_writer(path: str, fields: Sequence[str] = DEFAULT_FIELDS) -> AuctionWriter:
+    """Create the writer matching the extension of a path.
+
+    Args:
+        path (str): file to write, ending in .ndjson, .jsonl, .csv or .parquet
+        fields (Sequence[str], optional): fields of the pages written.
+            Defaults to DEFAULT_FIELDS.
+
+    Raises:
+        ValueError: if the extension is unknown
+
+    Returns:
+        AuctionWriter: writer of the file
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        return ParquetWriter(path, fields)
+    if extension not in WRITERS:
+        raise ValueError(f"Unknown export format {extension}.")
+    return WRITERS[extension](path)
+
+
+async def write_pages(
+    pages: AsyncIterable[AuctionColumns], writer: AuctionWriter
+) -> int:
+    """Write pages as they arrive, one write in flight at a time.
+
+    A page is only handed to the writer once the previous write finished,
+    so when the disk is the bottleneck the lookahead of the page source
+    fills up and downloads pause.
+
+    Args:
+        pages (AsyncIterable[AuctionColumns]): pages to write
+        writer (AuctionWriter): destination
+
+    Returns:
+        int: amount of auctions written
+    """
+    loop = asyncio.get_event_loop()
+    pending: Optional[asyncio.Future] = None
+    count = 0
+    try:
+        async for columns in pages:
+            if pending is not None:
+                await pending
+            pending = loop.run_in_executor(None, writer.write, columns)
+            count += len(columns)
+    finally:
+        if pending is not None:
+            await pending
+    return count
+
+
+async def export_auctions(
+    client: Client,
+    path: str,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    predicate: Optional[Predicate] = None,
+    executor: Optional[Executor] = None,
+    concurrency: int = 4,
+) -> int:
+    """Stream a snapshot of the auction house to a file.
+
+    Example::
+
+        await export_auctions(client, "auctions.parquet", ("uuid", "end"))
+
+    Args:
+        client (Client): client used to download pages.
+        path (str): file to write, the extension selects the format.
+        fields (Sequence[str], optional): fields exported.
+            Defaults to DEFAULT_FIELDS.
+        predicate (Predicate, optional): picklable filter applied to each
+            raw auction. Defaults to None.
+        executor (Executor, optional): pool pages are parsed in. Defaults to
+            a process pool created for the export.
+        concurrency (int, optional): pages downloaded or waiting to be
+            written at once. Defaults to 4.
+
+    Returns:
+        int: amount of auctions exported
+    """
+    crawler = AuctionCrawler(client, executor, fields, predicate, concurrency)
+    try:
+        with open_writer(path, fields) as writer:
+            return await write_pages(crawler.pages(), writer)
+    finally:
+        crawler.close()
@@ -0,0 +1,151 @@
+"""Polling feeds that emit every item only once."""
+
+import asyncio
+from collections import OrderedDict
+import datetime as dt
+import time
+from typing import AsyncIterator, Callable, Optional
+
+from .client import Client
+from .models.auctions import Ended_auction
+
+
+class TimeWindowSet:
+    """Set that forgets keys once they are older than a time window.
+
+    Memory is bounded by the keys seen within the window and by
+    ``max_size``, so it stays flat however long it runs.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        max_size: int = 200000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init object.
+
+        Args:
+            window (float): seconds a key is remembered.
+            max_size (int, optional): keys remembered at most, the oldest
+                are forgotten first. Defaults to 200000.
+            clock (Callable[[], float], optional): current time, sightings
+                passed to add must use the same clock.
+                Defaults to time.monotonic.
+        """
+        self.window = window
+        self.max_size = max_size
+        self.clock = clock
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Amount of keys remembered.
+
+        Returns:
+            int: amount of keys
+        """
+        return len(self._seen)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key was seen within the window.
+
+        Args:
+            key (str): key to check
+
+        Returns:
+            bool: if the key was seen
+        """
+        self._expire(self.clock())
+        return key in self._seen
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        seen = self._seen
+        while seen and next(iter(seen.values())) < cutoff:
+            seen.popitem(last=False)
+
+    def add(self, key: str, now: Optional[float] = None) -> bool:
+        """Remember a key.
+
+        Args:
+            key (str): key to remember
+            now (float, optional): time of the sighting on the set's clock.
+                Defaults to the current time.
+
+        Returns:
+            bool: True if the key was not seen within the window
+        """
+        if now is None:
+            now = self.clock()
+        self._expire(now)
+        if key in self._seen:
+            return False
+        self._seen[key] = now
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return True
+
+
+class EndedAuctionFeed:
+    """Poll recently ended auctions and yield every sale once.
+
+    Example::
+
+        async for sale in EndedAuctionFeed(client):
+            record(sale.auction_id, sale.price)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        interval: float = 60,
+        window: float = 600,
+        max_size: int = 200000,
+    ) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to poll.
+            interval (float, optional): seconds between polls. Defaults to 60.
+            window (float, optional): seconds a sale is remembered, must be
+                longer than the time a sale stays in the feed. Defaults to 600.
+            max_size (int, optional): sales remembered at most.
+                Defaults to 200000.
+        """
+        self.client = client
+        self.interval = interval
+        self.seen = TimeWindowSet(window, max_size)
+        self._last_updated: Optional[dt.datetime] = None
+
+    def __aiter__(self) -> AsyncIterator[Ended_auction]:
+        """Start polling.
+
+        Returns:
+            AsyncIterator[Ended_auction]: sales not yielded before
+        """
+        return self.poll()
+
+    async def poll(self) -> AsyncIterator[Ended_auction]:
+        """Poll forever, yielding sales not seen before.
+
+        Yields:
+            Ended_auction: a sale seen for the first time
+        """
+        while True:
+            async for sale in self.poll_once():
+                yield sale
+            await asyncio.sleep(self.interval)
+
+    async def poll_once(self) -> AsyncIterator[Ended_auction]:
+        """Poll a single time, skipping data that has not changed.
+
+        Yields:
+            Ended_auction: a sale seen for the first time
+        """
+        ended = await self.client.get_auctions_ended()
+        if ended.lastUpdated == self._last_updated:
+            return
+        self._last_updated = ended.lastUpdated
+        for sale in ended.auctions:
+            if self.seen.add(sale.auction_id):
+                yield sale
@@ -0,0 +1,273 @@
+"""Incremental guild experience totals across many guilds.
+
+Each member keeps a compact array of daily experience. When a guild is
+fetched again only the days from the last one seen on are merged, and the
+weekly and monthly totals of the guild are adjusted by the change, so
+ranking thousands of guilds reads two stored numbers per guild.
+
+Guilds can be fetched with only the fields the tracker reads::
+
+    tracker = GuildTracker()
+    tracker.update(await client.get_guild_by_id(guild_id, FIELDS))
+    top = tracker.ranking(limit=10)
+"""
+
+import array
+import datetime as dt
+import heapq
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .models.guild import Guild
+
+WEEK = 7
+MONTH = 30
+# Guild arguments read by the tracker.
+FIELDS = ("_id", "name", "members")
+
+
+def _day(date: str) -> int:
+    return dt.date.fromisoformat(date).toordinal()
+
+
+class _Days:
+    """Values of consecutive days stored in an array."""
+
+    __slots__ = ("start", "values")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.values = array.array("q")
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.values) - 1
+
+    def items(self) -> Iterable[Tuple[int, int]]:
+        return enumerate(self.values, self.start)
+
+    def add(self, day: int, delta: int) -> None:
+        index = day - self.start
+        if index < 0:
+            return
+        if index >= len(self.values):
+            self.values.extend([0] * (index - len(self.values) + 1))
+        self.values[index] += delta
+
+    def set(self, day: int, value: int) -> int:
+        index = day - self.start
+        if index < 0:
+            return 0
+        if index >= len(self.values):
+            self.values.extend([0] * (index - len(self.values) + 1))
+        delta = value - self.values[index]
+        self.values[index] = value
+        return delta
+
+    def total(self, first: int, last: int) -> int:
+        first = max(first - self.start, 0)
+        last = min(last - self.start + 1, len(self.values))
+        return sum(self.values[first:last]) if first < last else 0
+
+    def trim(self, first: int) -> None:
+        if first > self.start:
+            del self.values[: first - self.start]
+            self.start = first
+
+
+class TrackedGuild:
+    """Experience history and running totals of one guild."""
+
+    def __init__(self, _id: str, name: str, days: int = MONTH) -> None:
+        """Init object.
+
+        Args:
+            _id (str): guild id
+            name (str): guild name
+            days (int, optional): days of history kept. Defaults to MONTH.
+        """
+        self._id = _id
+        self.name = name
+        self.days = days
+        self.end = 0
+        self.weekly = 0
+        self.monthly = 0
+        self.members: Dict[str, _Days] = {}
+        self._daily = _Days(0)
+
+    def _advance(self, day: int) -> None:
+        if day <= self.end:
+            return
+        self.weekly -= self._daily.total(self.end - WEEK + 1, day - WEEK)
+        self.monthly -= self._daily.total(self.end - MONTH + 1, day - MONTH)
+        self.end = day
+        self._daily.trim(day - self.days + 1)
+
+    def _apply(self, day: int, delta: int) -> None:
+        if delta == 0 or day <= self.end - self.days:
+            return
+        self._daily.add(day, delta)
+        if day > self.end - WEEK:
+            self.weekly += delta
+        if day > self.end - MONTH:
+            self.monthly += delta
+
+    def _new_days(self, members: Iterable[Mapping[str, Any]]) -> List[Tuple]:
+        updates = []
+        for member in members:
+            uuid = member.get("uuid")
+            history = self.members.get(uuid)  # type: ignore
+            since = ""
+            if history is not None and history.values:
+                since = dt.date.fromordinal(history.end).isoformat()
+            for date, exp in (member.get("expHistory") or {}).items():
+                if date >= since:
+                    updates.append((uuid, _day(date), exp))
+        updates.sort(key=itemgetter(1))
+        return updates
+
+    def merge(self, members: Iterable[Mapping[str, Any]]) -> int:
+        """Merge the experience history of the current members.
+
+        Days before the last day already stored for a member are skipped,
+        members missing from ``members`` are dropped with their experience.
+
+        Args:
+            members (Iterable[Mapping[str, Any]]): members as sent by the
+                api, with their ``uuid`` and ``expHistory``
+
+        Returns:
+            int: member days added or changed
+        """
+        members = list(members)
+        current = {member.get("uuid") for member in members}
+        for uuid in [uuid for uuid in self.members if uuid not in current]:
+            for day, exp in self.members.pop(uuid).items():
+                self._apply(day, -exp)
+        updates = self._new_days(members)
+        if updates:
+            self._advance(max(day for _, day, _ in updates))
+        changed = 0
+        for uuid, day, exp in updates:
+            history = self.members.get(uuid)
+            if history is None:
+                history = self.members[uuid] = _Days(day)
+            delta = history.set(day, exp)
+            if delta:
+                changed += 1
+                self._apply(day, delta)
+        for history in self.members.values():
+            history.trim(self.end - self.days + 1)
+        return changed
+
+    def member_totals(self, days: int = WEEK) -> Dict[str, int]:
+        """Experience of each member over the last days of the guild.
+
+        Args:
+            days (int, optional): days summed. Defaults to WEEK.
+
+        Returns:
+            Dict[str, int]: experience by member uuid
+        """
+        first = self.end - days + 1
+        return {
+            uuid: history.total(first, self.end)
+            for uuid, history in self.members.items()
+        }
+
+
+class GuildTracker:
+    """Weekly and monthly experience of many guilds, updated incrementally.
+
+    Totals cover the days up to the latest day in the history of each
+    guild, which is the day it was last fetched.
+    """
+
+    def __init__(self, days: int = MONTH) -> None:
+        """Init object.
+
+        Args:
+            days (int, optional): days of history kept per member, at least
+                MONTH. Defaults to MONTH.
+
+        Raises:
+            ValueError: if fewer days than MONTH are kept
+        """
+        if days < MONTH:
+            raise ValueError(f"At least {MONTH} days must be kept.")
+        self.days = days
+        self.guilds: Dict[str, TrackedGuild] = {}
+
+    def __len__(self) -> int:
+        """Get the number of tracked guilds.
+
+        Returns:
+            int: tracked guilds
+        """
+        return len(self.guilds)
+
+    def __contains__(self, guild_id: str) -> bool:
+        """Check if a guild is tracked.
+
+        Args:
+            guild_id (str): guild id
+
+        Returns:
+            bool: if the guild is tracked
+        """
+        return guild_id in self.guilds
+
+    def get(self, guild_id: str) -> Optional[TrackedGuild]:
+        """Get a tracked guild.
+
+        Args:
+            guild_id (str): guild id
+
+        Returns:
+            Optional[TrackedGuild]: the guild, None if it is not tracked
+        """
+        return self.guilds.get(guild_id)
+
+    def update(self, guild: Guild) -> int:
+        """Merge a freshly fetched guild.
+
+        Args:
+            guild (Guild): guild with at least the FIELDS parsed
+
+        Returns:
+            int: member days added or changed
+        """
+        tracked = self.guilds.get(guild._id)
+        if tracked is None:
+            tracked = self.guilds[guild._id] = TrackedGuild(
+                guild._id, guild.name, self.days
+            )
+        tracked.name = guild.name
+        return tracked.merge(guild.members or ())
+
+    def remove(self, guild_id: str) -> None:
+        """Stop tracking a guild.
+
+        Args:
+            guild_id (str): guild id
+        """
+        self.guilds.pop(guild_id, None)
+
+    def ranking(
+        self, monthly: bool = False, limit: Optional[int] = None
+    ) -> List[TrackedGuild]:
+        """Rank the tracked guilds by experience.
+
+        Args:
+            monthly (bool, optional): rank by monthly instead of weekly
+                experience. Defaults to False.
+            limit (int, optional): guilds returned. Defaults to None which
+                returns all.
+
+        Returns:
+            List[TrackedGuild]: guilds with the most experience first
+        """
+        key = attrgetter("monthly" if monthly else "weekly")
+        if limit is None:
+            return sorted(self.guilds.values(), key=key, reverse=True)
+        return heapq.nlargest(limit, self.guilds.values(), key=key)
@@ -0,0 +1,49 @@
+"""Request latency tracking used to decide when to hedge requests."""
+
+import collections
+from typing import Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies per path."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        """Init object.
+
+        Args:
+            window (int, optional): latencies kept per path. Defaults to 200.
+            min_samples (int, optional): samples needed before percentiles
+                are reported. Defaults to 20.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, path: str, latency: float) -> None:
+        """Record the latency of a finished request.
+
+        Args:
+            path (str): api path requested
+            latency (float): seconds the request took
+        """
+        samples = self._samples.get(path)
+        if samples is None:
+            samples = self._samples[path] = collections.deque(maxlen=self.window)
+        samples.append(latency)
+
+    def percentile(self, path: str, percentile: float) -> Optional[float]:
+        """Get a latency percentile of a path.
+
+        Args:
+            path (str): api path
+            percentile (float): percentile between 0 and 1
+
+        Returns:
+            Optional[float]: latency in seconds, None without enough samples
+        """
+        samples = self._samples.get(path)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(int(percentile * len(ordered)), len(ordered) - 1)
+        return ordered[index]
@@ -1,7 +1,7 @@
 """Auction related objects."""
 
 import datetime
-from typing import List
+from typing import List, Optional
 
 
 class Auction_item:
@@ -9,27 +9,30 @@ class Auction_item:
 
     def __init__(
         self,
-        uuid: str,
-        auctioneer: str,
-        profile_id: str,
-        coop: List[str],
-        start: datetime.datetime,
-        end: datetime.datetime,
-        item_name: str,
-        item_lore: str,
-        extra: str,
-        category: str,
-        tier: str,
-        starting_bid: int,
-        item_bytes: str,
+        uuid: Optional[str],
+        auctioneer: Optional[str],
+        profile_id: Optional[str],
+        coop: Optional[List[str]],
+        start: Optional[datetime.datetime],
+        end: Optional[datetime.datetime],
+        item_name: Optional[str],
+        item_lore: Optional[str],
+        extra: Optional[str],
+        category: Optional[str],
+        tier: Optional[str],
+        starting_bid: Optional[int],
+        item_bytes: Optional[str],
         claimed: bool,
-        claimed_bidders: List,
-        highest_bid_amount: int,
-        bids: List,
-        _id: str = None,
+        claimed_bidders: Optional[List],
+        highest_bid_amount: Optional[int],
+        bids: Optional[List],
+        _id: Optional[str] = None,
     ) -> None:
         """Auction Object.
 
+        Fields are None when they were not requested, such as auctions
+        rebuilt from a crawl that only kept some fields.
+
         Args:
             uuid (str): UUID of Auction.
             auctioneer (str): UUID of Auctioneer.
@@ -95,3 +98,55 @@ class Auction:
         self.totalAuctions = totalAuctions
         self.lastUpdated = lastUpdated
         self.auctions = auctions
+
+
+class Ended_auction:
+    """Auction that recently ended with a sale."""
+
+    def __init__(
+        self,
+        auction_id: str,
+        seller: str,
+        seller_profile: str,
+        buyer: str,
+        timestamp: datetime.datetime,
+        price: int,
+        bin: bool,
+        item_bytes: str,
+    ) -> None:
+        """Ended auction object.
+
+        Args:
+            auction_id (str): UUID of the auction.
+            seller (str): UUID of the seller.
+            seller_profile (str): Profile id of the seller.
+            buyer (str): UUID of the buyer.
+            timestamp (datetime.datetime): When the item was sold.
+            price (int): Price the item sold for.
+            bin (bool): If the auction was buy it now.
+            item_bytes (str): item_bytes.
+        """
+        self.auction_id = auction_id
+        self.seller = seller
+        self.seller_profile = seller_profile
+        self.buyer = buyer
+        self.timestamp = timestamp
+        self.price = price
+        self.bin = bin
+        self.item_bytes = item_bytes
+
+
+class Ended_auctions:
+    """Recently ended auctions."""
+
+    def __init__(
+        self, lastUpdated: datetime.datetime, auctions: List[Ended_auction]
+    ) -> None:
+        """Init object.
+
+        Args:
+            lastUpdated (datetime.datetime): When data was last updated.
+            auctions (List[Ended_auction]): Auctions that ended recently.
+        """
+        self.lastUpdated = lastUpdated
+        self.auctions = auctions
@@ -1,18 +1,19 @@
 """Bazaar classes."""
 
+from bisect import bisect_left
 import datetime
-from typing import List
+from typing import Dict, List, Optional, Sequence, Union
 
 
 class Bazaar_buy_summary:
     """Bazaar buy object."""
 
-    def __init__(self, amount: int, pricePerUnit: int, orders: int) -> None:
+    def __init__(self, amount: int, pricePerUnit: float, orders: int) -> None:
         """Init object.
 
         Args:
             amount (int): Amount.
-            pricePerUnit (int): Price Per Unit.
+            pricePerUnit (float): Price Per Unit.
             orders (int): Amount of orders.
         """
         self.amount = amount
@@ -23,12 +24,12 @@ class Bazaar_buy_summary:
 class Bazaar_sell_summary:
     """Bazaar sell object."""
 
-    def __init__(self, amount: int, pricePerUnit: int, orders: int) -> None:
+    def __init__(self, amount: int, pricePerUnit: float, orders: int) -> None:
         """Init object.
 
         Args:
             amount (int): Amount.
-            pricePerUnit (int): Price Per Unit.
+            pricePerUnit (float): Price Per Unit.
             orders (int): How many orders.
         """
         self.amount = amount
@@ -71,10 +72,100 @@ class Bazaar_quick_status:
         self.sellVolume = sellVolume
         self.sellMovingWeek = sellMovingWeek
         self.sellOrders = sellOrders
-        self.buyPrice = sellPrice
-        self.buyVolume = sellVolume
-        self.buyMovingWeek = sellMovingWeek
-        self.buyOrders = sellOrders
+        self.buyPrice = buyPrice
+        self.buyVolume = buyVolume
+        self.buyMovingWeek = buyMovingWeek
+        self.buyOrders = buyOrders
+
+
+class Bazaar_order_book:
+    """One side of a product's order book with cumulative depth."""
+
+    def __init__(
+        self, orders: Sequence[Union[Bazaar_buy_summary, Bazaar_sell_summary]]
+    ) -> None:
+        """Init object.
+
+        Args:
+            orders (Sequence[Union[Bazaar_buy_summary, Bazaar_sell_summary]]):
+                Orders in the order they are filled, best price first.
+        """
+        self.prices: List[float] = []
+        self.cumulative_amounts: List[int] = []
+        self.cumulative_costs: List[float] = []
+        amount = 0
+        cost = 0.0
+        for order in orders:
+            amount += order.amount
+            cost += order.amount * order.pricePerUnit
+            self.prices.append(order.pricePerUnit)
+            self.cumulative_amounts.append(amount)
+            self.cumulative_costs.append(cost)
+
+    @property
+    def depth(self) -> int:
+        """Total amount available in the book.
+
+        Returns:
+            int: amount
+        """
+        return self.cumulative_amounts[-1] if self.cumulative_amounts else 0
+
+    @property
+    def best_price(self) -> Optional[float]:
+        """Price of the first unit filled.
+
+        Returns:
+            Optional[float]: price, None for an empty book
+        """
+        return self.prices[0] if self.prices else None
+
+    def fill_cost(self, quantity: int) -> Optional[float]:
+        """Coins needed to fill a quantity instantly.
+
+        Args:
+            quantity (int): units to fill
+
+        Returns:
+            Optional[float]: total coins, None if the book is too shallow
+        """
+        if quantity <= 0:
+            return 0.0
+        level = bisect_left(self.cumulative_amounts, quantity)
+        if level == len(self.cumulative_amounts):
+            return None
+        filled = self.cumulative_amounts[level - 1] if level else 0
+        before = self.cumulative_costs[level - 1] if level else 0.0
+        return before + (quantity - filled) * self.prices[level]
+
+    def average_price(self, quantity: int) -> Optional[float]:
+        """Average price per unit when filling a quantity.
+
+        Args:
+            quantity (int): units to fill
+
+        Returns:
+            Optional[float]: price per unit, None if the book is too shallow
+        """
+        cost = self.fill_cost(quantity)
+        if cost is None or quantity <= 0:
+            return None
+        return cost / quantity
+
+    def slippage(self, quantity: int) -> Optional[float]:
+        """Relative price difference between the fill and the best price.
+
+        Args:
+            quantity (int): units to fill
+
+        Returns:
+            Optional[float]: slippage such as 0.02 for 2%, None if the book
+            is too shallow
+        """
+        average = self.average_price(quantity)
+        if average is None or not self.best_price:
+            return None
+        return abs(average - self.best_price) / self.best_price
 
 
 class Bazaar:
@@ -90,6 +181,20 @@ class Bazaar:
         """
         self.lastUpdated = lastUpdated
         self.bazaar_items = bazaar_items
+        self._products: Optional[Dict[str, "Bazaar_item"]] = None
+
+    def product(self, product_id: str) -> Optional["Bazaar_item"]:
+        """Look up an item by product id.
+
+        Args:
+            product_id (str): Product ID of the item.
+
+        Returns:
+            Optional[Bazaar_item]: the item, None if it is not listed
+        """
+        if self._products is None:
+            self._products = {item.product_id: item for item in self.bazaar_items}
+        return self._products.get(product_id)
 
 
 class Bazaar_item:
@@ -120,3 +225,35 @@ class Bazaar_item:
         self.sell_summary = sell_summary
         self.buy_summary = buy_summary
         self.quick_status = quick_status
+        self._buy_book: Optional[Bazaar_order_book] = None
+        self._sell_book: Optional[Bazaar_order_book] = None
+
+    @property
+    def buy_book(self) -> Bazaar_order_book:
+        """Sell offers filled when instantly buying, from buy_summary.
+
+        Returns:
+            Bazaar_order_book: order book, cheapest offer first
+        """
+        if self._buy_book is None:
+            self._buy_book = Bazaar_order_book(
+                sorted(self.buy_summary, key=lambda order: order.pricePerUnit)
+            )
+        return self._buy_book
+
+    @property
+    def sell_book(self) -> Bazaar_order_book:
+        """Buy orders filled when instantly selling, from sell_summary.
+
+        Returns:
+            Bazaar_order_book: order book, highest bid first
+        """
+        if self._sell_book is None:
+            self._sell_book = Bazaar_order_book(
+                sorted(
+                    self.sell_summary,
+                    key=lambda order: order.pricePerUnit,
+                    reverse=True,
+                )
+            )
+        return self._sell_book
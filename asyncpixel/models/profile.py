@@ -0,0 +1,205 @@
+"""Skyblock profile objects.
+
+Profiles are large, so every section is only decoded the first time it is
+accessed and then cached on the object.
+"""
+
+import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .. import nbt
+
+INVENTORY_KEYS = [
+    "inv_contents",
+    "inv_armor",
+    "ender_chest_contents",
+    "wardrobe_contents",
+    "talisman_bag",
+    "potion_bag",
+    "fishing_bag",
+    "quiver",
+    "candy_inventory_contents",
+    "personal_vault_contents",
+]
+
+
+class _lazy:
+    """Descriptor computing an attribute on first access and caching it."""
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        """Init descriptor.
+
+        Args:
+            func (Callable[[Any], Any]): function computing the value
+        """
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        """Compute and cache the value.
+
+        Args:
+            instance (Any): object the attribute is read from
+            owner (type): class of the object
+
+        Returns:
+            Any: cached value
+        """
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class Profile_inventory:
+    """Inventory stored as compressed NBT."""
+
+    def __init__(self, data: str) -> None:
+        """Init object.
+
+        Args:
+            data (str): base64 encoded gzipped NBT data.
+        """
+        self.data = data
+
+    @_lazy
+    def items(self) -> List[Dict]:
+        """Decoded item stacks, empty slots are empty dictionaries."""
+        decoded = nbt.decode(self.data)
+        return decoded.get("i", []) if decoded else []
+
+
+class Bank_transaction:
+    """Skyblock bank transaction."""
+
+    def __init__(
+        self,
+        amount: float,
+        timestamp: datetime.datetime,
+        action: str,
+        initiator_name: str,
+    ) -> None:
+        """Init object.
+
+        Args:
+            amount (float): Coins moved.
+            timestamp (datetime.datetime): When the transaction happened.
+            action (str): DEPOSIT or WITHDRAW.
+            initiator_name (str): Formatted name of who made the transaction.
+        """
+        self.amount = amount
+        self.timestamp = timestamp
+        self.action = action
+        self.initiator_name = initiator_name
+
+
+class Profile_banking:
+    """Skyblock profile bank."""
+
+    def __init__(self, balance: float, transactions: List[Bank_transaction]) -> None:
+        """Init object.
+
+        Args:
+            balance (float): Coins in the bank.
+            transactions (List[Bank_transaction]): Recent transactions.
+        """
+        self.balance = balance
+        self.transactions = transactions
+
+
+class Profile_member:
+    """Member of a skyblock profile."""
+
+    def __init__(self, uuid: str, raw: Dict) -> None:
+        """Init object.
+
+        Args:
+            uuid (str): uuid of the member.
+            raw (Dict): raw member json.
+        """
+        self.uuid = uuid
+        self.raw = raw
+        self.coin_purse: Optional[float] = raw.get("coin_purse")
+        last_save = raw.get("last_save")
+        self.last_save = (
+            datetime.datetime.fromtimestamp(last_save / 1000) if last_save else None
+        )
+
+    @_lazy
+    def inventories(self) -> Dict[str, Profile_inventory]:
+        """Inventories of the member keyed by their api name."""
+        inventories = {}
+        for key in INVENTORY_KEYS:
+            section = self.raw.get(key)
+            if section and "data" in section:
+                inventories[key] = Profile_inventory(section["data"])
+        for index, section in self.raw.get("backpack_contents", {}).items():
+            if section and "data" in section:
+                inventories[f"backpack_{index}"] = Profile_inventory(section["data"])
+        return inventories
+
+    @_lazy
+    def collections(self) -> Dict[str, int]:
+        """Collected amount of each item."""
+        return dict(self.raw.get("collection", {}))
+
+    @_lazy
+    def skills(self) -> Dict[str, float]:
+        """Experience of each skill keyed by upper case skill id."""
+        prefix = "experience_skill_"
+        return {
+            key[len(prefix) :].upper(): value
+            for key, value in self.raw.items()
+            if key.startswith(prefix)
+        }
+
+    @_lazy
+    def slayers(self) -> Dict[str, int]:
+        """Slayer experience for each boss."""
+        return {
+            boss: data.get("xp", 0)
+            for boss, data in self.raw.get("slayer_bosses", {}).items()
+        }
+
+
+class Profile:
+    """Skyblock profile."""
+
+    def __init__(self, raw: Dict) -> None:
+        """Init object.
+
+        Args:
+            raw (Dict): raw profile json.
+        """
+        self.raw = raw
+        self.profile_id: Optional[str] = raw.get("profile_id")
+        self.cute_name: Optional[str] = raw.get("cute_name")
+
+    @_lazy
+    def members(self) -> Dict[str, Profile_member]:
+        """Members of the profile keyed by uuid."""
+        return {
+            uuid: Profile_member(uuid, member)
+            for uuid, member in self.raw.get("members", {}).items()
+        }
+
+    @_lazy
+    def banking(self) -> Optional[Profile_banking]:
+        """Profile bank, None if the bank api is disabled."""
+        banking = self.raw.get("banking")
+        if banking is None:
+            return None
+        transactions = [
+            Bank_transaction(
+                amount=transaction["amount"],
+                timestamp=datetime.datetime.fromtimestamp(
+                    transaction["timestamp"] / 1000
+                ),
+                action=transaction["action"],
+                initiator_name=transaction["initiator_name"],
+            )
+            for transaction in banking.get("transactions", [])
+        ]
+        return Profile_banking(balance=banking["balance"], transactions=transactions)
@@ -0,0 +1,41 @@
+"""Raw response data class."""
+
+from typing import Mapping
+
+
+class RawResponse:
+    """Undecoded response of a request."""
+
+    def __init__(
+        self,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        cached: bool = False,
+        stale: bool = False,
+    ) -> None:
+        """Init class.
+
+        Args:
+            status (int): http status code
+            headers (Mapping[str, str]): response headers
+            body (bytes): undecoded response body
+            cached (bool, optional): if the body came from the cache.
+                Defaults to False.
+            stale (bool, optional): if the cached body is past its ttl.
+                Defaults to False.
+        """
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.cached = cached
+        self.stale = stale
+
+    @property
+    def view(self) -> memoryview:
+        """Zero copy view of the body.
+
+        Returns:
+            memoryview: view of the body
+        """
+        return memoryview(self.body)
@@ -0,0 +1,145 @@
+"""Local index of player names to uuids."""
+
+from collections import OrderedDict
+import json
+import os
+from typing import Iterable, Optional
+
+from .models.player import Player
+
+
+class NameIndex:
+    """Case insensitive, size bounded map of player names to uuids.
+
+    The least recently used names are evicted once ``max_size`` is reached.
+    """
+
+    def __init__(self, max_size: int = 100000, path: Optional[str] = None) -> None:
+        """Init object.
+
+        Args:
+            max_size (int, optional): maximum amount of names kept.
+                Defaults to 100000.
+            path (str, optional): json file the index is persisted to and
+                loaded from. Defaults to None.
+
+        Raises:
+            ValueError: if max_size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+        self.max_size = max_size
+        self.path = path
+        self._names: "OrderedDict[str, str]" = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        """Amount of names in the index.
+
+        Returns:
+            int: amount of names
+        """
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a name is indexed.
+
+        Args:
+            name (str): player name
+
+        Returns:
+            bool: if the name is indexed
+        """
+        return name.lower() in self._names
+
+    def add(self, name: str, uuid: str, overwrite: bool = True) -> None:
+        """Add a single name.
+
+        Args:
+            name (str): player name
+            uuid (str): dashed or undashed uuid of the player
+            overwrite (bool, optional): replace the uuid of a name that is
+                already indexed. Defaults to True.
+        """
+        key = name.lower()
+        if key in self._names:
+            if overwrite:
+                self._names[key] = uuid.replace("-", "")
+            self._names.move_to_end(key)
+            return
+        self._names[key] = uuid.replace("-", "")
+        if len(self._names) > self.max_size:
+            self._names.popitem(last=False)
+
+    def add_names(
+        self, uuid: str, displayname: Optional[str], aliases: Iterable[str] = ()
+    ) -> None:
+        """Add the current name and past aliases of a player.
+
+        Aliases never replace a name that is already indexed since old
+        names can be taken by other players.
+
+        Args:
+            uuid (str): uuid of the player
+            displayname (str, optional): current name of the player
+            aliases (Iterable[str], optional): known past names. Defaults to ().
+        """
+        for alias in aliases:
+            if alias:
+                self.add(alias, uuid, overwrite=False)
+        if displayname:
+            self.add(displayname, uuid)
+
+    def add_player(self, player: Player) -> None:
+        """Index every name of a player.
+
+        Args:
+            player (Player): player object
+        """
+        self.add_names(
+            player.uuid,
+            player.displayname,
+            [*(player.knownAliases or []), *(player.knownAliasesLower or [])],
+        )
+
+    def get(self, name: str) -> Optional[str]:
+        """Look up the uuid of a name.
+
+        Args:
+            name (str): player name in any case
+
+        Returns:
+            Optional[str]: undashed uuid or None if the name is unknown
+        """
+        key = name.lower()
+        uuid = self._names.get(key)
+        if uuid is not None:
+            self._names.move_to_end(key)
+        return uuid
+
+    def save(self) -> None:
+        """Write the index to its json file.
+
+        Raises:
+            ValueError: if no path is configured
+        """
+        if self.path is None:
+            raise ValueError("No path configured.")
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(list(self._names.items()), file)
+        os.replace(temp_path, self.path)
+
+    def load(self) -> None:
+        """Load the index from its json file.
+
+        Raises:
+            ValueError: if no path is configured
+        """
+        if self.path is None:
+            raise ValueError("No path configured.")
+        with open(self.path) as file:
+            entries = json.load(file)
+        for name, uuid in entries:
+            self.add(name, uuid)
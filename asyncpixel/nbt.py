@@ -0,0 +1,168 @@
+"""Minimal reader for the NBT data used in skyblock inventories."""
+
+import base64
+import gzip
+import struct
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_SCALARS = {
+    TAG_BYTE: struct.Struct(">b"),
+    TAG_SHORT: struct.Struct(">h"),
+    TAG_INT: struct.Struct(">i"),
+    TAG_LONG: struct.Struct(">q"),
+    TAG_FLOAT: struct.Struct(">f"),
+    TAG_DOUBLE: struct.Struct(">d"),
+}
+_LENGTH = struct.Struct(">i")
+_STRING_LENGTH = struct.Struct(">H")
+
+
+class _Reader:
+    """Cursor over a decompressed NBT buffer."""
+
+    def __init__(self, data: bytes) -> None:
+        """Init object.
+
+        Args:
+            data (bytes): uncompressed NBT data
+        """
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> Any:
+        """Read a single fixed size value.
+
+        Args:
+            fmt (struct.Struct): format of the value
+
+        Returns:
+            Any: the value read
+        """
+        (value,) = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return value
+
+    def string(self) -> str:
+        """Read a length prefixed string.
+
+        Returns:
+            str: the string read
+        """
+        length = self.unpack(_STRING_LENGTH)
+        start = self.offset
+        self.offset += length
+        return self.data[start : self.offset].decode("utf-8", "replace")
+
+    def array(self, tag: int) -> List[int]:
+        """Read a length prefixed array of numbers.
+
+        Args:
+            tag (int): tag type of the elements
+
+        Returns:
+            List[int]: the array read
+        """
+        length = self.unpack(_LENGTH)
+        fmt = _SCALARS[tag]
+        code = f">{length}{fmt.format[-1]}"
+        values = struct.unpack_from(code, self.data, self.offset)
+        self.offset += length * fmt.size
+        return list(values)
+
+    def payload(self, tag: int) -> Any:
+        """Read the payload of a tag.
+
+        Args:
+            tag (int): tag type
+
+        Returns:
+            Any: decoded payload
+
+        Raises:
+            ValueError: if the tag type is unknown
+        """
+        if tag in _SCALARS:
+            return self.unpack(_SCALARS[tag])
+        handler = _HANDLERS.get(tag)
+        if handler is None:
+            raise ValueError(f"Unknown NBT tag type {tag}.")
+        return handler(self)
+
+    def compound(self) -> Dict[str, Any]:
+        """Read a compound tag.
+
+        Returns:
+            Dict[str, Any]: the compound as a dictionary
+        """
+        result: Dict[str, Any] = {}
+        while True:
+            tag = self.unpack(_SCALARS[TAG_BYTE])
+            if tag == TAG_END:
+                return result
+            name = self.string()
+            result[name] = self.payload(tag)
+
+    def list(self) -> List[Any]:
+        """Read a list tag.
+
+        Returns:
+            List[Any]: the list elements
+        """
+        tag = self.unpack(_SCALARS[TAG_BYTE])
+        length = self.unpack(_LENGTH)
+        return [self.payload(tag) for _ in range(length)]
+
+
+_HANDLERS: Dict[int, Callable[[_Reader], Any]] = {
+    TAG_BYTE_ARRAY: lambda reader: reader.array(TAG_BYTE),
+    TAG_STRING: _Reader.string,
+    TAG_LIST: _Reader.list,
+    TAG_COMPOUND: _Reader.compound,
+    TAG_INT_ARRAY: lambda reader: reader.array(TAG_INT),
+    TAG_LONG_ARRAY: lambda reader: reader.array(TAG_LONG),
+}
+
+
+def loads(data: bytes) -> Tuple[str, Any]:
+    """Decode uncompressed NBT data.
+
+    Args:
+        data (bytes): uncompressed NBT data
+
+    Returns:
+        Tuple[str, Any]: name and payload of the root tag
+    """
+    reader = _Reader(data)
+    tag = reader.unpack(_SCALARS[TAG_BYTE])
+    if tag == TAG_END:
+        return "", None
+    name = reader.string()
+    return name, reader.payload(tag)
+
+
+def decode(data: Union[str, bytes]) -> Any:
+    """Decode a base64 encoded and gzipped NBT blob as sent by hypixel.
+
+    Args:
+        data (Union[str, bytes]): base64 string such as ``item_bytes`` or
+            the ``data`` field of a skyblock inventory
+
+    Returns:
+        Any: payload of the root tag
+    """
+    raw = gzip.decompress(base64.b64decode(data))
+    return loads(raw)[1]
@@ -0,0 +1,374 @@
+"""Rolling per item price statistics with fixed memory per item."""
+
+import math
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .feeds import TimeWindowSet
+from .models.auctions import Auction_item
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets so every quantile is within
+    ``relative_accuracy`` of the true value. When more than ``max_buckets``
+    are used the lowest buckets are folded together.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 512) -> None:
+        """Init object.
+
+        Args:
+            relative_accuracy (float, optional): relative error of quantiles.
+                Defaults to 0.01.
+            max_buckets (int, optional): buckets kept at most. Defaults to 512.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value.
+
+        Args:
+            value (float): value to add, values below 1 are counted as zero
+            count (int, optional): times the value is added. Defaults to 1.
+        """
+        self.count += count
+        if value < 1:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        ordered = sorted(self.buckets)
+        excess = len(ordered) - self.max_buckets
+        target = ordered[excess]
+        for index in ordered[:excess]:
+            self.buckets[target] += self.buckets.pop(index)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add every value of another sketch with the same accuracy.
+
+        Args:
+            other (QuantileSketch): sketch to merge in
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile.
+
+        Args:
+            q (float): quantile between 0 and 1
+
+        Returns:
+            Optional[float]: estimated value, None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class _Slot:
+    """Statistics of one time slice of the window."""
+
+    __slots__ = ("epoch", "count", "total", "minimum", "sketch")
+
+    def __init__(self, relative_accuracy: float, max_buckets: int) -> None:
+        self.sketch = QuantileSketch(relative_accuracy, max_buckets)
+        self.reset(-1)
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.sketch.buckets.clear()
+        self.sketch.zero_count = 0
+        self.sketch.count = 0
+
+
+class PriceStats:
+    """Summary of the prices of an item over the window."""
+
+    def __init__(
+        self,
+        volume: int,
+        minimum: Optional[float],
+        mean: Optional[float],
+        sketch: QuantileSketch,
+    ) -> None:
+        """Init object.
+
+        Args:
+            volume (int): Sales counted in the window.
+            minimum (float, optional): Lowest price in the window.
+            mean (float, optional): Mean price in the window.
+            sketch (QuantileSketch): Merged sketch of the window.
+        """
+        self.volume = volume
+        self.minimum = minimum
+        self.mean = mean
+        self.sketch = sketch
+        self._quantiles: Dict[float, Optional[float]] = {}
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a price quantile.
+
+        Args:
+            q (float): quantile between 0 and 1
+
+        Returns:
+            Optional[float]: estimated price, None without prices
+        """
+        if q not in self._quantiles:
+            self._quantiles[q] = self.sketch.quantile(q)
+        return self._quantiles[q]
+
+
+class ItemPriceStats:
+    """Sliding window price statistics of a single item.
+
+    The window is split into ``slots`` slices which are reused as time
+    moves on, so memory does not depend on how many prices were added.
+    """
+
+    def __init__(
+        self,
+        window: float = 86400,
+        slots: int = 24,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 128,
+    ) -> None:
+        """Init object.
+
+        Args:
+            window (float, optional): seconds covered. Defaults to one day.
+            slots (int, optional): slices the window is split in.
+                Defaults to 24.
+            relative_accuracy (float, optional): relative error of quantiles.
+                Defaults to 0.01.
+            max_buckets (int, optional): sketch buckets per slice.
+                Defaults to 128.
+        """
+        self.slot_length = window / slots
+        self._slots = [_Slot(relative_accuracy, max_buckets) for _ in range(slots)]
+        self._relative_accuracy = relative_accuracy
+        self._max_buckets = max_buckets
+        self._summary: Optional[PriceStats] = None
+        self._summary_epoch = -1
+
+    def add(self, price: float, now: float) -> None:
+        """Add a price.
+
+        Args:
+            price (float): price paid or asked
+            now (float): unix time of the price
+        """
+        epoch = int(now // self.slot_length)
+        slot = self._slots[epoch % len(self._slots)]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+        slot.count += 1
+        slot.total += price
+        if price < slot.minimum:
+            slot.minimum = price
+        slot.sketch.add(price)
+        self._summary = None
+
+    def summary(self, now: float) -> PriceStats:
+        """Summarise the window ending now.
+
+        The summary is cached until a price is added or time moves into
+        the next slice, so repeated lookups are constant time.
+
+        Args:
+            now (float): unix time the window ends at
+
+        Returns:
+            PriceStats: statistics over the window
+        """
+        epoch = int(now // self.slot_length)
+        if self._summary is not None and self._summary_epoch == epoch:
+            return self._summary
+        oldest = epoch - len(self._slots) + 1
+        sketch = QuantileSketch(self._relative_accuracy, 2 * self._max_buckets)
+        count = 0
+        total = 0.0
+        minimum = math.inf
+        for slot in self._slots:
+            if oldest <= slot.epoch <= epoch and slot.count:
+                count += slot.count
+                total += slot.total
+                minimum = min(minimum, slot.minimum)
+                sketch.merge(slot.sketch)
+        self._summary = PriceStats(
+            volume=count,
+            minimum=minimum if count else None,
+            mean=total / count if count else None,
+            sketch=sketch,
+        )
+        self._summary_epoch = epoch
+        return self._summary
+
+
+def auction_price(auction: Auction_item) -> float:
+    """Get the price of an auction.
+
+    Args:
+        auction (Auction_item): auction
+
+    Returns:
+        float: highest bid, or the starting bid when there are no bids
+    """
+    return auction.highest_bid_amount or auction.starting_bid or 0
+
+
+class PriceAggregator:
+    """Aggregate prices of auction streams per item.
+
+    Auctions that show up again in later snapshots are only counted once.
+    """
+
+    def __init__(
+        self,
+        window: float = 86400,
+        slots: int = 24,
+        relative_accuracy: float = 0.01,
+        key: Callable[[Auction_item], str] = lambda auction: auction.item_name or "",
+        price: Callable[[Auction_item], float] = auction_price,
+        dedup_size: int = 1000000,
+    ) -> None:
+        """Init object.
+
+        Args:
+            window (float, optional): seconds covered. Defaults to one day.
+            slots (int, optional): slices the window is split in.
+                Defaults to 24.
+            relative_accuracy (float, optional): relative error of quantiles.
+                Defaults to 0.01.
+            key (Callable[[Auction_item], str], optional): groups auctions
+                into items. Defaults to the item name.
+            price (Callable[[Auction_item], float], optional): price of an
+                auction. Defaults to auction_price.
+            dedup_size (int, optional): auction ids remembered to avoid
+                counting them twice. Defaults to 1000000.
+        """
+        self.window = window
+        self.slots = slots
+        self.relative_accuracy = relative_accuracy
+        self.key = key
+        self.price = price
+        self.items: Dict[str, ItemPriceStats] = {}
+        self._seen = TimeWindowSet(window, dedup_size, clock=time.time)
+
+    def add(self, auction: Auction_item, now: Optional[float] = None) -> bool:
+        """Add a single auction.
+
+        Args:
+            auction (Auction_item): auction to add
+            now (float, optional): unix time of the price. Defaults to now.
+
+        Returns:
+            bool: if the auction was counted, False for duplicates
+        """
+        if now is None:
+            now = time.time()
+        if auction.uuid is not None and not self._seen.add(auction.uuid, now):
+            return False
+        name = self.key(auction)
+        stats = self.items.get(name)
+        if stats is None:
+            stats = self.items[name] = ItemPriceStats(
+                self.window, self.slots, self.relative_accuracy
+            )
+        stats.add(self.price(auction), now)
+        return True
+
+    def add_many(
+        self, auctions: Iterable[Auction_item], now: Optional[float] = None
+    ) -> int:
+        """Add a snapshot of auctions.
+
+        Args:
+            auctions (Iterable[Auction_item]): auctions to add
+            now (float, optional): unix time of the prices. Defaults to now.
+
+        Returns:
+            int: amount of auctions counted
+        """
+        if now is None:
+            now = time.time()
+        return sum(self.add(auction, now) for auction in auctions)
+
+    def stats(self, item: str, now: Optional[float] = None) -> Optional[PriceStats]:
+        """Get the statistics of an item.
+
+        Args:
+            item (str): item key
+            now (float, optional): unix time the window ends at.
+                Defaults to now.
+
+        Returns:
+            Optional[PriceStats]: statistics, None for unknown items
+        """
+        stats = self.items.get(item)
+        if stats is None:
+            return None
+        return stats.summary(time.time() if now is None else now)
+
+    def fair_price(
+        self, item: str, quantile: float = 0.5, now: Optional[float] = None
+    ) -> Optional[float]:
+        """Estimate the fair price of an item.
+
+        Args:
+            item (str): item key
+            quantile (float, optional): price quantile used. Defaults to the
+                median.
+            now (float, optional): unix time the window ends at.
+                Defaults to now.
+
+        Returns:
+            Optional[float]: estimated price, None without prices
+        """
+        stats = self.stats(item, now)
+        return stats.quantile(quantile) if stats is not None else None
+
+    def fair_prices(
+        self, quantile: float = 0.5, now: Optional[float] = None
+    ) -> Dict[str, Optional[float]]:
+        """Estimate the fair price of every item.
+
+        Args:
+            quantile (float, optional): price quantile used. Defaults to the
+                median.
+            now (float, optional): unix time the window ends at.
+                Defaults to now.
+
+        Returns:
+            Dict[str, Optional[float]]: estimated price of each item
+        """
+        now = time.time() if now is None else now
+        return {item: self.fair_price(item, quantile, now) for item in self.items}
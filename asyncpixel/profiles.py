@@ -0,0 +1,153 @@
+"""Batched loading of skyblock profiles shared between coop members.
+
+Every member of a coop gets the whole coop profile in their profile
+listing. The loader fetches listings concurrently and keeps one Profile
+per profile id, so sections decoded lazily on a shared profile are decoded
+once. Players found as members of a profile that is already loaded are
+not fetched again unless ``skip_known_members`` is off, which saves a
+request and a download of the coop profile for every other coop member.
+A player is only fetched once the listings in flight when it is picked up
+have arrived, so coop members are skipped at any concurrency.
+
+Example::
+
+    loader = ProfileLoader(client)
+    profiles = await loader.load(uuids)
+"""
+
+import asyncio
+import collections
+from typing import Dict, Iterable, List, Set
+
+from .client import Client
+from .models.profile import Profile
+from .scheduler import Priority
+
+
+class ProfileLoader:
+    """Load the profiles of many players, sharing coop profiles."""
+
+    def __init__(
+        self,
+        client: Client,
+        concurrency: int = 8,
+        skip_known_members: bool = True,
+        priority: Priority = Priority.BULK,
+    ) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to fetch profile listings
+            concurrency (int, optional): listings fetched at once.
+                Defaults to 8.
+            skip_known_members (bool, optional): take the profiles of a
+                player that is a member of a loaded profile from the loaded
+                profiles instead of fetching their listing, which misses
+                profiles they share with no loaded player. Defaults to True.
+            priority (Priority, optional): priority of the listing requests.
+                Defaults to Priority.BULK.
+
+        Raises:
+            ValueError: if concurrency is not positive
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive.")
+        self.client = client
+        self.concurrency = concurrency
+        self.skip_known_members = skip_known_members
+        self.priority = priority
+        self.profiles: Dict[str, Profile] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.fetched = 0
+        self.skipped = 0
+        self._memberships: Dict[str, List[str]] = {}
+        self._listed: Set[str] = set()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _join(self, uuid: str, profile_id: str) -> None:
+        memberships = self._memberships.setdefault(uuid, [])
+        if profile_id not in memberships:
+            memberships.append(profile_id)
+
+    def _share(self, uuid: str, profiles: Iterable[Profile]) -> None:
+        for profile in profiles:
+            profile_id = profile.profile_id
+            if profile_id is None:
+                continue
+            if profile_id not in self.profiles:
+                self.profiles[profile_id] = profile
+                for member in profile.raw.get("members") or {}:
+                    self._join(member, profile_id)
+            self._join(uuid, profile_id)
+
+    def profiles_of(self, uuid: str) -> List[Profile]:
+        """Get the loaded profiles a player is a member of.
+
+        Args:
+            uuid (str): uuid of the player
+
+        Returns:
+            List[Profile]: shared profile objects, empty if none are loaded
+        """
+        uuid = uuid.replace("-", "")
+        return [self.profiles[i] for i in self._memberships.get(uuid, ())]
+
+    async def _fetch(self, uuid: str) -> None:
+        done = asyncio.get_event_loop().create_future()
+        self._in_flight[uuid] = done
+        try:
+            profiles = await self.client.get_profiles(uuid)
+        except Exception as error:
+            self.errors[uuid] = error
+        else:
+            self.errors.pop(uuid, None)
+            self.fetched += 1
+            self._listed.add(uuid)
+            self._share(uuid, profiles)
+        finally:
+            del self._in_flight[uuid]
+            done.set_result(None)
+
+    async def _load(self, uuid: str) -> None:
+        if self.skip_known_members and self._in_flight:
+            # A listing in flight may reveal the player as a coop member.
+            await asyncio.wait(list(self._in_flight.values()))
+        if uuid in self._listed:
+            return
+        if self.skip_known_members and uuid in self._memberships:
+            self.errors.pop(uuid, None)
+            self.skipped += 1
+            return
+        pending = self._in_flight.get(uuid)
+        if pending is not None:
+            await pending
+            return
+        await self._fetch(uuid)
+
+    async def load(self, uuids: Iterable[str]) -> Dict[str, List[Profile]]:
+        """Load the profiles of players.
+
+        Listings already fetched by this loader are not fetched again. A
+        failing listing is skipped and its error kept in ``errors`` until it
+        loads.
+
+        Args:
+            uuids (Iterable[str]): uuids of the players
+
+        Returns:
+            Dict[str, List[Profile]]: shared profiles by uuid for every
+            player that did not fail
+        """
+        order = list(dict.fromkeys(uuid.replace("-", "") for uuid in uuids))
+        pending = collections.deque(order)
+
+        async def worker() -> None:
+            with Client.priority(self.priority):
+                while pending:
+                    await self._load(pending.popleft())
+
+        workers = min(self.concurrency, len(pending))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return {
+            uuid: self.profiles_of(uuid) for uuid in order if uuid not in self.errors
+        }
@@ -0,0 +1,277 @@
+"""Level and progression calculators.
+
+Every calculator comes in a scalar and a batch flavour so that whole
+leaderboards can be converted in one call. Table based progressions
+(guild levels and skyblock skills) are stored as cumulative experience
+tables and looked up with a binary search.
+"""
+
+from bisect import bisect_right
+from math import sqrt
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+NETWORK_BASE = 10000
+NETWORK_GROWTH = 2500
+
+_NETWORK_REVERSE_PQ_PREFIX = -(NETWORK_BASE - 0.5 * NETWORK_GROWTH) / NETWORK_GROWTH
+_NETWORK_REVERSE_CONST = _NETWORK_REVERSE_PQ_PREFIX ** 2
+_NETWORK_REVERSE_SCALE = 2 / NETWORK_GROWTH
+
+# Experience needed to go from each guild level to the next, every level
+# after the last entry costs GUILD_EXP_OVERFLOW.
+GUILD_EXP_NEEDED = [
+    100000,
+    150000,
+    250000,
+    500000,
+    750000,
+    1000000,
+    1250000,
+    1500000,
+    2000000,
+    2500000,
+    2500000,
+    2500000,
+    2500000,
+    2500000,
+    3000000,
+]
+GUILD_EXP_OVERFLOW = 3000000
+
+
+def network_level_exact(xp: float) -> float:
+    """Calculate the fractional network level of a player.
+
+    Args:
+        xp (float): network experience of the player
+
+    Returns:
+        float: network level including progress towards the next level
+    """
+    if xp < 0:
+        return 1.0
+    return (
+        1
+        + _NETWORK_REVERSE_PQ_PREFIX
+        + sqrt(_NETWORK_REVERSE_CONST + _NETWORK_REVERSE_SCALE * xp)
+    )
+
+
+def network_level(xp: float) -> int:
+    """Calculate the network level of a player.
+
+    Args:
+        xp (float): network experience of the player
+
+    Returns:
+        int: current network level
+    """
+    return int(network_level_exact(xp))
+
+
+def network_levels(xps: Iterable[float]) -> List[int]:
+    """Calculate network levels for many players at once.
+
+    Args:
+        xps (Iterable[float]): network experience of each player, any
+            iterable of numbers including arrays is accepted
+
+    Returns:
+        List[int]: network level of each player in input order
+    """
+    prefix = 1 + _NETWORK_REVERSE_PQ_PREFIX
+    const = _NETWORK_REVERSE_CONST
+    growth = _NETWORK_REVERSE_SCALE
+    root = sqrt
+    return [int(prefix + root(const + growth * xp)) if xp > 0 else 1 for xp in xps]
+
+
+def network_exp_for_level(level: float) -> float:
+    """Calculate the total network experience needed to reach a level.
+
+    Args:
+        level (float): network level, may be fractional
+
+    Returns:
+        float: total experience needed
+    """
+    n = max(level - 1, 0)
+    return (NETWORK_GROWTH / 2) * n * n + (NETWORK_BASE - NETWORK_GROWTH / 2) * n
+
+
+class LevelTable:
+    """Cumulative experience table for level lookups."""
+
+    def __init__(
+        self,
+        totals: Sequence[float],
+        overflow: float = 0,
+        max_level: Optional[int] = None,
+    ) -> None:
+        """Init object.
+
+        Args:
+            totals (Sequence[float]): total experience needed to reach
+                level 1, 2, 3 and so on, must be ascending.
+            overflow (float, optional): experience needed for every level
+                past the end of the table. Defaults to 0 which caps the level
+                at the end of the table.
+            max_level (int, optional): hard cap on the level. Defaults to the
+                table length when there is no overflow.
+
+        Raises:
+            ValueError: if totals are not ascending
+        """
+        self.totals = list(totals)
+        for low, high in zip(self.totals, self.totals[1:]):
+            if high < low:
+                raise ValueError("Level table totals must be ascending.")
+        self.overflow = overflow
+        if max_level is None and not overflow:
+            max_level = len(self.totals)
+        self.max_level = max_level
+
+    @classmethod
+    def from_increments(
+        cls,
+        increments: Sequence[float],
+        overflow: float = 0,
+        max_level: Optional[int] = None,
+    ) -> "LevelTable":
+        """Build a table from the experience needed for each level.
+
+        Args:
+            increments (Sequence[float]): experience needed to go from one
+                level to the next.
+            overflow (float, optional): experience needed for every level
+                past the end of the table. Defaults to 0.
+            max_level (int, optional): hard cap on the level. Defaults to None.
+
+        Returns:
+            LevelTable: cumulative table
+        """
+        totals = []
+        running = 0.0
+        for increment in increments:
+            running += increment
+            totals.append(running)
+        return cls(totals, overflow=overflow, max_level=max_level)
+
+    def level(self, exp: float) -> int:
+        """Get the level reached with an amount of experience.
+
+        Args:
+            exp (float): total experience
+
+        Returns:
+            int: level reached
+        """
+        level = bisect_right(self.totals, exp)
+        if level == len(self.totals) and self.overflow and self.totals:
+            level += int((exp - self.totals[-1]) // self.overflow)
+        if self.max_level is not None and level > self.max_level:
+            return self.max_level
+        return level
+
+    def levels(self, exps: Iterable[float]) -> List[int]:
+        """Get the levels reached for many experience values at once.
+
+        Args:
+            exps (Iterable[float]): total experience of each entry
+
+        Returns:
+            List[int]: level of each entry in input order
+        """
+        totals = self.totals
+        search = bisect_right
+        if not self.overflow or not totals:
+            cap = len(totals) if self.max_level is None else self.max_level
+            return [min(search(totals, exp), cap) for exp in exps]
+        last = totals[-1]
+        level = self.level
+        return [search(totals, exp) if exp < last else level(exp) for exp in exps]
+
+    def exp_for_level(self, level: int) -> float:
+        """Get the total experience needed to reach a level.
+
+        Args:
+            level (int): level to reach
+
+        Returns:
+            float: total experience needed
+
+        Raises:
+            ValueError: if the level can not be reached
+        """
+        if level <= 0:
+            return 0.0
+        if self.max_level is not None and level > self.max_level:
+            raise ValueError(f"Level {level} is above the maximum level.")
+        if level <= len(self.totals):
+            return self.totals[level - 1]
+        last = self.totals[-1] if self.totals else 0.0
+        return last + (level - len(self.totals)) * self.overflow
+
+    def progress(self, exp: float) -> float:
+        """Get the fractional level reached with an amount of experience.
+
+        Args:
+            exp (float): total experience
+
+        Returns:
+            float: level including progress towards the next level
+        """
+        level = self.level(exp)
+        if self.max_level is not None and level >= self.max_level:
+            return float(level)
+        low = self.exp_for_level(level)
+        high = self.exp_for_level(level + 1)
+        return level + (exp - low) / (high - low)
+
+
+GUILD_LEVELS = LevelTable.from_increments(GUILD_EXP_NEEDED, GUILD_EXP_OVERFLOW)
+
+
+def guild_level(exp: float) -> int:
+    """Calculate the level of a guild.
+
+    Args:
+        exp (float): guild experience as found in ``Guild.exp``
+
+    Returns:
+        int: guild level
+    """
+    return GUILD_LEVELS.level(exp)
+
+
+def guild_levels(exps: Iterable[float]) -> List[int]:
+    """Calculate levels for many guilds at once.
+
+    Args:
+        exps (Iterable[float]): experience of each guild
+
+    Returns:
+        List[int]: guild level of each guild in input order
+    """
+    return GUILD_LEVELS.levels(exps)
+
+
+def skill_tables(resources: Mapping) -> Dict[str, LevelTable]:
+    """Build skill level tables from the skyblock skills resource.
+
+    Args:
+        resources (Mapping): response of
+            ``Client.get_resources_skyblock_skills``
+
+    Returns:
+        Dict[str, LevelTable]: level table for each skill keyed by skill id
+    """
+    skills = resources.get("skills", resources)
+    tables = {}
+    for skill_id, skill in skills.items():
+        levels = sorted(skill["levels"], key=lambda level: level["level"])
+        tables[skill_id] = LevelTable(
+            [level["totalExpRequired"] for level in levels],
+            max_level=skill.get("maxLevel", len(levels)),
+        )
+    return tables
@@ -0,0 +1,223 @@
+"""Catalogue of the static hypixel resources."""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .client import Client
+
+SNAPSHOT_VERSION = 1
+
+# Resource name mapped to the client method fetching it.
+RESOURCES = {
+    "achievements": "get_resources_achievements",
+    "challenges": "get_resources_challenges",
+    "quests": "get_resources_quests",
+    "guilds_achievements": "get_resources_guilds_achievements",
+    "guilds_permissions": "get_resources_guilds_permissions",
+    "skyblock_collections": "get_resources_skyblock_collections",
+    "skyblock_skills": "get_resources_skyblock_skills",
+}
+
+
+def _index_achievements(data: Dict) -> Dict[str, Dict]:
+    index = {}
+    for game, achievements in data.items():
+        for kind in ("one_time", "tiered"):
+            for name, achievement in achievements.get(kind, {}).items():
+                index[f"{game}_{name}".lower()] = achievement
+    return index
+
+
+def _index_by_id(data: Dict) -> Dict[str, Dict]:
+    index = {}
+    for entries in data.values():
+        for entry in entries:
+            index[entry["id"]] = entry
+    return index
+
+
+def _index_guild_achievements(data: Dict) -> Dict[str, Dict]:
+    index = {}
+    for kind in ("one_time", "tiered"):
+        index.update(data.get(kind, {}))
+    return index
+
+
+def _index_guild_permissions(data: Any) -> Dict[str, Dict]:
+    if isinstance(data, dict):
+        return dict(data)
+    return {str(position): permission for position, permission in enumerate(data)}
+
+
+def _index_collections(data: Dict) -> Dict[str, Dict]:
+    index = {}
+    for category_id, category in data.get("collections", data).items():
+        index[category_id] = category
+        index.update(category.get("items", {}))
+    return index
+
+
+def _index_skills(data: Dict) -> Dict[str, Dict]:
+    return dict(data.get("skills", data))
+
+
+_INDEXERS: Dict[str, Callable[[Any], Dict[str, Dict]]] = {
+    "achievements": _index_achievements,
+    "challenges": _index_by_id,
+    "quests": _index_by_id,
+    "guilds_achievements": _index_guild_achievements,
+    "guilds_permissions": _index_guild_permissions,
+    "skyblock_collections": _index_collections,
+    "skyblock_skills": _index_skills,
+}
+
+
+class ResourceCatalogue:
+    """Preloaded and indexed hypixel resources.
+
+    Resources are fetched concurrently and indexed by id. When a snapshot
+    path is given the catalogue is stored on disk so the next start can
+    load it without waiting on the api.
+    """
+
+    def __init__(self, client: Client, snapshot_path: Optional[str] = None) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to fetch the resources.
+            snapshot_path (str, optional): file used to persist the catalogue.
+                Defaults to None which disables snapshots.
+        """
+        self.client = client
+        self.snapshot_path = snapshot_path
+        self.raw: Dict[str, Any] = {}
+        self.updated: Optional[float] = None
+        self._indexes: Dict[str, Dict[str, Dict]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.refresh_error: Optional[Exception] = None
+
+    def __contains__(self, resource: str) -> bool:
+        """Check whether a resource is loaded.
+
+        Args:
+            resource (str): name of the resource
+
+        Returns:
+            bool: if the resource is loaded
+        """
+        return resource in self._indexes
+
+    def get(self, resource: str, key: str) -> Optional[Dict]:
+        """Look up a single entry of a resource.
+
+        Args:
+            resource (str): name of the resource, one of ``RESOURCES``
+            key (str): id of the entry
+
+        Returns:
+            Optional[Dict]: the entry or None if it does not exist
+        """
+        return self._indexes.get(resource, {}).get(key)
+
+    def index(self, resource: str) -> Dict[str, Dict]:
+        """Get every entry of a resource keyed by id.
+
+        Args:
+            resource (str): name of the resource, one of ``RESOURCES``
+
+        Returns:
+            Dict[str, Dict]: entries keyed by id
+        """
+        return self._indexes.get(resource, {})
+
+    def _set(self, raw: Dict[str, Any], updated: float) -> None:
+        self._indexes = {
+            name: _INDEXERS[name](data)
+            for name, data in raw.items()
+            if name in RESOURCES
+        }
+        self.raw = raw
+        self.updated = updated
+
+    async def refresh(self) -> None:
+        """Fetch every resource concurrently and rebuild the indexes."""
+        names = list(RESOURCES)
+        results = await asyncio.gather(
+            *(getattr(self.client, RESOURCES[name])() for name in names)
+        )
+        self._set(dict(zip(names, results)), time.time())
+        if self.snapshot_path is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self.save_snapshot)
+
+    def save_snapshot(self) -> None:
+        """Write the catalogue to the snapshot file.
+
+        Raises:
+            ValueError: if no snapshot path is configured
+        """
+        if self.snapshot_path is None:
+            raise ValueError("No snapshot path configured.")
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "updated": self.updated,
+            "resources": self.raw,
+        }
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(snapshot, file)
+        os.replace(temp_path, self.snapshot_path)
+
+    def load_snapshot(self) -> bool:
+        """Load the catalogue from the snapshot file.
+
+        Returns:
+            bool: if a compatible snapshot was loaded
+        """
+        if self.snapshot_path is None or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path) as file:
+                snapshot = json.load(file)
+        except ValueError:
+            return False
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        self._set(snapshot["resources"], snapshot["updated"])
+        return True
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as error:
+            self.refresh_error = error
+
+    async def start(self, max_age: float = 0) -> None:
+        """Load the catalogue, preferring the snapshot on disk.
+
+        When a snapshot is found it is used straight away and, if older
+        than ``max_age``, refreshed in the background. A failed background
+        refresh keeps the snapshot and is stored in ``refresh_error``.
+        Without a snapshot the resources are fetched before returning.
+
+        Args:
+            max_age (float, optional): seconds after which a snapshot is
+                refreshed. Defaults to 0 which always refreshes.
+        """
+        loop = asyncio.get_event_loop()
+        loaded = await loop.run_in_executor(None, self.load_snapshot)
+        if not loaded:
+            await self.refresh()
+        elif self.updated is None or time.time() - self.updated > max_age:
+            self._refresh_task = loop.create_task(self._background_refresh())
+
+    async def close(self) -> None:
+        """Cancel a background refresh that is still running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,330 @@
+"""Periodic sampling of global counters into fixed size ring buffers."""
+
+import array
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .client import Client
+
+Source = Callable[[Client], Awaitable[Dict[str, float]]]
+
+# Resolution in seconds mapped to the amount of points kept, 0 is raw.
+DEFAULT_RESOLUTIONS = {0: 1440, 60: 1440, 3600: 24 * 90}
+
+
+class RingBuffer:
+    """Fixed size buffer of timestamped values stored in typed arrays.
+
+    Once full the oldest point is overwritten. Timestamps must be added in
+    increasing order so ranges are found with a binary search.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Init object.
+
+        Args:
+            capacity (int): points kept at most.
+        """
+        self.capacity = capacity
+        self.times = array.array("d", bytes(8 * capacity))
+        self.values = array.array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Amount of points stored.
+
+        Returns:
+            int: amount of points
+        """
+        return self._size
+
+    def _slot(self, index: int) -> int:
+        return (self._start + index) % self.capacity
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a point, overwriting the oldest one when full.
+
+        Args:
+            timestamp (float): unix time of the point
+            value (float): value of the point
+        """
+        if self._size < self.capacity:
+            slot = self._slot(self._size)
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self.times[slot] = timestamp
+        self.values[slot] = value
+
+    def last(self) -> Optional[Tuple[float, float]]:
+        """Get the newest point.
+
+        Returns:
+            Optional[Tuple[float, float]]: timestamp and value, None if empty
+        """
+        if not self._size:
+            return None
+        slot = self._slot(self._size - 1)
+        return self.times[slot], self.values[slot]
+
+    def set_last(self, value: float) -> None:
+        """Replace the value of the newest point.
+
+        Args:
+            value (float): new value
+        """
+        self.values[self._slot(self._size - 1)] = value
+
+    def _bisect(self, timestamp: float) -> int:
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[self._slot(middle)] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def range(
+        self, start: float = float("-inf"), end: float = float("inf")
+    ) -> Tuple[List[float], List[float]]:
+        """Get the points with ``start <= timestamp < end``.
+
+        Args:
+            start (float, optional): first unix time included.
+                Defaults to the oldest point.
+            end (float, optional): unix time excluded. Defaults to after the
+                newest point.
+
+        Returns:
+            Tuple[List[float], List[float]]: timestamps and values
+        """
+        first = self._bisect(start)
+        stop = self._bisect(end)
+        first_slot = self._slot(first)
+        stop_slot = first_slot + stop - first
+        if stop_slot <= self.capacity:
+            return (
+                self.times[first_slot:stop_slot].tolist(),
+                self.values[first_slot:stop_slot].tolist(),
+            )
+        wrapped = stop_slot - self.capacity
+        return (
+            self.times[first_slot:].tolist() + self.times[:wrapped].tolist(),
+            self.values[first_slot:].tolist() + self.values[:wrapped].tolist(),
+        )
+
+
+class Series:
+    """A counter sampled at several resolutions.
+
+    The raw buffer keeps every sample, the others keep the mean of each
+    bucket of ``resolution`` seconds, stamped with the start of the bucket.
+    """
+
+    def __init__(self, resolutions: Mapping[int, int] = DEFAULT_RESOLUTIONS) -> None:
+        """Init object.
+
+        Args:
+            resolutions (Mapping[int, int], optional): bucket seconds mapped
+                to points kept, 0 for raw samples.
+                Defaults to DEFAULT_RESOLUTIONS.
+        """
+        self.buffers = {
+            resolution: RingBuffer(capacity)
+            for resolution, capacity in resolutions.items()
+        }
+        self._counts = {resolution: 0 for resolution in resolutions}
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample to every resolution.
+
+        Args:
+            timestamp (float): unix time of the sample
+            value (float): sampled value
+        """
+        for resolution, buffer in self.buffers.items():
+            if not resolution:
+                buffer.append(timestamp, value)
+                continue
+            bucket = timestamp - timestamp % resolution
+            last = buffer.last()
+            if last is not None and last[0] == bucket:
+                self._counts[resolution] += 1
+                count = self._counts[resolution]
+                buffer.set_last(last[1] + (value - last[1]) / count)
+            else:
+                buffer.append(bucket, value)
+                self._counts[resolution] = 1
+
+    def range(
+        self,
+        start: float = float("-inf"),
+        end: float = float("inf"),
+        resolution: int = 0,
+    ) -> Tuple[List[float], List[float]]:
+        """Get the points of a resolution with ``start <= timestamp < end``.
+
+        Args:
+            start (float, optional): first unix time included.
+                Defaults to the oldest point.
+            end (float, optional): unix time excluded. Defaults to after the
+                newest point.
+            resolution (int, optional): bucket seconds, 0 for raw samples.
+                Defaults to 0.
+
+        Returns:
+            Tuple[List[float], List[float]]: timestamps and values
+        """
+        return self.buffers[resolution].range(start, end)
+
+
+async def _player_count(client: Client) -> Dict[str, float]:
+    return {"players": await client.get_player_count()}
+
+
+async def _game_counts(client: Client) -> Dict[str, float]:
+    games = await client.get_game_count()
+    return {f"games.{name}": game.get("players", 0) for name, game in games.items()}
+
+
+async def _watchdog(client: Client) -> Dict[str, float]:
+    stats = await client.get_watchdog_stats()
+    return {f"watchdog.{name}": value for name, value in vars(stats).items()}
+
+
+async def _boosters(client: Client) -> Dict[str, float]:
+    boosters = await client.get_boosters()
+    return {"boosters": len(boosters.boosters)}
+
+
+DEFAULT_SOURCES: Dict[str, Source] = {
+    "players": _player_count,
+    "games": _game_counts,
+    "watchdog": _watchdog,
+    "boosters": _boosters,
+}
+
+
+class Sampler:
+    """Poll global counters on a shared tick and keep their history.
+
+    Every tick all sources are requested together and each value they
+    return is added to the series of that name, so memory only depends on
+    the amount of series and the configured resolutions.
+
+    Example::
+
+        sampler = Sampler(client, interval=60)
+        sampler.start()
+        times, values = sampler.range("players", resolution=3600)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        interval: float = 60,
+        sources: Optional[Mapping[str, Source]] = None,
+        resolutions: Mapping[int, int] = DEFAULT_RESOLUTIONS,
+    ) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to poll.
+            interval (float, optional): seconds between ticks. Defaults to 60.
+            sources (Mapping[str, Source], optional): coroutines returning
+                named values. Defaults to players, games, watchdog and
+                boosters.
+            resolutions (Mapping[int, int], optional): bucket seconds mapped
+                to points kept. Defaults to DEFAULT_RESOLUTIONS.
+        """
+        self.client = client
+        self.interval = interval
+        self.sources = dict(DEFAULT_SOURCES if sources is None else sources)
+        self.resolutions = dict(resolutions)
+        self.series: Dict[str, Series] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def range(
+        self,
+        name: str,
+        start: float = float("-inf"),
+        end: float = float("inf"),
+        resolution: int = 0,
+    ) -> Tuple[List[float], List[float]]:
+        """Get the points of a series.
+
+        Args:
+            name (str): series name such as ``players``
+            start (float, optional): first unix time included.
+                Defaults to the oldest point.
+            end (float, optional): unix time excluded. Defaults to after the
+                newest point.
+            resolution (int, optional): bucket seconds, 0 for raw samples.
+                Defaults to 0.
+
+        Returns:
+            Tuple[List[float], List[float]]: timestamps and values, empty for
+            unknown series
+        """
+        series = self.series.get(name)
+        if series is None:
+            return [], []
+        return series.range(start, end, resolution)
+
+    async def sample(self, now: Optional[float] = None) -> None:
+        """Poll every source once and record the results.
+
+        A failing source is skipped for this tick and its error is kept in
+        ``errors`` until it succeeds again.
+
+        Args:
+            now (float, optional): unix time of the samples. Defaults to now.
+        """
+        if now is None:
+            now = time.time()
+        names = list(self.sources)
+        results = await asyncio.gather(
+            *(self.sources[name](self.client) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                self.errors[name] = result
+                continue
+            self.errors.pop(name, None)
+            for key, value in result.items():
+                series = self.series.get(key)
+                if series is None:
+                    series = self.series[key] = Series(self.resolutions)
+                series.add(now, value)
+
+    async def run(self) -> None:
+        """Sample forever, one tick every ``interval`` seconds."""
+        loop = asyncio.get_event_loop()
+        tick = loop.time()
+        while True:
+            await self.sample()
+            tick += self.interval
+            await asyncio.sleep(max(0.0, tick - loop.time()))
+
+    def start(self) -> asyncio.Task:
+        """Run the sampler in the background.
+
+        Returns:
+            asyncio.Task: the running sampler
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
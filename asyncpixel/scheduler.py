@@ -0,0 +1,372 @@
+"""Priority scheduling of requests sharing one api key."""
+
+import asyncio
+import collections
+from contextlib import asynccontextmanager
+import enum
+import math
+import time
+from typing import AsyncIterator, Deque, Dict, Mapping, Optional, Tuple
+
+
+class Priority(enum.IntEnum):
+    """Request classes, lower values are served first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class TokenBucket:
+    """Token bucket enforcing the request rate of a key."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Init object.
+
+        Args:
+            rate (float): tokens added per second.
+            capacity (float): maximum tokens stored.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is ready
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def available(self) -> bool:
+        """Check whether a token could be taken right now.
+
+        Returns:
+            bool: if a token is available
+        """
+        self._refill()
+        return self.tokens >= 1
+
+
+class QueueStats:
+    """Queue wait statistics of a request class."""
+
+    def __init__(self) -> None:
+        """Init object."""
+        self.granted = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Mean seconds spent queued.
+
+        Returns:
+            float: mean wait
+        """
+        return self.total_wait / self.granted if self.granted else 0.0
+
+    def record(self, wait: float) -> None:
+        """Record the wait of a granted request.
+
+        Args:
+            wait (float): seconds spent queued
+        """
+        self.granted += 1
+        self.total_wait += wait
+        self.last_wait = wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+
+class AdaptiveLimiter:
+    """Concurrency limit tuned from latency and rate limit feedback.
+
+    The limit follows the ratio of the long term latency to the latest
+    one. While requests are as fast as usual it grows by about the square
+    root of the limit, and when latency rises because requests queue
+    upstream it shrinks in proportion, down to half per update. A 429 or
+    a failed request cuts it by ``backoff``, and it never exceeds the
+    requests left in the current rate limit window.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        window: int = 100,
+    ) -> None:
+        """Init object.
+
+        Args:
+            initial (int, optional): starting limit. Defaults to 4.
+            min_limit (int, optional): lowest limit. Defaults to 1.
+            max_limit (int, optional): highest limit. Defaults to 64.
+            backoff (float, optional): factor the limit is multiplied by
+                after a 429 or failed request. Defaults to 0.5.
+            smoothing (float, optional): weight of each update in the
+                limit. Defaults to 0.2.
+            tolerance (float, optional): latency increase over the long
+                term average accepted without shrinking. Defaults to 1.5.
+            window (int, optional): roughly how many requests the long
+                term latency is averaged over. Defaults to 100.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self._weight = 1 / window
+        self._limit = float(initial)
+        self._long: Optional[float] = None
+        self.drops = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit.
+
+        Returns:
+            int: requests allowed in flight
+        """
+        return int(self._limit)
+
+    def _clamp(self, limit: float, ceiling: Optional[int] = None) -> int:
+        upper = self.max_limit if ceiling is None else min(self.max_limit, ceiling)
+        self._limit = min(max(limit, self.min_limit), max(upper, self.min_limit))
+        return self.limit
+
+    def on_success(
+        self,
+        latency: float,
+        in_flight: int,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> int:
+        """Update the limit after a completed request.
+
+        Args:
+            latency (float): seconds the request took once sent
+            in_flight (int): requests in flight when it completed
+            headers (Mapping[str, str], optional): response headers, the
+                ``RateLimit-Remaining`` header caps the limit. Defaults to
+                None.
+
+        Returns:
+            int: new limit
+        """
+        long = self._long = (
+            latency
+            if self._long is None
+            else self._long + (latency - self._long) * self._weight
+        )
+        # Recover quickly when latency drops back after a slow period.
+        if latency and long > 2 * latency:
+            long = self._long = long * 0.95
+        ceiling = None
+        remaining = (headers or {}).get("RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            ceiling = int(remaining)
+        gradient = 1.0
+        if latency:
+            gradient = max(0.5, min(1.0, self.tolerance * long / latency))
+        target = self._limit * gradient
+        # Only grow when the current limit is actually being used.
+        if in_flight * 2 >= self._limit:
+            target += math.sqrt(self._limit)
+        limit = self._limit + (target - self._limit) * self.smoothing
+        return self._clamp(limit, ceiling)
+
+    def on_drop(self) -> int:
+        """Cut the limit after a 429 or a failed request.
+
+        Returns:
+            int: new limit
+        """
+        self.drops += 1
+        return self._clamp(self._limit * self.backoff)
+
+
+DEFAULT_MIN_SHARES = {Priority.NORMAL: 0.2, Priority.BULK: 0.1}
+
+
+class PriorityScheduler:
+    """Dispatch requests by priority within one rate limit budget.
+
+    Waiting requests are served highest priority first, except that a
+    class whose oldest request has waited ``starve_after`` seconds and
+    which has received less than its minimum share of recent grants is
+    served first, so bulk work is never starved without letting it jump
+    ahead of interactive requests whenever its share dips.
+    """
+
+    def __init__(
+        self,
+        rate_limit: int = 120,
+        period: float = 60,
+        burst: int = 10,
+        max_concurrency: int = 16,
+        min_shares: Optional[Mapping[Priority, float]] = None,
+        share_window: int = 100,
+        starve_after: float = 1.0,
+    ) -> None:
+        """Init object.
+
+        Args:
+            rate_limit (int, optional): requests allowed per period.
+                Defaults to 120.
+            period (float, optional): length of the period in seconds.
+                Defaults to 60.
+            burst (int, optional): requests that may be sent at once.
+                Defaults to 10.
+            max_concurrency (int, optional): requests in flight at once.
+                Defaults to 16.
+            min_shares (Mapping[Priority, float], optional): minimum fraction
+                of grants for each class while it is waiting. Defaults to
+                20% for normal and 10% for bulk requests.
+            share_window (int, optional): roughly how many recent grants
+                shares are measured over. Defaults to 100.
+            starve_after (float, optional): seconds the oldest request of a
+                class must wait before its minimum share is enforced.
+                Defaults to 1.0.
+        """
+        self.bucket = TokenBucket(rate_limit / period, burst)
+        self.max_concurrency = max_concurrency
+        self.min_shares = dict(DEFAULT_MIN_SHARES if min_shares is None else min_shares)
+        self.stats: Dict[Priority, QueueStats] = {p: QueueStats() for p in Priority}
+        self.in_flight = 0
+        self.starve_after = starve_after
+        self._decay = 1 - 1 / share_window
+        self._shares: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._queues: Dict[Priority, Deque[Tuple[asyncio.Future, float]]] = {
+            p: collections.deque() for p in Priority
+        }
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _prune(self, priority: Priority) -> bool:
+        queue = self._queues[priority]
+        while queue and queue[0][0].done():
+            queue.popleft()
+            self.stats[priority].waiting -= 1
+        return bool(queue)
+
+    def _pick(self) -> Optional[Priority]:
+        waiting = [p for p in Priority if self._prune(p)]
+        if not waiting:
+            return None
+        total = sum(self._shares.values())
+        starved = None
+        deficit = 0.0
+        cutoff = time.monotonic() - self.starve_after
+        for priority in waiting:
+            if self._queues[priority][0][1] > cutoff:
+                continue
+            share = self._shares[priority] / total if total else 0.0
+            missing = self.min_shares.get(priority, 0.0) - share
+            if missing > deficit:
+                starved, deficit = priority, missing
+        return starved if starved is not None else waiting[0]
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_concurrency:
+            priority = self._pick()
+            if priority is None:
+                return
+            delay = self.bucket.take()
+            if delay > 0:
+                if self._timer is None:
+                    loop = asyncio.get_event_loop()
+                    self._timer = loop.call_later(delay, self._wake)
+                return
+            future, queued = self._queues[priority].popleft()
+            stats = self.stats[priority]
+            stats.waiting -= 1
+            stats.record(time.monotonic() - queued)
+            for key in self._shares:
+                self._shares[key] *= self._decay
+            self._shares[priority] += 1
+            self.in_flight += 1
+            future.set_result(None)
+
+    def set_concurrency(self, limit: int) -> None:
+        """Change the amount of requests in flight at once.
+
+        Requests already in flight above a lowered limit finish normally,
+        queued requests are dispatched at once when the limit is raised.
+
+        Args:
+            limit (int): requests allowed in flight
+        """
+        raised = limit > self.max_concurrency
+        self.max_concurrency = limit
+        if raised:
+            self._dispatch()
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        self.in_flight -= 1
+        self._dispatch()
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        """Wait until a request of the given class may be sent.
+
+        Every successful acquire must be paired with ``release``.
+
+        Args:
+            priority (Priority, optional): request class.
+                Defaults to Priority.NORMAL.
+
+        Raises:
+            asyncio.CancelledError: if cancelled while queued
+        """
+        future = asyncio.get_event_loop().create_future()
+        self._queues[priority].append((future, time.monotonic()))
+        self.stats[priority].waiting += 1
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+                self._dispatch()
+            raise
+
+    @asynccontextmanager
+    async def request(
+        self, priority: Priority = Priority.NORMAL
+    ) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block.
+
+        Args:
+            priority (Priority, optional): request class.
+                Defaults to Priority.NORMAL.
+
+        Yields:
+            None: once the request may be sent
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
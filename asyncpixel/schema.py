@@ -0,0 +1,344 @@
+"""Declarative schemas compiled into parsers of api records.
+
+A schema lists the fields of a model with the key each is read from, an
+optional converter and the default used when the key is missing or null.
+The schema is compiled once into a function specialised for its fields,
+so parsing a record is a run of dictionary lookups and a single call to
+the model, and a record missing optional keys still parses.
+
+Parsers can be projected onto some of the fields, the others are then
+never read and left as None, which keeps large unused values such as item
+bytes out of memory.
+
+Example::
+
+    games = GAME.parse_many(data["games"])
+    prices = AUCTION_ITEM.parse_many(data["auctions"], ("uuid", "starting_bid"))
+"""
+
+import datetime as dt
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from .models.auctions import Auction_item, Ended_auction
+from .models.bazaar import (
+    Bazaar_buy_summary,
+    Bazaar_item,
+    Bazaar_quick_status,
+    Bazaar_sell_summary,
+)
+from .models.games import Game
+from .models.guild import Guild
+from .models.player import Player
+from .progression import network_level
+
+
+def from_millis(timestamp: float) -> dt.datetime:
+    """Convert a timestamp in milliseconds to a datetime.
+
+    Args:
+        timestamp (float): unix time in milliseconds
+
+    Returns:
+        dt.datetime: local datetime
+    """
+    return dt.datetime.fromtimestamp(timestamp / 1000)
+
+
+class Field:
+    """Description of one argument of a model."""
+
+    def __init__(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        convert: Optional[Callable[[Any], Any]] = None,
+        default: Any = None,
+        mapping_key: bool = False,
+    ) -> None:
+        """Init object.
+
+        Args:
+            name (str): argument of the model.
+            key (str, optional): key read from the record. Defaults to name.
+            convert (Callable[[Any], Any], optional): applied to values that
+                are present and not null. Defaults to None.
+            default (Any, optional): value used when the key is missing or
+                the value is null, shared by every record so it should not
+                be mutable. Defaults to None.
+            mapping_key (bool, optional): take the value from the key the
+                record is stored under, see Schema.parse_mapping. Defaults
+                to False.
+        """
+        self.name = name
+        self.key = name if key is None else key
+        self.convert = convert
+        self.default = default
+        self.mapping_key = mapping_key
+
+
+class Schema:
+    """Model description compiled into a parser."""
+
+    def __init__(self, model: Callable[..., Any], fields: Sequence[Field]) -> None:
+        """Init object.
+
+        Args:
+            model (Callable[..., Any]): class built from the parsed fields,
+                called with one keyword argument per field.
+            fields (Sequence[Field]): fields of the model.
+        """
+        self.model = model
+        self.fields = tuple(fields)
+        self.names = frozenset(field.name for field in self.fields)
+        self._parsers: Dict[Optional[FrozenSet[str]], Callable[..., Any]] = {}
+        self._parse = self.parser()
+
+    def parser(self, fields: Optional[Collection[str]] = None) -> Callable[..., Any]:
+        """Get the parser of a projection, compiling it on first use.
+
+        Args:
+            fields (Collection[str], optional): model arguments to parse,
+                the others are None. Defaults to None which parses all.
+
+        Raises:
+            ValueError: if a field is not part of the schema
+
+        Returns:
+            Callable[..., Any]: function building a model from a record
+        """
+        key = None if fields is None else frozenset(fields)
+        parser = self._parsers.get(key)
+        if parser is None:
+            if key is not None and not key <= self.names:
+                unknown = ", ".join(sorted(key - self.names))
+                raise ValueError(f"Unknown fields {unknown}.")
+            parser = self._parsers[key] = self._compile(key)
+        return parser
+
+    def _compile(self, only: Optional[FrozenSet[str]]) -> Callable[..., Any]:
+        namespace: Dict[str, Any] = {"model": self.model}
+        lines = ["def parse(record, mapping_key=None):", "    get = record.get"]
+        arguments = []
+        for index, field in enumerate(self.fields):
+            namespace[f"d{index}"] = field.default
+            if only is not None and field.name not in only:
+                value = "None"
+            elif field.mapping_key:
+                value = "mapping_key"
+            elif field.convert is None:
+                value = f"get({field.key!r}, d{index})"
+            else:
+                namespace[f"c{index}"] = field.convert
+                lines.append(f"    v{index} = get({field.key!r})")
+                value = f"d{index} if v{index} is None else c{index}(v{index})"
+            arguments.append(f"        {field.name}={value},")
+        lines.extend(["    return model(", *arguments, "    )"])
+        exec("\n".join(lines), namespace)  # noqa: S102
+        return namespace["parse"]
+
+    def parse(
+        self, record: Mapping[str, Any], fields: Optional[Collection[str]] = None
+    ) -> Any:
+        """Build a model from a record.
+
+        Args:
+            record (Mapping[str, Any]): decoded json object
+            fields (Collection[str], optional): model arguments to parse.
+                Defaults to None which parses all.
+
+        Returns:
+            Any: the model
+        """
+        parse = self._parse if fields is None else self.parser(fields)
+        return parse(record)
+
+    def parse_many(
+        self,
+        records: Optional[Iterable[Mapping[str, Any]]],
+        fields: Optional[Collection[str]] = None,
+    ) -> List:
+        """Build a model from each record of a list.
+
+        Args:
+            records (Iterable[Mapping[str, Any]], optional): decoded json
+                objects, None is treated as an empty list
+            fields (Collection[str], optional): model arguments to parse.
+                Defaults to None which parses all.
+
+        Returns:
+            List: models in the order of the records
+        """
+        if records is None:
+            return []
+        parse = self._parse if fields is None else self.parser(fields)
+        return list(map(parse, records))
+
+    def parse_mapping(
+        self,
+        records: Mapping[str, Mapping[str, Any]],
+        fields: Optional[Collection[str]] = None,
+    ) -> List:
+        """Build a model from each value of a json object.
+
+        Args:
+            records (Mapping[str, Mapping[str, Any]]): records by key, the key
+                fills the fields with ``mapping_key`` set
+            fields (Collection[str], optional): model arguments to parse.
+                Defaults to None which parses all.
+
+        Returns:
+            List: models in the order of the mapping
+        """
+        parse = self._parse if fields is None else self.parser(fields)
+        return [parse(record, key) for key, record in records.items()]
+
+
+PLAYER = Schema(
+    Player,
+    [
+        Field("_id"),
+        Field("uuid"),
+        Field("firstLogin", convert=from_millis),
+        Field("playername"),
+        Field("lastLogin", convert=from_millis),
+        Field("displayname"),
+        Field("knownAliases", default=()),
+        Field("knownAliasesLower", default=()),
+        Field("achievementsOneTime", default=()),
+        Field("mcVersionRp"),
+        Field("networkExp", default=0),
+        Field("karma", default=0),
+        Field("spec_always_flying", default=False),
+        Field("lastAdsenseGenerateTime"),
+        Field("lastClaimedReward"),
+        Field("totalRewards", default=0),
+        Field("totalDailyRewards", default=0),
+        Field("rewardStreak", default=0),
+        Field("rewardScore", default=0),
+        Field("rewardHighScore", default=0),
+        Field("lastLogout", convert=from_millis),
+        Field("friendRequestsUuid", default=()),
+        Field("network_update_book"),
+        Field("achievementTracking", default=()),
+        Field("achievementPoints", default=0),
+        Field("currentGadget"),
+        Field("channel"),
+        Field("mostRecentGameType"),
+        Field("level", "networkExp", network_level, default=1),
+    ],
+)
+
+GAME = Schema(
+    Game,
+    [
+        Field("date", convert=from_millis),
+        Field("gameType"),
+        Field("mode", "Mode"),
+        Field("_map", "map"),
+        Field("ended", convert=from_millis),
+    ],
+)
+
+GUILD = Schema(
+    Guild,
+    [
+        Field("_id"),
+        Field("created", convert=from_millis),
+        Field("name"),
+        Field("name_lower"),
+        Field("description"),
+        Field("tag"),
+        Field("tagColor"),
+        Field("exp", default=0),
+        Field("members", default=()),
+        Field("achievements"),
+        Field("ranks", default=()),
+        Field("joinable", default=False),
+        Field("legacyRanking"),
+        Field("publiclyListed", default=False),
+        Field("hideGmTag", default=False),
+        Field("preferredGames", default=()),
+        Field("chatMute"),
+        Field("guildExpByGameType"),
+        Field("banner"),
+    ],
+)
+
+AUCTION_ITEM = Schema(
+    Auction_item,
+    [
+        Field("_id"),
+        Field("uuid"),
+        Field("auctioneer"),
+        Field("profile_id"),
+        Field("coop", default=()),
+        Field("start", convert=from_millis),
+        Field("end", convert=from_millis),
+        Field("item_name"),
+        Field("item_lore"),
+        Field("extra"),
+        Field("category"),
+        Field("tier"),
+        Field("starting_bid"),
+        Field("item_bytes"),
+        Field("claimed", default=False),
+        Field("claimed_bidders", default=()),
+        Field("highest_bid_amount"),
+        Field("bids", default=()),
+    ],
+)
+
+ENDED_AUCTION = Schema(
+    Ended_auction,
+    [
+        Field("auction_id"),
+        Field("seller"),
+        Field("seller_profile"),
+        Field("buyer"),
+        Field("timestamp", convert=from_millis),
+        Field("price"),
+        Field("bin", default=False),
+        Field("item_bytes"),
+    ],
+)
+
+_SUMMARY = [Field("amount"), Field("pricePerUnit"), Field("orders")]
+BAZAAR_BUY_SUMMARY = Schema(Bazaar_buy_summary, _SUMMARY)
+BAZAAR_SELL_SUMMARY = Schema(Bazaar_sell_summary, _SUMMARY)
+
+BAZAAR_QUICK_STATUS = Schema(
+    Bazaar_quick_status,
+    [
+        Field("productId"),
+        Field("sellPrice"),
+        Field("sellVolume"),
+        Field("sellMovingWeek"),
+        Field("sellOrders"),
+        Field("buyPrice"),
+        Field("buyVolume"),
+        Field("buyMovingWeek"),
+        Field("buyOrders"),
+    ],
+)
+
+BAZAAR_ITEM = Schema(
+    Bazaar_item,
+    [
+        Field("name", mapping_key=True),
+        Field("product_id"),
+        Field("sell_summary", convert=BAZAAR_SELL_SUMMARY.parse_many, default=()),
+        Field("buy_summary", convert=BAZAAR_BUY_SUMMARY.parse_many, default=()),
+        Field("quick_status", convert=BAZAAR_QUICK_STATUS.parse),
+    ],
+)
@@ -0,0 +1,246 @@
+"""Caching proxy serving the hypixel api to local services.
+
+Every service talks to the proxy instead of hypixel, so the fleet shares
+one key, one rate limit and one cache. Identical requests arriving while
+one is already on its way to hypixel wait for that request instead of
+sending their own.
+
+Run it with ``asyncpixel --key KEY`` or ``python -m asyncpixel``.
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+from typing import Counter, Dict, List, Mapping, Optional
+
+import aiohttp
+from aiohttp import web
+
+from .backends import request_key, SQLiteBackend
+from .circuit import CircuitBreaker
+from .client import Client
+from .exceptions.exceptions import CircuitOpen, DeadlineExceeded, RateLimitError
+from .models.raw import RawResponse
+
+# Seconds the responses of each path are cached by default.
+DEFAULT_CACHE_TTL = {
+    "player": 60,
+    "status": 30,
+    "recentGames": 60,
+    "friends": 300,
+    "guild": 300,
+    "findGuild": 300,
+    "boosters": 60,
+    "playerCount": 60,
+    "gameCounts": 60,
+    "watchdogstats": 60,
+    "leaderboards": 600,
+    "skyblock/news": 600,
+    "skyblock/bazaar": 20,
+    "skyblock/auctions": 60,
+    "skyblock/auctions_ended": 60,
+    "skyblock/auction": 60,
+    "skyblock/profile": 60,
+    "skyblock/profiles": 60,
+    "resources/achievements": 3600,
+    "resources/challenges": 3600,
+    "resources/quests": 3600,
+    "resources/guilds/achievements": 3600,
+    "resources/guilds/permissions": 3600,
+    "resources/skyblock/collections": 3600,
+    "resources/skyblock/skills": 3600,
+}
+
+# Paths reported in metrics by name, any other path is reported as other.
+ENDPOINTS = frozenset([*DEFAULT_CACHE_TTL, "key"])
+
+
+class ProxyServer:
+    """Relay requests to hypixel through a single client."""
+
+    def __init__(self, client: Client) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client every request is sent with, its cache
+                and rate limits are shared by all consumers.
+        """
+        self.client = client
+        self.requests: Counter[str] = collections.Counter()
+        self.errors: Counter[str] = collections.Counter()
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.stale_hits = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def app(self) -> web.Application:
+        """Create the web application.
+
+        Returns:
+            web.Application: application serving the api and ``/metrics``
+        """
+        app = web.Application()
+        app.router.add_get("/metrics", self.metrics)
+        app.router.add_get("/{path:[A-Za-z0-9_/]+}", self.relay)
+        return app
+
+    def _fetch(self, path: str, params: Mapping[str, str]) -> asyncio.Future:
+        """Get the request in flight for a path and query, or start one.
+
+        Args:
+            path (str): api path
+            params (Mapping[str, str]): query parameters
+
+        Returns:
+            asyncio.Future: future of the raw response
+        """
+        key = request_key(path, params)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
+        future = asyncio.ensure_future(
+            self.client.get_raw(path, dict(params), check=False)
+        )
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    async def relay(self, request: web.Request) -> web.Response:
+        """Answer an api request.
+
+        Args:
+            request (web.Request): request of a consumer, any ``key``
+                parameter is ignored
+
+        Returns:
+            web.Response: the body hypixel sent, or an error
+        """
+        path = request.match_info["path"].strip("/")
+        params = {name: value for name, value in request.query.items() if name != "key"}
+        self.requests[path if path in ENDPOINTS else "other"] += 1
+        try:
+            raw: RawResponse = await asyncio.shield(self._fetch(path, params))
+        except RateLimitError:
+            return self._error("RateLimitError", 429, "Key throttle")
+        except DeadlineExceeded:
+            return self._error("DeadlineExceeded", 504, "Upstream timed out")
+        except asyncio.TimeoutError:
+            return self._error("TimeoutError", 504, "Upstream timed out")
+        except aiohttp.ClientError:
+            return self._error("ClientError", 502, "Upstream unavailable")
+        except CircuitOpen:
+            return self._error("CircuitOpen", 503, "Upstream unavailable")
+        if raw.cached:
+            self.cache_hits += 1
+        if raw.stale:
+            self.stale_hits += 1
+        return web.Response(
+            body=raw.body, status=raw.status, content_type="application/json"
+        )
+
+    def _error(self, name: str, status: int, cause: str) -> web.Response:
+        self.errors[name] += 1
+        return web.json_response({"success": False, "cause": cause}, status=status)
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        """Publish counters in the prometheus text format.
+
+        Args:
+            request (web.Request): metrics request
+
+        Returns:
+            web.Response: current metrics
+        """
+        lines: List[str] = []
+        for path, count in sorted(self.requests.items()):
+            lines.append(f'asyncpixel_requests_total{{path="{path}"}} {count}')
+        for name, count in sorted(self.errors.items()):
+            lines.append(f'asyncpixel_errors_total{{error="{name}"}} {count}')
+        lines.append(f"asyncpixel_coalesced_total {self.coalesced}")
+        lines.append(f"asyncpixel_cache_hits_total {self.cache_hits}")
+        lines.append(f"asyncpixel_stale_hits_total {self.stale_hits}")
+        lines.append(f"asyncpixel_inflight {len(self._inflight)}")
+        scheduler = self.client.scheduler
+        lines.append(f"asyncpixel_concurrency_limit {scheduler.max_concurrency}")
+        for priority, stats in scheduler.stats.items():
+            label = f'{{priority="{priority.name.lower()}"}}'
+            lines.append(f"asyncpixel_queue_waiting{label} {stats.waiting}")
+            lines.append(f"asyncpixel_queue_granted_total{label} {stats.granted}")
+            lines.append(f"asyncpixel_queue_wait_seconds_mean{label} {stats.mean_wait}")
+        return web.Response(text="\n".join(lines) + "\n")
+
+
+async def create_app(
+    api_key: str,
+    cache_db: Optional[str] = None,
+    cache_ttl: Mapping[str, float] = DEFAULT_CACHE_TTL,
+    stale_while_revalidate: float = 30,
+    stale_if_error: float = 3600,
+) -> web.Application:
+    """Create a proxy application with its own client.
+
+    Cached responses are served while they are refreshed, and for up to
+    ``stale_if_error`` seconds while hypixel is failing.
+
+    Args:
+        api_key (str): hypixel api key
+        cache_db (str, optional): sqlite database shared with other proxy
+            processes on the host. Defaults to None which keeps the cache
+            and rate limit in memory.
+        cache_ttl (Mapping[str, float], optional): seconds responses of
+            each path are cached. Defaults to DEFAULT_CACHE_TTL.
+        stale_while_revalidate (float, optional): seconds past the ttl a
+            response is served while it is refreshed. Defaults to 30.
+        stale_if_error (float, optional): seconds past the ttl a response
+            is served while hypixel is failing. Defaults to 3600.
+
+    Returns:
+        web.Application: application closing the client on cleanup
+    """
+    backend = SQLiteBackend(cache_db) if cache_db is not None else None
+    client = Client(
+        api_key,
+        backend=backend,
+        cache_ttl=cache_ttl,
+        stale_while_revalidate=stale_while_revalidate,
+        stale_if_error=stale_if_error,
+        refresh_ahead=0.8,
+        breaker=CircuitBreaker(),
+    )
+    app = ProxyServer(client).app()
+
+    async def close(app: web.Application) -> None:
+        await client.close()
+        if backend is not None:
+            await backend.close()
+
+    app.on_cleanup.append(close)
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the proxy from the command line.
+
+    Args:
+        argv (List[str], optional): arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(
+        prog="asyncpixel", description="Caching proxy for the hypixel api."
+    )
+    parser.add_argument(
+        "--key",
+        default=os.environ.get("HYPIXEL_API_KEY"),
+        help="api key, defaults to the HYPIXEL_API_KEY environment variable",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--port", type=int, default=8080, help="port to bind")
+    parser.add_argument(
+        "--cache-db",
+        help="sqlite file shared by proxy processes for the cache and rate limit",
+    )
+    args = parser.parse_args(argv)
+    if not args.key:
+        parser.error("an api key is required, pass --key or set HYPIXEL_API_KEY")
+    web.run_app(create_app(args.key, args.cache_db), host=args.host, port=args.port)
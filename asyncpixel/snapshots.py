@@ -0,0 +1,335 @@
+"""History of player snapshots stored as field level deltas.
+
+Player records are flattened into dotted paths, such as
+``stats.Bedwars.wins_bedwars``, with dots and backslashes inside keys
+escaped by a backslash, and each snapshot keeps only the paths
+whose value changed since the previous one. Every ``keyframe_every``
+snapshots a full copy is kept as well, so rebuilding any point in time
+replays fewer than ``keyframe_every`` deltas, and the changes between two
+times are read from the deltas in between without rebuilding either side.
+
+Example::
+
+    store = SnapshotStore()
+    await store.poll(client, uuid)
+    ...
+    changes = store.diff(uuid, time.time() - 7 * 86400)
+"""
+
+import bisect
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .client import Client
+from .models.player import Player
+from .schema import PLAYER
+
+Flat = Dict[str, Any]
+
+# Marks a path removed from the record in a delta.
+_MISSING = object()
+
+
+def _escape(key: str) -> str:
+    return key.replace("\\", "\\\\").replace(".", "\\.")
+
+
+def _split(path: str) -> List[str]:
+    """Split a path into the keys it is made of.
+
+    Args:
+        path (str): dotted path
+
+    Returns:
+        List[str]: unescaped keys
+    """
+    if "\\" not in path:
+        return path.split(".")
+    keys = []
+    key: List[str] = []
+    escaped = False
+    for char in path:
+        if escaped:
+            key.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ".":
+            keys.append("".join(key))
+            key = []
+        else:
+            key.append(char)
+    keys.append("".join(key))
+    return keys
+
+
+def flatten(record: Mapping[str, Any], prefix: str = "") -> Flat:
+    """Flatten nested objects into dotted paths.
+
+    Lists and empty objects are kept as values. Dots and backslashes in
+    keys are escaped with a backslash.
+
+    Args:
+        record (Mapping[str, Any]): decoded json object
+        prefix (str, optional): prepended to every path. Defaults to "".
+
+    Returns:
+        Flat: value by path
+    """
+    flat: Flat = {}
+    for key, value in record.items():
+        path = f"{prefix}{_escape(key)}"
+        if isinstance(value, Mapping) and value:
+            flat.update(flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def unflatten(flat: Flat) -> Dict[str, Any]:
+    """Rebuild the nested objects of flattened paths.
+
+    Args:
+        flat (Flat): value by path
+
+    Returns:
+        Dict[str, Any]: nested object
+    """
+    record: Dict[str, Any] = {}
+    for path, value in flat.items():
+        *parents, key = _split(path)
+        node = record
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return record
+
+
+def _record(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return data["player"]
+
+
+def _public(value: Any) -> Any:
+    return None if value is _MISSING else value
+
+
+class _History:
+    """Deltas and keyframes of one player."""
+
+    __slots__ = ("times", "deltas", "keyframes", "current")
+
+    def __init__(self) -> None:
+        self.times: List[float] = []
+        self.deltas: List[Flat] = []
+        self.keyframes: Dict[int, Flat] = {}
+        self.current: Flat = {}
+
+    def index(self, timestamp: Optional[float]) -> int:
+        if timestamp is None:
+            return len(self.times) - 1
+        return bisect.bisect_right(self.times, timestamp) - 1
+
+    def state(self, index: int, keyframe_every: int) -> Flat:
+        start = index - index % keyframe_every
+        state = dict(self.keyframes[start])
+        for delta in self.deltas[start + 1 : index + 1]:
+            for path, value in delta.items():
+                if value is _MISSING:
+                    state.pop(path, None)
+                else:
+                    state[path] = value
+        return state
+
+    def value(self, index: int, path: str, keyframe_every: int) -> Any:
+        if index < 0:
+            return _MISSING
+        start = index - index % keyframe_every
+        for position in range(index, start, -1):
+            delta = self.deltas[position]
+            if path in delta:
+                return delta[path]
+        return self.keyframes[start].get(path, _MISSING)
+
+
+class SnapshotStore:
+    """In memory history of player records, polled over time."""
+
+    def __init__(self, keyframe_every: int = 32) -> None:
+        """Init object.
+
+        Args:
+            keyframe_every (int, optional): snapshots between full copies,
+                the most deltas replayed to rebuild a snapshot.
+                Defaults to 32.
+
+        Raises:
+            ValueError: if keyframe_every is not positive
+        """
+        if keyframe_every <= 0:
+            raise ValueError("keyframe_every must be positive.")
+        self.keyframe_every = keyframe_every
+        self._histories: Dict[str, _History] = {}
+
+    def __len__(self) -> int:
+        """Get the number of players with snapshots.
+
+        Returns:
+            int: players
+        """
+        return len(self._histories)
+
+    def __contains__(self, uuid: str) -> bool:
+        """Check if a player has snapshots.
+
+        Args:
+            uuid (str): uuid of the player
+
+        Returns:
+            bool: if the player has snapshots
+        """
+        return uuid in self._histories
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the players with snapshots.
+
+        Returns:
+            Iterator[str]: uuids
+        """
+        return iter(self._histories)
+
+    def add(self, record: Mapping[str, Any], timestamp: Optional[float] = None) -> int:
+        """Store a snapshot of a player record.
+
+        Args:
+            record (Mapping[str, Any]): player as sent by the api
+            timestamp (float, optional): unix time of the snapshot.
+                Defaults to now.
+
+        Raises:
+            ValueError: if the snapshot is older than the last one stored
+
+        Returns:
+            int: paths added, changed or removed since the last snapshot
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        history = self._histories.setdefault(record["uuid"], _History())
+        if history.times and timestamp < history.times[-1]:
+            raise ValueError("Snapshots must be added in order.")
+        flat = flatten(record)
+        current = history.current
+        delta = {
+            path: value
+            for path, value in flat.items()
+            if current.get(path, _MISSING) != value
+        }
+        delta.update((path, _MISSING) for path in current.keys() - flat.keys())
+        index = len(history.times)
+        history.times.append(timestamp)
+        history.deltas.append(delta)
+        if index % self.keyframe_every == 0:
+            history.keyframes[index] = flat
+        history.current = flat
+        return len(delta)
+
+    def times(self, uuid: str) -> List[float]:
+        """Get the times of the snapshots of a player.
+
+        Args:
+            uuid (str): uuid of the player
+
+        Returns:
+            List[float]: unix times in order, empty without snapshots
+        """
+        history = self._histories.get(uuid)
+        return [] if history is None else list(history.times)
+
+    def record(
+        self, uuid: str, timestamp: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Rebuild the player record as it was at a time.
+
+        Args:
+            uuid (str): uuid of the player
+            timestamp (float, optional): unix time. Defaults to None which
+                returns the latest snapshot.
+
+        Returns:
+            Optional[Dict[str, Any]]: the last record stored at or before the
+            time, None if there is none
+        """
+        history = self._histories.get(uuid)
+        if history is None:
+            return None
+        index = history.index(timestamp)
+        if index < 0:
+            return None
+        return unflatten(history.state(index, self.keyframe_every))
+
+    def player(self, uuid: str, timestamp: Optional[float] = None) -> Optional[Player]:
+        """Rebuild the player as it was at a time.
+
+        Args:
+            uuid (str): uuid of the player
+            timestamp (float, optional): unix time. Defaults to None which
+                returns the latest snapshot.
+
+        Returns:
+            Optional[Player]: the last player stored at or before the time,
+            None if there is none
+        """
+        record = self.record(uuid, timestamp)
+        return None if record is None else PLAYER.parse(record)
+
+    def diff(
+        self, uuid: str, start: float, end: Optional[float] = None
+    ) -> Dict[str, Tuple[Any, Any]]:
+        """Get the paths that changed between two times.
+
+        Args:
+            uuid (str): uuid of the player
+            start (float): unix time of the earlier snapshot
+            end (float, optional): unix time of the later snapshot.
+                Defaults to None which uses the latest snapshot.
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: value at start and at end by path,
+            None standing for a missing path
+        """
+        history = self._histories.get(uuid)
+        if history is None:
+            return {}
+        first, last = history.index(start), history.index(end)
+        latest: Flat = {}
+        for delta in history.deltas[first + 1 : last + 1]:
+            latest.update(delta)
+        changes = {}
+        for path, new in latest.items():
+            old = history.value(first, path, self.keyframe_every)
+            if old != new:
+                changes[path] = (_public(old), _public(new))
+        return changes
+
+    async def poll(
+        self, client: Client, uuid: str, timestamp: Optional[float] = None
+    ) -> Optional[Player]:
+        """Fetch a player and store the snapshot.
+
+        Args:
+            client (Client): client used to fetch the player
+            uuid (str): uuid of the player
+            timestamp (float, optional): unix time of the snapshot.
+                Defaults to now.
+
+        Returns:
+            Optional[Player]: the fetched player, None for an unknown player
+            which is not stored
+        """
+        params = {"uuid": uuid.replace("-", "")}
+        record = await client.get_model("player", _record, params, hedge=True)
+        if record is None:
+            return None
+        self.add(record, timestamp)
+        player = PLAYER.parse(record)
+        client.names.add_player(player)
+        return player
@@ -0,0 +1,308 @@
+"""Adaptive online status watcher for large watchlists."""
+
+import asyncio
+import heapq
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from .client import Client
+from .models.status import Status
+from .scheduler import Priority, TokenBucket
+
+ONLINE = "online"
+OFFLINE = "offline"
+GAME_CHANGE = "game_change"
+
+
+class StatusEvent:
+    """Change in the online status of a watched player."""
+
+    def __init__(self, uuid: str, kind: str, previous: Status, current: Status) -> None:
+        """Init object.
+
+        Args:
+            uuid (str): uuid of the player.
+            kind (str): one of ONLINE, OFFLINE or GAME_CHANGE.
+            previous (Status): status before the change.
+            current (Status): status after the change.
+        """
+        self.uuid = uuid
+        self.kind = kind
+        self.previous = previous
+        self.current = current
+
+
+class _Watched:
+    """Polling state of a watched player."""
+
+    __slots__ = ("status", "interval", "due")
+
+    def __init__(self, interval: float, due: float) -> None:
+        self.status: Optional[Status] = None
+        self.interval = interval
+        self.due = due
+
+
+def status_events(uuid: str, previous: Status, current: Status) -> List[StatusEvent]:
+    """Work out the events between two statuses of a player.
+
+    Args:
+        uuid (str): uuid of the player
+        previous (Status): earlier status
+        current (Status): later status
+
+    Returns:
+        List[StatusEvent]: events, empty if nothing relevant changed
+    """
+    if previous.online != current.online:
+        kind = ONLINE if current.online else OFFLINE
+        return [StatusEvent(uuid, kind, previous, current)]
+    if current.online and (
+        previous.gameType != current.gameType or previous.mode != current.mode
+    ):
+        return [StatusEvent(uuid, GAME_CHANGE, previous, current)]
+    return []
+
+
+class StatusWatcher:
+    """Poll the status of many players within a share of the key quota.
+
+    Online players and players who just changed state are polled every
+    ``min_interval`` seconds. Every poll that finds a player still offline
+    multiplies their interval by ``backoff`` up to ``max_interval``. Only
+    transitions are emitted, iterate over the watcher to receive them.
+
+    Example::
+
+        watcher = StatusWatcher(client, uuids, share=0.5)
+        watcher.start()
+        async for event in watcher:
+            print(event.uuid, event.kind)
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        uuids: Iterable[str] = (),
+        share: float = 0.5,
+        key_limit: int = 120,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        backoff: float = 1.5,
+        priority: Priority = Priority.BULK,
+        max_events: int = 10000,
+    ) -> None:
+        """Init object.
+
+        Args:
+            client (Client): client used to poll.
+            uuids (Iterable[str], optional): players to watch. Defaults to ().
+            share (float, optional): fraction of the key limit the watcher
+                may use. Defaults to 0.5.
+            key_limit (int, optional): requests per minute allowed for the
+                key. Defaults to 120.
+            min_interval (float, optional): seconds between polls of active
+                players. Defaults to 60.
+            max_interval (float, optional): longest seconds between polls of
+                offline players. Defaults to 3600.
+            backoff (float, optional): interval growth per offline poll.
+                Defaults to 1.5.
+            priority (Priority, optional): scheduling class of the polls.
+                Defaults to Priority.BULK.
+            max_events (int, optional): events buffered before the oldest
+                are dropped. Defaults to 10000.
+        """
+        self.client = client
+        self.bucket = TokenBucket(share * key_limit / 60, 1)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.priority = priority
+        self.max_events = max_events
+        self._events: "Optional[asyncio.Queue[StatusEvent]]" = None
+        self.polls = 0
+        self.errors = 0
+        self._players: Dict[str, _Watched] = {}
+        self._heap: List[Tuple[float, str]] = []
+        # Created inside the running loop, which asyncio objects bind to
+        # when they are created on Python 3.9 and earlier.
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Future] = set()
+        self._runner: Optional[asyncio.Task] = None
+        for uuid in uuids:
+            self.watch(uuid)
+
+    @property
+    def events(self) -> "asyncio.Queue[StatusEvent]":
+        """Queue of status events, created on first use.
+
+        Returns:
+            asyncio.Queue[StatusEvent]: events not yet consumed
+        """
+        if self._events is None:
+            self._events = asyncio.Queue(self.max_events)
+        return self._events
+
+    def __len__(self) -> int:
+        """Amount of players watched.
+
+        Returns:
+            int: amount of players
+        """
+        return len(self._players)
+
+    def status(self, uuid: str) -> Optional[Status]:
+        """Get the last known status of a player.
+
+        Args:
+            uuid (str): uuid of the player
+
+        Returns:
+            Optional[Status]: status, None if not polled yet
+        """
+        state = self._players.get(uuid.replace("-", ""))
+        return state.status if state is not None else None
+
+    def watch(self, uuid: str) -> None:
+        """Start watching a player, polling them as soon as possible.
+
+        Args:
+            uuid (str): uuid of the player
+        """
+        uuid = uuid.replace("-", "")
+        if uuid in self._players:
+            return
+        self._players[uuid] = _Watched(self.min_interval, 0.0)
+        self._schedule(uuid, 0.0)
+
+    def unwatch(self, uuid: str) -> None:
+        """Stop watching a player.
+
+        Args:
+            uuid (str): uuid of the player
+        """
+        self._players.pop(uuid.replace("-", ""), None)
+
+    def _schedule(self, uuid: str, due: float) -> None:
+        self._players[uuid].due = due
+        heapq.heappush(self._heap, (due, uuid))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _next_due(self) -> str:
+        """Wait until a watched player is due.
+
+        Returns:
+            str: uuid of the player
+        """
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        wakeup = self._wakeup
+        while True:
+            wakeup.clear()
+            if not self._heap:
+                await wakeup.wait()
+                continue
+            due, uuid = self._heap[0]
+            state = self._players.get(uuid)
+            if state is None or state.due != due:
+                heapq.heappop(self._heap)
+                continue
+            delay = due - time.monotonic()
+            if delay <= 0:
+                heapq.heappop(self._heap)
+                return uuid
+            try:
+                await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> None:
+        """Poll due players forever within the quota share."""
+        self._wakeup = asyncio.Event()
+        while True:
+            uuid = await self._next_due()
+            delay = self.bucket.take()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.bucket.take()
+            task = asyncio.ensure_future(self._poll(uuid))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def start(self) -> asyncio.Task:
+        """Run the watcher in the background.
+
+        Returns:
+            asyncio.Task: the running watcher
+        """
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.ensure_future(self.run())
+        return self._runner
+
+    async def stop(self) -> None:
+        """Stop polling and cancel polls in flight."""
+        tasks = list(self._tasks)
+        if self._runner is not None:
+            tasks.append(self._runner)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._runner = None
+
+    def _emit(self, event: StatusEvent) -> None:
+        if self.events.full():
+            self.events.get_nowait()
+        self.events.put_nowait(event)
+
+    async def _poll(self, uuid: str) -> None:
+        """Poll a player and schedule their next poll.
+
+        Args:
+            uuid (str): uuid of the player
+
+        Raises:
+            asyncio.CancelledError: if cancelled while polling
+        """
+        state = self._players.get(uuid)
+        if state is None:
+            return
+        self.polls += 1
+        try:
+            with self.client.priority(self.priority):
+                current = await self.client.get_player_status(uuid)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += 1
+            current = None
+        if uuid not in self._players:
+            return
+        if current is not None:
+            previous = state.status
+            state.status = current
+            events = [] if previous is None else status_events(uuid, previous, current)
+            for event in events:
+                self._emit(event)
+            if current.online or events:
+                state.interval = self.min_interval
+            else:
+                state.interval = min(self.max_interval, state.interval * self.backoff)
+        self._schedule(uuid, time.monotonic() + state.interval)
+
+    def __aiter__(self) -> AsyncIterator[StatusEvent]:
+        """Iterate over status events as they happen.
+
+        Returns:
+            AsyncIterator[StatusEvent]: events
+        """
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[StatusEvent]:
+        """Yield status events forever.
+
+        Yields:
+            StatusEvent: the next event
+        """
+        while True:
+            yield await self.events.get()
@@ -109,6 +109,13 @@ def tests(session: Session) -> None:
     session.run("pytest", *args)
 
 
+@nox.session(python="3.8")
+def soak(session: Session) -> None:
+    """Soak the client against a stub api and report leaks."""
+    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("python", "-m", "tests.soak", *session.posargs)
+
+
 @nox.session(python=["3.8", "3.7"])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
@@ -0,0 +1 @@
+"""Soak and load harness run against a stub of the hypixel api."""
@@ -0,0 +1,132 @@
+"""Run a soak of the client against the stub api.
+
+Example::
+
+    python -m tests.soak --duration 21600 --interval 60 --report soak.json
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import sys
+from typing import Dict, List, Optional
+
+from asyncpixel import Client
+from asyncpixel.scheduler import AdaptiveLimiter, PriorityScheduler
+from .harness import DEFAULT_MIX, soak, SoakConfig, SoakReport
+from .stub import StubServer
+
+
+def _mix(value: str) -> Dict[str, float]:
+    """Parse a mix such as ``player=5,bazaar=1``.
+
+    Args:
+        value (str): comma separated call weights
+
+    Raises:
+        ArgumentTypeError: if a call is unknown or a weight is not a number
+
+    Returns:
+        Dict[str, float]: weight by call
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown call {name}")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight {weight}") from None
+    return mix
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line.
+
+    Args:
+        argv (List[str], optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: options
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.soak", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--duration", type=float, default=3600, help="seconds")
+    parser.add_argument("--interval", type=float, default=60, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=_mix, help="such as player=5,bazaar=1")
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--delay", type=float, default=0.005, help="stub latency")
+    parser.add_argument(
+        "--rate-limited", type=float, default=0.0, help="share of stub 429s"
+    )
+    parser.add_argument(
+        "--offload", type=int, help="decode bodies from this size in processes"
+    )
+    parser.add_argument("--adaptive", action="store_true", help="adaptive limiter")
+    parser.add_argument("--report", help="write the report as json to this file")
+    return parser.parse_args(argv)
+
+
+async def run(options: argparse.Namespace, url: str) -> SoakReport:
+    """Soak a client pointed at a stub.
+
+    Args:
+        options (argparse.Namespace): parsed command line
+        url (str): base url of the stub
+
+    Returns:
+        SoakReport: result of the run
+    """
+    config = SoakConfig(
+        duration=options.duration,
+        sample_interval=options.interval,
+        concurrency=options.concurrency,
+        mix=options.mix,
+        players=options.players,
+    )
+    executor = None
+    if options.offload is not None:
+        executor = ProcessPoolExecutor(2)
+    client = Client(
+        "soak",
+        scheduler=PriorityScheduler(
+            rate_limit=10 ** 6, period=1, burst=10 ** 3, max_concurrency=64
+        ),
+        limiter=AdaptiveLimiter() if options.adaptive else None,
+        offload_threshold=options.offload,
+        executor=executor,
+        base_url=url,
+    )
+    try:
+        return await soak(client, config)
+    finally:
+        await client.close()
+        if executor is not None:
+            executor.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the soak and print its report.
+
+    Args:
+        argv (List[str], optional): arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 0 when nothing was flagged, 1 otherwise
+    """
+    options = parse_args(argv)
+    with StubServer(options.delay, options.rate_limited) as stub:
+        report = asyncio.run(run(options, stub.url))
+    print(report.format())
+    if options.report:
+        with open(options.report, "w") as output:
+            json.dump(report.to_dict(), output, indent=2)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
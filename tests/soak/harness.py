@@ -0,0 +1,462 @@
+"""Soak and load harness for clients held for a long time.
+
+A mix of client calls is run by concurrent workers for the configured
+duration. Every ``sample_interval`` seconds the harness records the RSS
+of the process, the live asyncpixel objects by type, the open sockets,
+the worst event loop lag and the call latencies. The report fits a trend
+to each series after a warmup and flags growth that points at a leak or
+a slowdown.
+"""
+
+import asyncio
+import collections
+import gc
+import os
+import random
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Counter,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from asyncpixel import Client
+
+Call = Callable[[Client, random.Random], Awaitable[Any]]
+
+# Fields kept by the price only auction crawl of the mix.
+PRICE_FIELDS = ("uuid", "item_name", "starting_bid", "highest_bid_amount")
+
+# Relative weight of each call in the default mix.
+DEFAULT_MIX = {
+    "player": 50,
+    "uuid": 10,
+    "guild": 10,
+    "boosters": 15,
+    "auctions_ended": 8,
+    "bazaar": 4,
+    "auctions": 3,
+}
+
+
+def calls(players: int) -> Dict[str, Call]:
+    """Build the calls a mix can be made of.
+
+    Args:
+        players (int): distinct players looked up
+
+    Returns:
+        Dict[str, Call]: call by name
+    """
+    return {
+        "player": lambda client, rng: client.get_player(
+            f"{rng.randrange(players):032x}"
+        ),
+        "uuid": lambda client, rng: client.get_uuid(f"Player{rng.randrange(players)}"),
+        "guild": lambda client, rng: client.get_guild_by_name("Guild"),
+        "boosters": lambda client, rng: client.get_boosters(),
+        "auctions_ended": lambda client, rng: client.get_auctions_ended(),
+        "bazaar": lambda client, rng: client.get_bazaar(),
+        "auctions": lambda client, rng: client.auctions(0, PRICE_FIELDS),
+    }
+
+
+class SoakConfig:
+    """Settings of a soak run and the thresholds of its report."""
+
+    def __init__(
+        self,
+        duration: float = 3600,
+        sample_interval: float = 60,
+        concurrency: int = 8,
+        mix: Optional[Mapping[str, float]] = None,
+        players: int = 5000,
+        seed: int = 0,
+        warmup: float = 0.25,
+        rss_growth: float = 0.2,
+        object_growth: float = 0.5,
+        min_objects: int = 1000,
+        connection_growth: int = 4,
+        latency_drift: float = 1.5,
+        loop_lag: float = 0.1,
+    ) -> None:
+        """Init object.
+
+        Args:
+            duration (float, optional): seconds calls are made for.
+                Defaults to 3600.
+            sample_interval (float, optional): seconds between samples.
+                Defaults to 60.
+            concurrency (int, optional): workers making calls.
+                Defaults to 8.
+            mix (Mapping[str, float], optional): relative weight of each
+                call. Defaults to DEFAULT_MIX.
+            players (int, optional): distinct players looked up.
+                Defaults to 5000.
+            seed (int, optional): seed of the call choices. Defaults to 0.
+            warmup (float, optional): share of the samples left out of
+                trends. Defaults to 0.25.
+            rss_growth (float, optional): relative RSS growth flagged.
+                Defaults to 0.2.
+            object_growth (float, optional): relative growth of the objects
+                of a type flagged. Defaults to 0.5.
+            min_objects (int, optional): growth in objects of a type below
+                which it is never flagged. Defaults to 1000.
+            connection_growth (int, optional): growth in open sockets
+                flagged. Defaults to 4.
+            latency_drift (float, optional): ratio of late to early 95th
+                percentile latency flagged. Defaults to 1.5.
+            loop_lag (float, optional): median of the worst event loop lag
+                per sample flagged, in seconds. Defaults to 0.1.
+        """
+        self.duration = duration
+        self.sample_interval = sample_interval
+        self.concurrency = concurrency
+        self.mix = dict(DEFAULT_MIX if mix is None else mix)
+        self.players = players
+        self.seed = seed
+        self.warmup = warmup
+        self.rss_growth = rss_growth
+        self.object_growth = object_growth
+        self.min_objects = min_objects
+        self.connection_growth = connection_growth
+        self.latency_drift = latency_drift
+        self.loop_lag = loop_lag
+
+
+class Sample:
+    """Measurements taken at one point of a run."""
+
+    def __init__(
+        self,
+        elapsed: float,
+        rss: int,
+        objects: Mapping[str, int],
+        connections: Optional[int],
+        loop_lag: float,
+        latencies: Sequence[float],
+        errors: int,
+    ) -> None:
+        """Init object.
+
+        Args:
+            elapsed (float): seconds since the run started
+            rss (int): resident memory in bytes
+            objects (Mapping[str, int]): live asyncpixel objects by type
+            connections (int, optional): open sockets, None when unknown
+            loop_lag (float): worst event loop lag since the last sample
+            latencies (Sequence[float]): latencies of the calls finished
+                since the last sample
+            errors (int): calls failed since the last sample
+        """
+        self.elapsed = elapsed
+        self.rss = rss
+        self.objects = dict(objects)
+        self.connections = connections
+        self.loop_lag = loop_lag
+        self.calls = len(latencies)
+        self.errors = errors
+        ordered = sorted(latencies)
+        self.p50 = _percentile(ordered, 0.5)
+        self.p95 = _percentile(ordered, 0.95)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the sample to json compatible values.
+
+        Returns:
+            Dict[str, Any]: sample
+        """
+        return dict(vars(self))
+
+
+def _percentile(ordered: Sequence[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(percentile * len(ordered)), len(ordered) - 1)]
+
+
+def _trend(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """Fit a line to points and return its value at the first and last x.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): x and y values
+
+    Returns:
+        Tuple[float, float]: fitted start and end values
+    """
+    count = len(points)
+    if count < 2:
+        value = points[0][1] if points else 0.0
+        return value, value
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    slope = 0.0
+    if spread:
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+    first, last = points[0][0], points[-1][0]
+    return (
+        mean_y + slope * (first - mean_x),
+        mean_y + slope * (last - mean_x),
+    )
+
+
+class SoakReport:
+    """Samples of a run with the leaks and slowdowns they show."""
+
+    def __init__(
+        self, config: SoakConfig, samples: Sequence[Sample], errors: Mapping[str, int]
+    ) -> None:
+        """Init object.
+
+        Args:
+            config (SoakConfig): settings of the run
+            samples (Sequence[Sample]): samples in order
+            errors (Mapping[str, int]): failed calls by exception type
+        """
+        self.config = config
+        self.samples = list(samples)
+        self.errors = dict(errors)
+        self.flags = self._analyse()
+
+    @property
+    def ok(self) -> bool:
+        """If nothing was flagged.
+
+        Returns:
+            bool: True without flags
+        """
+        return not self.flags
+
+    def _steady(self) -> List[Sample]:
+        skip = int(len(self.samples) * self.config.warmup)
+        return self.samples[skip:]
+
+    def _analyse(self) -> List[str]:
+        steady = self._steady()
+        if len(steady) < 2:
+            return []
+        config = self.config
+        flags = []
+        start, end = _trend([(s.elapsed, s.rss) for s in steady])
+        if end - start > config.rss_growth * start:
+            flags.append(
+                f"rss grew from {start / 2 ** 20:.1f} to {end / 2 ** 20:.1f} MiB"
+            )
+        for name in sorted({key for s in steady for key in s.objects}):
+            start, end = _trend([(s.elapsed, s.objects.get(name, 0)) for s in steady])
+            if end - start > max(config.min_objects, config.object_growth * start):
+                flags.append(f"{name} objects grew from {start:.0f} to {end:.0f}")
+        sockets = [(s.elapsed, s.connections) for s in steady if s.connections]
+        start, end = _trend(sockets)  # type: ignore
+        if end - start > config.connection_growth:
+            flags.append(f"open sockets grew from {start:.0f} to {end:.0f}")
+        flags.extend(self._slowdowns(steady))
+        return flags
+
+    def _slowdowns(self, steady: Sequence[Sample]) -> List[str]:
+        config = self.config
+        flags = []
+        quarter = max(1, len(steady) // 4)
+        early = [s.p95 for s in steady[:quarter] if s.calls]
+        late = [s.p95 for s in steady[-quarter:] if s.calls]
+        if early and late:
+            before, after = sum(early) / len(early), sum(late) / len(late)
+            if before and after / before > config.latency_drift:
+                flags.append(
+                    f"p95 latency drifted from {before * 1000:.1f} "
+                    f"to {after * 1000:.1f} ms"
+                )
+        lags = sorted(s.loop_lag for s in steady)
+        lag = _percentile(lags, 0.5)
+        if lag > config.loop_lag:
+            flags.append(f"median worst event loop lag is {lag * 1000:.0f} ms")
+        return flags
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to json compatible values.
+
+        Returns:
+            Dict[str, Any]: report
+        """
+        return {
+            "config": dict(vars(self.config)),
+            "flags": self.flags,
+            "errors": self.errors,
+            "samples": [sample.to_dict() for sample in self.samples],
+        }
+
+    def format(self) -> str:
+        """Render the report as text.
+
+        Returns:
+            str: a table of samples followed by the flags
+        """
+        lines = [
+            f"{'elapsed':>9} {'rss MiB':>8} {'objects':>8} {'sockets':>7} "
+            f"{'lag ms':>7} {'calls':>6} {'errors':>6} {'p50 ms':>7} {'p95 ms':>7}"
+        ]
+        for s in self.samples:
+            sockets = "-" if s.connections is None else str(s.connections)
+            lines.append(
+                f"{s.elapsed:9.0f} {s.rss / 2 ** 20:8.1f} "
+                f"{sum(s.objects.values()):8d} {sockets:>7} "
+                f"{s.loop_lag * 1000:7.1f} {s.calls:6d} {s.errors:6d} "
+                f"{s.p50 * 1000:7.1f} {s.p95 * 1000:7.1f}"
+            )
+        for name, count in sorted(self.errors.items()):
+            lines.append(f"error {name}: {count}")
+        lines.extend(f"FLAG {flag}" for flag in self.flags)
+        lines.append("ok" if self.ok else f"{len(self.flags)} problem(s) found")
+        return "\n".join(lines)
+
+
+def rss() -> int:
+    """Resident memory of the process.
+
+    Returns:
+        int: bytes, the peak on systems without /proc
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def open_sockets() -> Optional[int]:
+    """Count the sockets open in the process.
+
+    Returns:
+        Optional[int]: open sockets, None on systems without /proc
+    """
+    try:
+        descriptors = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for descriptor in descriptors:
+        try:
+            if os.readlink(f"/proc/self/fd/{descriptor}").startswith("socket:"):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def live_objects() -> Dict[str, int]:
+    """Count the live objects of asyncpixel classes after a collection.
+
+    Returns:
+        Dict[str, int]: objects by class name
+    """
+    gc.collect()
+    counts: Counter[str] = collections.Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        module = cls.__dict__.get("__module__")
+        if isinstance(module, str) and module.startswith("asyncpixel."):
+            counts[cls.__name__] += 1
+    return dict(counts)
+
+
+class _LagProbe:
+    """Measure how late the event loop wakes a sleeping task.
+
+    The wake up following a reset is not measured, so the time the harness
+    spends sampling on the loop is not blamed on the client.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.worst = 0.0
+        self._skip = False
+
+    async def run(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            if self._skip:
+                self._skip = False
+            else:
+                self.worst = max(self.worst, loop.time() - expected)
+
+    def reset(self) -> float:
+        worst, self.worst = self.worst, 0.0
+        self._skip = True
+        return worst
+
+
+async def soak(client: Client, config: SoakConfig) -> SoakReport:
+    """Run the mix of calls on a client and sample it.
+
+    Args:
+        client (Client): client under test
+        config (SoakConfig): settings of the run
+
+    Returns:
+        SoakReport: samples and flags of the run
+    """
+    loop = asyncio.get_event_loop()
+    rng = random.Random(config.seed)
+    available = calls(config.players)
+    names = list(config.mix)
+    weights = [config.mix[name] for name in names]
+    latencies: List[float] = []
+    errors: Counter[str] = collections.Counter()
+    failed = 0
+    started = loop.time()
+    stop = started + config.duration
+
+    async def worker() -> None:
+        nonlocal failed
+        while loop.time() < stop:
+            call = available[rng.choices(names, weights)[0]]
+            sent = loop.time()
+            try:
+                await call(client, rng)
+            except Exception as error:  # noqa: B902
+                errors[type(error).__name__] += 1
+                failed += 1
+            else:
+                latencies.append(loop.time() - sent)
+
+    probe = _LagProbe()
+    probe_task = asyncio.ensure_future(probe.run())
+    workers = [asyncio.ensure_future(worker()) for _ in range(config.concurrency)]
+    samples = []
+    try:
+        while True:
+            await asyncio.wait(workers, timeout=config.sample_interval)
+            lag = probe.reset()
+            elapsed = loop.time() - started
+            samples.append(
+                Sample(
+                    elapsed,
+                    rss(),
+                    live_objects(),
+                    open_sockets(),
+                    lag,
+                    latencies,
+                    failed,
+                )
+            )
+            latencies = []
+            failed = 0
+            if all(task.done() for task in workers):
+                break
+    finally:
+        probe_task.cancel()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(probe_task, *workers, return_exceptions=True)
+    return SoakReport(config, samples, errors)
@@ -0,0 +1,246 @@
+"""Local stand in for the hypixel api used by the soak harness.
+
+The stub runs in its own process so its memory and sockets do not show up
+in the measurements of the client under test. Payloads are generated once
+at startup and served with a configurable delay and share of 429s.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import time
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+
+from aiohttp import web
+
+
+def player(index: int) -> Dict[str, Any]:
+    """Build a player record.
+
+    Args:
+        index (int): player number
+
+    Returns:
+        Dict[str, Any]: player as sent by the api
+    """
+    return {
+        "_id": f"id{index}",
+        "uuid": f"{index:032x}",
+        "displayname": f"Player{index}",
+        "knownAliases": [f"Player{index}", f"Old{index}"],
+        "knownAliasesLower": [f"player{index}", f"old{index}"],
+        "firstLogin": 1500000000000,
+        "lastLogin": 1600000000000,
+        "networkExp": 10000 * index,
+        "karma": index,
+        "achievementsOneTime": ["general_first_join"] * 20,
+    }
+
+
+def auction(index: int) -> Dict[str, Any]:
+    """Build an auction record.
+
+    Args:
+        index (int): auction number
+
+    Returns:
+        Dict[str, Any]: auction as sent by the api
+    """
+    return {
+        "uuid": f"{index:032x}",
+        "auctioneer": f"{index % 997:032x}",
+        "profile_id": f"{index % 997:032x}",
+        "coop": [],
+        "start": 1600000000000,
+        "end": 1600000000000 + index,
+        "item_name": f"Item {index % 50}",
+        "item_lore": "lore " * 40,
+        "extra": "extra",
+        "category": "weapon",
+        "tier": "EPIC",
+        "starting_bid": 1000 + index,
+        "item_bytes": "H4sIAAAAAAAAAE" * 20,
+        "claimed": False,
+        "claimed_bidders": [],
+        "highest_bid_amount": 0,
+        "bids": [],
+    }
+
+
+def payloads(auctions_per_page: int = 1000, products: int = 500) -> Dict[str, bytes]:
+    """Encode the response of each path.
+
+    Args:
+        auctions_per_page (int, optional): auctions on the auction page.
+            Defaults to 1000.
+        products (int, optional): bazaar products. Defaults to 500.
+
+    Returns:
+        Dict[str, bytes]: body by api path, ``player`` bodies are built
+        per request
+    """
+    summary = [{"amount": 64, "pricePerUnit": 10.5, "orders": 2}] * 30
+    bazaar = {
+        f"PRODUCT_{index}": {
+            "product_id": f"PRODUCT_{index}",
+            "sell_summary": summary,
+            "buy_summary": summary,
+            "quick_status": {"productId": f"PRODUCT_{index}", "buyPrice": 11.0},
+        }
+        for index in range(products)
+    }
+    bodies: Dict[str, Dict[str, Any]] = {
+        "skyblock/bazaar": {"lastUpdated": 1600000000000, "products": bazaar},
+        "skyblock/auctions": {
+            "page": 0,
+            "totalPages": 1,
+            "totalAuctions": auctions_per_page,
+            "lastUpdated": 1600000000000,
+            "auctions": [auction(index) for index in range(auctions_per_page)],
+        },
+        "skyblock/auctions_ended": {
+            "lastUpdated": 1600000000000,
+            "auctions": [
+                {
+                    "auction_id": f"{index:032x}",
+                    "seller": "seller",
+                    "seller_profile": "profile",
+                    "buyer": "buyer",
+                    "timestamp": 1600000000000,
+                    "price": index,
+                    "bin": True,
+                    "item_bytes": "H4sIAAAAAAAAAE" * 20,
+                }
+                for index in range(200)
+            ],
+        },
+        "guild": {"guild": {"_id": "guild", "name": "Guild", "members": []}},
+        "boosters": {
+            "boosters": [
+                {
+                    "_id": f"booster{index}",
+                    "purchaserUuid": f"{index:032x}",
+                    "amount": 3,
+                    "originalLength": 3600,
+                    "length": 1800,
+                    "gameType": 1 + index % 20,
+                    "dateActivated": 1600000000000,
+                }
+                for index in range(50)
+            ],
+            "boosterState": {"decrementing": True},
+        },
+    }
+    return {
+        path: json.dumps(dict(body, success=True)).encode()
+        for path, body in bodies.items()
+    }
+
+
+def create_app(
+    delay: float = 0.005, rate_limited: float = 0.0, seed: int = 0
+) -> web.Application:
+    """Create the stub application.
+
+    Args:
+        delay (float, optional): mean seconds before each answer.
+            Defaults to 0.005.
+        rate_limited (float, optional): share of requests answered with a
+            429. Defaults to 0.
+        seed (int, optional): seed of the delays and 429s. Defaults to 0.
+
+    Returns:
+        web.Application: stub serving the paths of payloads and player
+    """
+    bodies = payloads()
+    rng = random.Random(seed)
+
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(rng.expovariate(1 / delay) if delay else 0)
+        if rng.random() < rate_limited:
+            return web.json_response({"success": False}, status=429)
+        path = request.match_info["path"]
+        if path == "player":
+            name = request.query.get("name", "Player0")
+            index = int(request.query.get("uuid", "0"), 16) or int(name[6:] or 0)
+            body = json.dumps({"success": True, "player": player(index)}).encode()
+        elif path in bodies:
+            body = bodies[path]
+        else:
+            cause = {"success": False, "cause": "Unknown path"}
+            return web.json_response(cause, status=404)
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/{path:[A-Za-z0-9_/]+}", handle)
+    return app
+
+
+def _serve(port: int, delay: float, rate_limited: float) -> None:
+    web.run_app(
+        create_app(delay, rate_limited),
+        host="127.0.0.1",
+        port=port,
+        print=None,  # type: ignore
+        access_log=None,
+    )
+
+
+class StubServer:
+    """Stub api running in a child process for the duration of a block."""
+
+    def __init__(self, delay: float = 0.005, rate_limited: float = 0.0) -> None:
+        """Init object.
+
+        Args:
+            delay (float, optional): mean seconds before each answer.
+                Defaults to 0.005.
+            rate_limited (float, optional): share of requests answered with
+                a 429. Defaults to 0.
+        """
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}/"
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.port, delay, rate_limited), daemon=True
+        )
+
+    def __enter__(self) -> "StubServer":
+        """Start the server and wait until it accepts connections.
+
+        Raises:
+            RuntimeError: if the server does not start within 10 seconds
+
+        Returns:
+            StubServer: the running server
+        """
+        self._process.start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), 0.1).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+        self._process.terminate()
+        raise RuntimeError("The stub server did not start.")
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the server.
+
+        Args:
+            exc_type (Type[BaseException], optional): exception type
+            exc (BaseException, optional): exception raised
+            traceback (TracebackType, optional): traceback
+        """
+        self._process.terminate()
+        self._process.join()
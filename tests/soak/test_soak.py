@@ -0,0 +1,74 @@
+"""Tests for the soak harness."""
+
+import asyncio
+from typing import List
+
+from asyncpixel import Client
+from . import __main__ as cli
+from .harness import Sample, soak, SoakConfig, SoakReport
+from .stub import StubServer
+
+
+def _samples(
+    rss: float = 0, objects: float = 0, latency: float = 0, count: int = 20
+) -> List[Sample]:
+    return [
+        Sample(
+            elapsed=index * 60.0,
+            rss=int(50e6 + rss * index),
+            objects={"Player": int(100 + objects * index)},
+            connections=5,
+            loop_lag=0.001,
+            latencies=[0.01 + latency * index] * 10,
+            errors=0,
+        )
+        for index in range(count)
+    ]
+
+
+def test_flat_run_is_ok() -> None:
+    """Steady series are not flagged."""
+    report = SoakReport(SoakConfig(), _samples(), {})
+    assert report.ok
+    assert "ok" in report.format()
+
+
+def test_leaks_are_flagged() -> None:
+    """Growing memory, objects and latency are each flagged."""
+    report = SoakReport(SoakConfig(), _samples(2e6, 500, 0.005), {})
+    assert not report.ok
+    assert [flag.split()[0] for flag in report.flags] == ["rss", "Player", "p95"]
+    assert len(report.to_dict()["samples"]) == 20
+
+
+def test_warmup_growth_is_ignored() -> None:
+    """Growth limited to the warmup samples is not a leak."""
+    samples = _samples()
+    for index, sample in enumerate(samples[:5]):
+        sample.rss = int(10e6 * (index + 1))
+    assert SoakReport(SoakConfig(), samples, {}).ok
+
+
+def test_short_soak_against_stub() -> None:
+    """A couple of seconds of the default mix run without errors."""
+    config = SoakConfig(duration=2, sample_interval=0.5, concurrency=4, players=50)
+
+    async def run(url: str) -> SoakReport:
+        client = Client("key", base_url=url)
+        try:
+            return await soak(client, config)
+        finally:
+            await client.close()
+
+    with StubServer(delay=0.001) as stub:
+        report = asyncio.run(run(stub.url))
+    assert len(report.samples) >= 4
+    assert report.errors == {}
+    assert sum(sample.calls for sample in report.samples) > 0
+
+
+def test_mix_argument() -> None:
+    """The command line parses call weights."""
+    options = cli.parse_args(["--mix", "player=3,bazaar", "--duration", "5"])
+    assert options.mix == {"player": 3.0, "bazaar": 1.0}
+    assert options.duration == 5
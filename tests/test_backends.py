@@ -0,0 +1,51 @@
+"""Tests for shared coordination backends."""
+
+import asyncio
+from pathlib import Path
+
+from asyncpixel.backends import MemoryBackend, SQLiteBackend
+
+
+def test_sqlite_bucket_is_shared_between_backends(tmp_path: Path) -> None:
+    """Backends opened on the same file draw from one budget."""
+
+    async def run() -> None:
+        path = str(tmp_path / "shared.db")
+        first, second = SQLiteBackend(path), SQLiteBackend(path)
+        assert await first.take_token("key", 0.01, 2) == 0
+        assert await second.take_token("key", 0.01, 2) == 0
+        assert await first.take_token("key", 0.01, 2) > 0
+        await first.close()
+        await second.close()
+
+    asyncio.run(run())
+
+
+def test_sqlite_cache_round_trip(tmp_path: Path) -> None:
+    """Cached bodies are visible to other backends until they expire."""
+
+    async def run() -> None:
+        path = str(tmp_path / "shared.db")
+        first, second = SQLiteBackend(path), SQLiteBackend(path)
+        await first.cache_set("player?uuid=a", b'{"success": true}', 60)
+        await first.cache_set("status?uuid=a", b"{}", -1)
+        cached = await second.cache_get("player?uuid=a")
+        assert cached is not None and cached[0] == b'{"success": true}'
+        assert await second.cache_get("status?uuid=a") is None
+        await first.close()
+        await second.close()
+
+    asyncio.run(run())
+
+
+def test_memory_cache_is_bounded() -> None:
+    """The oldest responses are dropped once max_size is reached."""
+
+    async def run() -> None:
+        backend = MemoryBackend(max_size=2)
+        for index in range(3):
+            await backend.cache_set(str(index), b"", 60)
+        assert await backend.cache_get("0") is None
+        assert await backend.cache_get("2") is not None
+
+    asyncio.run(run())
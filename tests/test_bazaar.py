@@ -0,0 +1,53 @@
+"""Tests for bazaar models."""
+
+from asyncpixel.models.bazaar import (
+    Bazaar_buy_summary,
+    Bazaar_item,
+    Bazaar_quick_status,
+    Bazaar_sell_summary,
+)
+
+
+def _item() -> Bazaar_item:
+    return Bazaar_item(
+        name="ENCHANTED_SUGAR",
+        product_id="ENCHANTED_SUGAR",
+        sell_summary=[
+            Bazaar_sell_summary(amount=100, pricePerUnit=9.0, orders=1),
+            Bazaar_sell_summary(amount=50, pricePerUnit=8.0, orders=1),
+        ],
+        buy_summary=[
+            Bazaar_buy_summary(amount=100, pricePerUnit=10.0, orders=2),
+            Bazaar_buy_summary(amount=200, pricePerUnit=12.0, orders=3),
+        ],
+        quick_status=Bazaar_quick_status(
+            productId="ENCHANTED_SUGAR",
+            sellPrice=9.0,
+            sellVolume=150,
+            sellMovingWeek=1000,
+            sellOrders=2,
+            buyPrice=10.0,
+            buyVolume=300,
+            buyMovingWeek=2000,
+            buyOrders=5,
+        ),
+    )
+
+
+def test_quick_status_keeps_buy_side() -> None:
+    """Buy fields are not overwritten by sell values."""
+    status = _item().quick_status
+    assert (status.buyPrice, status.buyVolume) == (10.0, 300)
+    assert (status.buyMovingWeek, status.buyOrders) == (2000, 5)
+
+
+def test_order_book_fill_cost() -> None:
+    """Fill costs walk the book level by level."""
+    item = _item()
+    assert item.buy_book.fill_cost(100) == 1000.0
+    assert item.buy_book.fill_cost(150) == 1600.0
+    assert item.buy_book.fill_cost(301) is None
+    assert item.buy_book.slippage(300) == (3400 / 300 - 10) / 10
+    assert item.sell_book.best_price == 9.0
+    assert item.sell_book.fill_cost(120) == 900.0 + 160.0
+    assert item.sell_book.depth == 150
@@ -0,0 +1,54 @@
+"""Tests for the circuit breaker."""
+
+from typing import List
+
+from asyncpixel.circuit import CircuitBreaker, CircuitState
+
+
+def _breaker(now: List[float]) -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+
+def test_circuit_opens_after_repeated_failures() -> None:
+    """Consecutive failures open the circuit, a success in between does not."""
+    now = [0.0]
+    breaker = _breaker(now)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_circuit_lets_one_trial_through() -> None:
+    """After the timeout one trial decides whether the circuit closes."""
+    now = [0.0]
+    breaker = _breaker(now)
+    breaker.record_failure()
+    breaker.record_failure()
+    now[0] = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_lost_trial_is_replaced() -> None:
+    """A trial that never reports back does not keep the circuit open."""
+    now = [0.0]
+    breaker = _breaker(now)
+    breaker.record_failure()
+    breaker.record_failure()
+    now[0] = 10
+    assert breaker.allow()
+    now[0] = 15
+    assert not breaker.allow()
+    now[0] = 20
+    assert breaker.allow()
@@ -0,0 +1,282 @@
+"""Tests for request handling in the client."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+import pytest
+
+from asyncpixel import Client
+from asyncpixel.circuit import CircuitBreaker, CircuitState
+from asyncpixel.exceptions.exceptions import (
+    ApiNoSuccess,
+    CircuitOpen,
+    DeadlineExceeded,
+    RateLimitError,
+)
+from asyncpixel.scheduler import AdaptiveLimiter, PriorityScheduler
+
+
+class _FakeResponse:
+    """Response returning a canned json body."""
+
+    def __init__(self, body: Dict, delay: float) -> None:
+        """Init object.
+
+        Args:
+            body (Dict): json body
+            delay (float): seconds before the body is available
+        """
+        self.status = 200
+        self.headers = {"Content-Type": "application/json"}
+        self.body = body
+        self.delay = delay
+
+    async def __aenter__(self) -> "_FakeResponse":
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        """Return the encoded body.
+
+        Returns:
+            bytes: json body
+        """
+        return json.dumps(self.body).encode()
+
+
+class _FakeSession:
+    """Session answering each request after a scripted delay."""
+
+    def __init__(self, delays: List[float]) -> None:
+        """Init object.
+
+        Args:
+            delays (List[float]): delay of each successive request
+        """
+        self.delays = delays
+        self.calls = 0
+
+    def get(self, url: str, params: Dict) -> _FakeResponse:
+        """Start a request.
+
+        Args:
+            url (str): requested url
+            params (Dict): query parameters
+
+        Returns:
+            _FakeResponse: the scripted response
+        """
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        return _FakeResponse({"success": True, "call": self.calls}, delay)
+
+    async def close(self) -> None:
+        """Close the session."""
+
+
+async def _client(delays: List[float], **kwargs: Any) -> Client:
+    client = Client("key", scheduler=PriorityScheduler(burst=100), **kwargs)
+    await client.session.close()
+    client.session = _FakeSession(delays)  # type: ignore
+    return client
+
+
+def test_deadline_cancels_request() -> None:
+    """A request still running at its deadline raises DeadlineExceeded."""
+
+    async def run() -> None:
+        client = await _client([10])
+        with pytest.raises(DeadlineExceeded):
+            with client.deadline(0.05):
+                await client.get("status")
+        assert client.scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_slow_request_is_hedged() -> None:
+    """A request slower than the hedge percentile races a second attempt."""
+
+    async def run() -> None:
+        client = await _client([0.0] * 20 + [10, 0.0], hedge_percentile=0.9)
+        client.hedge_budget = 1
+        for _ in range(20):
+            await client.get("status", hedge=True)
+        with client.deadline(2):
+            data = await client.get("status", hedge=True)
+        assert data["call"] == 22
+        assert client.scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_cached_paths_skip_the_network() -> None:
+    """Responses of paths with a cache ttl are served from the backend."""
+
+    async def run() -> None:
+        client = await _client([0], cache_ttl={"boosters": 60})
+        first = await client.get("boosters")
+        assert await client.get("boosters") == first
+        await client.get("playerCount")
+        await client.get("playerCount")
+        assert client.session.calls == 3  # type: ignore
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_raw_responses_are_not_decoded() -> None:
+    """Raw requests return the body untouched and still detect errors."""
+
+    async def run() -> None:
+        client = await _client([0])
+        raw = await client.get_raw("boosters")
+        assert raw.status == 200
+        assert raw.headers["Content-Type"] == "application/json"
+        assert bytes(raw.view) == b'{"success": true, "call": 1}'
+
+        client.session.get = lambda url, params: _FakeResponse(  # type: ignore
+            {"cause": "Missing field", "success": False}, 0
+        )
+        with pytest.raises(ApiNoSuccess):
+            await client.get_raw("boosters")
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_unsuccessful_bodies_are_not_cached() -> None:
+    """A 200 response reporting failure is not served from the cache."""
+
+    async def run() -> None:
+        client = await _client([0], cache_ttl={"boosters": 60})
+        session = client.session
+        session.get = lambda url, params: _FakeResponse(  # type: ignore
+            {"success": False, "cause": "Internal error"}, 0
+        )
+        for _ in range(2):
+            with pytest.raises(ApiNoSuccess):
+                await client.get("boosters")
+        assert await client.backend.cache_get("boosters?") is None
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_large_bodies_are_decoded_in_the_executor() -> None:
+    """Bodies over the threshold are built off the loop, small ones inline."""
+    threads: List[int] = []
+
+    def build(data: Dict) -> int:
+        threads.append(threading.get_ident())
+        return data["call"]
+
+    async def run() -> None:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            client = await _client([0], offload_threshold=10, executor=executor)
+            assert await client.get_model("boosters", build) == 1
+            client.offload_threshold = 1000
+            assert await client.get_model("boosters", build) == 2
+            await client.close()
+
+    asyncio.run(run())
+    assert threads[0] != threading.get_ident()
+    assert threads[1] == threading.get_ident()
+
+
+def test_rate_limited_responses_lower_concurrency() -> None:
+    """A 429 cuts the concurrency of the scheduler through the limiter."""
+
+    async def run() -> None:
+        client = await _client([0], limiter=AdaptiveLimiter(initial=8))
+        assert client.scheduler.max_concurrency == 8
+        response = _FakeResponse({"success": False}, 0)
+        response.status = 429
+        client.session.get = lambda url, params: response  # type: ignore
+        with pytest.raises(RateLimitError):
+            await client.get("boosters")
+        assert client.scheduler.max_concurrency == 4
+        await client.close()
+
+    asyncio.run(run())
+
+
+async def _age(client: Client, key: str, seconds: float) -> None:
+    cached = await client.backend.cache_get(key)
+    assert cached is not None
+    now = time.time()
+    client.backend._cache[key] = (cached[0], now - seconds, now + 3600)  # type: ignore
+
+
+def test_stale_bodies_are_served_while_refreshing() -> None:
+    """An expired body is answered at once and refreshed in the background."""
+
+    async def run() -> None:
+        client = await _client(
+            [0], cache_ttl={"boosters": 60}, stale_while_revalidate=60
+        )
+        assert (await client.get("boosters"))["call"] == 1
+        await _age(client, "boosters?", 90)
+        raw = await client.get_raw("boosters")
+        assert raw.stale and json.loads(raw.body)["call"] == 1
+        await asyncio.sleep(0.01)
+        assert client.session.calls == 2  # type: ignore
+        raw = await client.get_raw("boosters")
+        assert not raw.stale and json.loads(raw.body)["call"] == 2
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_stale_bodies_are_served_during_outages() -> None:
+    """Failures open the circuit and cached bodies keep being served."""
+
+    def fail(url: str, params: Dict) -> None:
+        raise aiohttp.ClientConnectionError()
+
+    async def run() -> None:
+        client = await _client(
+            [0],
+            cache_ttl={"boosters": 60},
+            stale_if_error=600,
+            breaker=CircuitBreaker(failure_threshold=1),
+        )
+        await client.get("boosters")
+        await _age(client, "boosters?", 90)
+        client.session.get = fail  # type: ignore
+        assert (await client.get("boosters"))["call"] == 1
+        assert client.breaker is not None
+        assert client.breaker.state is CircuitState.OPEN
+        assert (await client.get("boosters"))["call"] == 1
+        with pytest.raises(CircuitOpen):
+            await client.get("leaderboards")
+        await client.close()
+
+    asyncio.run(run())
+
+
+def test_hot_bodies_are_refreshed_ahead_of_expiry() -> None:
+    """Frequently read bodies are refreshed before their ttl runs out."""
+
+    async def run() -> None:
+        client = await _client(
+            [0], cache_ttl={"boosters": 60}, refresh_ahead=0.5, hot_after=2
+        )
+        await client.get("boosters")
+        await _age(client, "boosters?", 40)
+        await client.get("boosters")
+        assert client.session.calls == 1  # type: ignore
+        await client.get("boosters")
+        await asyncio.sleep(0.01)
+        assert client.session.calls == 2  # type: ignore
+        await client.close()
+
+    asyncio.run(run())
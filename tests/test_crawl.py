@@ -0,0 +1,143 @@
+"""Tests for auction page parsing."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+from typing import Dict, List
+
+import pytest
+
+from asyncpixel import Client
+from asyncpixel.crawl import AuctionCrawler, parse_auction_page
+from asyncpixel.exceptions.exceptions import InvalidApiKey
+from asyncpixel.scheduler import Priority
+
+
+def _auction(uuid: str, price: int) -> Dict:
+    return {
+        "uuid": uuid,
+        "auctioneer": "seller",
+        "profile_id": "profile",
+        "item_name": "Hyperion",
+        "item_lore": "lore",
+        "category": "weapon",
+        "tier": "LEGENDARY",
+        "start": 1600000000000,
+        "end": 1600000060000,
+        "starting_bid": price,
+        "highest_bid_amount": 0,
+        "bin": True,
+        "claimed": False,
+    }
+
+
+def _cheap(auction: Dict) -> bool:
+    return auction["starting_bid"] < 100
+
+
+BODY = json.dumps(
+    {
+        "success": True,
+        "page": 0,
+        "totalPages": 1,
+        "totalAuctions": 2,
+        "lastUpdated": 1600000000000,
+        "auctions": [_auction("a", 50), _auction("b", 500)],
+    }
+).encode()
+
+
+def test_parse_page_in_process_pool() -> None:
+    """Pages parse into filtered columns inside worker processes."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        meta, columns = pool.submit(
+            parse_auction_page, BODY, ("uuid", "start", "starting_bid"), _cheap
+        ).result()
+    assert meta["success"] and meta["totalPages"] == 1
+    assert len(columns) == 1
+    assert list(columns.rows()) == [
+        {"uuid": "a", "start": 1600000000.0, "starting_bid": 50}
+    ]
+    item = columns.to_items()[0]
+    assert item.item_lore is None
+    assert item.start is not None
+    assert item.start.timestamp() == 1600000000.0
+
+
+def test_failed_page_has_no_metadata() -> None:
+    """Unsuccessful responses are reported without raising in the worker."""
+    meta, columns = parse_auction_page(
+        b'{"success": false, "cause": "Invalid API key"}'
+    )
+    assert meta == {"success": False, "cause": "Invalid API key"}
+    assert len(columns) == 0
+
+
+class _FakeClient:
+    """Client serving pages of a scripted auction house."""
+
+    api_key = "key"
+    _check = staticmethod(Client._check)
+
+    def __init__(self, pages: int, cause: str = "") -> None:
+        """Init object.
+
+        Args:
+            pages (int): pages in the auction house
+            cause (str, optional): error every page fails with.
+                Defaults to "" for success.
+        """
+        self.pages = pages
+        self.cause = cause
+        self.requested: List[int] = []
+
+    async def _fetch(self, path: str, params: Dict, priority: Priority) -> bytes:
+        """Serve a page, later pages answering first.
+
+        Args:
+            path (str): requested path
+            params (Dict): query parameters
+            priority (Priority): scheduling class
+
+        Returns:
+            bytes: page body
+        """
+        page = params["page"]
+        self.requested.append(page)
+        await asyncio.sleep(0.01 * (self.pages - page))
+        if self.cause:
+            return json.dumps({"success": False, "cause": self.cause}).encode()
+        data = json.loads(BODY)
+        data.update(page=page, totalPages=self.pages)
+        data["auctions"] = [_auction(f"{page}", 10)]
+        return json.dumps(data).encode()
+
+
+def test_pages_are_crawled_in_order() -> None:
+    """Pages arrive in page order whatever order downloads finish in."""
+
+    async def run() -> None:
+        client = _FakeClient(6)
+        crawler = AuctionCrawler(
+            client, ThreadPoolExecutor(), ("uuid",), concurrency=2  # type: ignore
+        )
+        columns = await crawler.crawl()
+        assert columns.columns["uuid"] == [str(page) for page in range(6)]
+        assert sorted(client.requested) == list(range(6))
+        assert crawler.last_updated is not None
+        crawler.executor.shutdown()
+
+    asyncio.run(run())
+
+
+def test_invalid_key_is_reported() -> None:
+    """Error pages raise the same errors as the client."""
+
+    async def run() -> None:
+        client = _FakeClient(2, cause="Invalid API key")
+        crawler = AuctionCrawler(client, ThreadPoolExecutor())  # type: ignore
+        with pytest.raises(InvalidApiKey):
+            await crawler.crawl()
+        crawler.executor.shutdown()
+
+    asyncio.run(run())
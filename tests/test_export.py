@@ -0,0 +1,73 @@
+"""Tests for streaming auction exports."""
+
+import asyncio
+import csv
+import json
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from asyncpixel.crawl import AuctionColumns
+from asyncpixel.export import (
+    CsvWriter,
+    NdjsonWriter,
+    open_writer,
+    ParquetWriter,
+    write_pages,
+)
+
+FIELDS = ("uuid", "starting_bid", "bin")
+
+
+async def _pages() -> AsyncIterator[AuctionColumns]:
+    for page in range(3):
+        columns = AuctionColumns(FIELDS)
+        for index in range(2):
+            columns.append(
+                {"uuid": f"{page}-{index}", "starting_bid": index, "bin": index == 1}
+            )
+        yield columns
+
+
+def test_write_pages_to_ndjson(tmp_path: Path) -> None:
+    """Every page is written in order as one object per line."""
+    path = tmp_path / "auctions.ndjson"
+    with NdjsonWriter(str(path)) as writer:
+        assert asyncio.run(write_pages(_pages(), writer)) == 6
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["uuid"] for row in rows] == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+    assert rows[1] == {"uuid": "0-1", "starting_bid": 1, "bin": True}
+
+
+def test_write_pages_to_csv(tmp_path: Path) -> None:
+    """Csv exports start with a single header row."""
+    path = tmp_path / "auctions.csv"
+    with CsvWriter(str(path)) as writer:
+        asyncio.run(write_pages(_pages(), writer))
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == list(FIELDS)
+    assert rows[2] == ["0-1", "1", "True"]
+    assert len(rows) == 7
+
+
+def test_write_pages_to_parquet(tmp_path: Path) -> None:
+    """Parquet exports batch pages into typed row groups."""
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = tmp_path / "auctions.parquet"
+    with ParquetWriter(str(path), FIELDS, row_group_size=4) as writer:
+        assert asyncio.run(write_pages(_pages(), writer)) == 6
+    parquet = pyarrow.parquet.ParquetFile(str(path))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("bin").to_pylist() == [False, True] * 3
+    assert table.column("starting_bid").type == pyarrow.int64()
+
+
+def test_unknown_format_is_rejected(tmp_path: Path) -> None:
+    """Only known extensions select a writer."""
+    with pytest.raises(ValueError):
+        open_writer(str(tmp_path / "auctions.xml"))
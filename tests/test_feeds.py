@@ -0,0 +1,85 @@
+"""Tests for deduplicating feeds."""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from asyncpixel import Client
+from asyncpixel.feeds import EndedAuctionFeed, TimeWindowSet
+
+
+def _sale(auction_id: str) -> Dict[str, Any]:
+    return {
+        "auction_id": auction_id,
+        "seller": "seller",
+        "seller_profile": "profile",
+        "buyer": "buyer",
+        "timestamp": 1600000000000,
+        "price": 100,
+        "bin": True,
+        "item_bytes": "",
+    }
+
+
+async def _client(responses: List[Dict]) -> Client:
+    client = Client("key")
+    await client.session.close()
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        assert path == "skyblock/auctions_ended"
+        return json.dumps(dict(responses.pop(0), success=True)).encode()
+
+    client._fetch = fetch  # type: ignore
+    return client
+
+
+def test_time_window_set_forgets_old_keys() -> None:
+    """Keys are deduplicated within the window and forgotten after it."""
+    seen = TimeWindowSet(window=10)
+    assert seen.add("a", now=0)
+    assert not seen.add("a", now=5)
+    assert seen.add("b", now=6)
+    assert seen.add("a", now=11)
+    assert len(seen) == 2
+
+
+def test_time_window_set_is_bounded() -> None:
+    """The oldest keys are dropped once max_size is reached."""
+    seen = TimeWindowSet(window=1000, max_size=3)
+    for index in range(10):
+        seen.add(str(index), now=index)
+    assert len(seen) == 3
+
+
+def test_feed_yields_each_sale_once() -> None:
+    """Overlapping polls yield new sales only and unchanged polls nothing."""
+    responses = [
+        {"lastUpdated": 1, "auctions": [_sale("a"), _sale("b")]},
+        {"lastUpdated": 1, "auctions": [_sale("a"), _sale("b")]},
+        {"lastUpdated": 2, "auctions": [_sale("b"), _sale("c")]},
+    ]
+
+    async def run() -> List[List[str]]:
+        feed = EndedAuctionFeed(await _client(responses))
+        polls = []
+        for _ in range(3):
+            polls.append([sale.auction_id async for sale in feed.poll_once()])
+        return polls
+
+    assert asyncio.run(run()) == [["a", "b"], [], ["c"]]
+
+
+def test_ended_auctions_are_parsed() -> None:
+    """Sales are built with their timestamps converted to datetimes."""
+
+    async def run() -> None:
+        client = await _client(
+            [{"lastUpdated": 1600000000000, "auctions": [_sale("a")]}]
+        )
+        ended = await client.get_auctions_ended()
+        assert ended.lastUpdated.timestamp() == 1600000000
+        sale = ended.auctions[0]
+        assert (sale.auction_id, sale.price, sale.bin) == ("a", 100, True)
+        assert sale.timestamp.timestamp() == 1600000000
+
+    asyncio.run(run())
@@ -0,0 +1,93 @@
+"""Tests for the guild experience tracker."""
+
+import datetime as dt
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from asyncpixel.guilds import GuildTracker, TrackedGuild
+from asyncpixel.models.guild import Guild
+
+START = dt.date(2020, 10, 1)
+
+
+def _members(histories: Dict[str, Dict[int, int]], today: int) -> List[Dict]:
+    """Members as sent by the api, with the seven days ending today."""
+    members = []
+    for uuid, history in histories.items():
+        days = range(today, today - 7, -1)
+        exp = {
+            (START + dt.timedelta(days=day)).isoformat(): history.get(day, 0)
+            for day in days
+        }
+        members.append({"uuid": uuid, "rank": "Member", "expHistory": exp})
+    return members
+
+
+def _guild(_id: str, members: List[Dict[str, Any]]) -> Guild:
+    guild = Guild.__new__(Guild)
+    guild._id, guild.name, guild.members = _id, _id.title(), members
+    return guild
+
+
+def _expected(histories: Dict[str, Dict[int, int]], today: int, days: int) -> int:
+    return sum(
+        exp
+        for history in histories.values()
+        for day, exp in history.items()
+        if today - days < day <= today
+    )
+
+
+def test_totals_match_full_recount() -> None:
+    """Running totals equal a recount after many daily refetches."""
+    rng = random.Random(1)
+    histories: Dict[str, Dict[int, int]] = {f"m{i}": {} for i in range(20)}
+    tracked = TrackedGuild("g", "G")
+    for today in range(60):
+        if today == 40:
+            del histories["m3"]
+        if today == 45:
+            histories["new"] = {}
+        for history in histories.values():
+            history[today] = rng.randrange(0, 5000)
+        for _ in range(2):
+            # Refetched during the day, today's experience keeps growing.
+            for history in histories.values():
+                history[today] += rng.randrange(0, 100)
+            tracked.merge(_members(histories, today))
+            assert tracked.weekly == _expected(histories, today, 7)
+            assert tracked.monthly == _expected(histories, today, 30)
+    totals = tracked.member_totals()
+    assert "m3" not in totals
+    assert totals["m0"] == _expected({"m0": histories["m0"]}, 59, 7)
+    assert all(len(history.values) <= 30 for history in tracked.members.values())
+
+
+def test_only_new_days_are_merged() -> None:
+    """A refetch only touches the last stored day and the days after it."""
+    histories = {"a": {0: 10, 1: 20}, "b": {1: 5}}
+    tracked = TrackedGuild("g", "G")
+    assert tracked.merge(_members(histories, 1)) == 3
+    assert tracked.merge(_members(histories, 1)) == 0
+    histories["a"][1] = 25
+    histories["a"][2] = 7
+    assert tracked.merge(_members(histories, 2)) == 2
+    assert tracked.weekly == 47
+
+
+def test_ranking() -> None:
+    """Guilds are ranked by their stored totals."""
+    tracker = GuildTracker()
+    tracker.update(_guild("small", _members({"a": {0: 10}}, 0)))
+    tracker.update(_guild("big", _members({"b": {0: 100}, "c": {0: 1}}, 0)))
+    tracker.update(_guild("old", _members({"d": {13: 500}}, 13)))
+    tracker.update(_guild("old", _members({"d": {13: 500}}, 20)))
+    assert [g.name for g in tracker.ranking()] == ["Big", "Small", "Old"]
+    assert [g.name for g in tracker.ranking(monthly=True, limit=1)] == ["Old"]
+    assert len(tracker) == 3 and "big" in tracker
+    tracker.remove("big")
+    assert tracker.get("big") is None
+    with pytest.raises(ValueError):
+        GuildTracker(days=7)
@@ -0,0 +1,30 @@
+"""Tests for the player name index."""
+
+from pathlib import Path
+
+from asyncpixel.names import NameIndex
+
+
+def test_lookup_is_case_insensitive() -> None:
+    """Names resolve regardless of case and aliases do not overwrite."""
+    index = NameIndex()
+    index.add_names("aaaa-bbbb", "Notch", ["OldName"])
+    index.add_names("cccc", "OtherPlayer", ["notch"])
+    assert index.get("NOTCH") == "aaaabbbb"
+    assert index.get("oldname") == "aaaabbbb"
+    assert index.get("otherplayer") == "cccc"
+    assert index.get("missing") is None
+
+
+def test_eviction_and_persistence(tmp_path: Path) -> None:
+    """The least recently used name is evicted and the index round trips."""
+    path = str(tmp_path / "names.json")
+    index = NameIndex(max_size=2, path=path)
+    index.add("one", "1")
+    index.add("two", "2")
+    index.get("one")
+    index.add("three", "3")
+    assert "two" not in index
+    assert len(index) == 2
+    index.save()
+    assert NameIndex(path=path).get("ONE") == "1"
@@ -0,0 +1,67 @@
+"""Tests for price aggregation."""
+
+import datetime as dt
+from typing import Optional
+
+from asyncpixel.models.auctions import Auction_item
+from asyncpixel.pricing import PriceAggregator, QuantileSketch
+
+
+def _auction(uuid: str, name: str, price: int) -> Auction_item:
+    return Auction_item(
+        uuid=uuid,
+        auctioneer="seller",
+        profile_id="profile",
+        coop=[],
+        start=dt.datetime(2020, 9, 13),
+        end=dt.datetime(2020, 9, 14),
+        item_name=name,
+        item_lore="",
+        extra="",
+        category="misc",
+        tier="COMMON",
+        starting_bid=price,
+        item_bytes="",
+        claimed=False,
+        claimed_bidders=[],
+        highest_bid_amount=0,
+        bids=[],
+    )
+
+
+def _close(value: Optional[float], expected: float, tolerance: float) -> bool:
+    assert value is not None
+    return abs(value - expected) / expected < tolerance
+
+
+def test_sketch_quantiles_are_accurate() -> None:
+    """Quantiles stay within the relative accuracy."""
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in range(1, 10001):
+        sketch.add(value)
+    assert _close(sketch.quantile(0.5), 5000, 0.02)
+    assert _close(sketch.quantile(0.99), 9900, 0.02)
+
+
+def test_aggregator_window_and_duplicates() -> None:
+    """Duplicate auctions are ignored and old slices fall out of the window."""
+    prices = PriceAggregator(window=100, slots=10)
+    snapshot = [_auction(str(i), "Wheat", 10 + i) for i in range(5)]
+    assert prices.add_many(snapshot, now=0) == 5
+    assert prices.add_many(snapshot, now=5) == 0
+    stats = prices.stats("Wheat", now=5)
+    assert stats is not None
+    assert (stats.volume, stats.minimum, stats.mean) == (5, 10, 12)
+    assert _close(prices.fair_price("Wheat", now=5), 12, 0.05)
+    later = prices.stats("Wheat", now=150)
+    assert later is not None and later.volume == 0
+    assert prices.fair_price("Missing") is None
+
+
+def test_aggregator_dedup_uses_unix_time() -> None:
+    """Duplicates added without explicit times are still recognised."""
+    prices = PriceAggregator(window=100)
+    auction = _auction("a", "Wheat", 10)
+    assert prices.add(auction)
+    assert not prices.add(auction)
+    assert "a" in prices._seen
@@ -0,0 +1,112 @@
+"""Tests for the lazily parsed skyblock profile."""
+
+import asyncio
+import base64
+import gzip
+import json
+import struct
+from typing import Any
+
+from asyncpixel import Client
+from asyncpixel.models.profile import Profile
+
+
+def _inventory() -> str:
+    """Encode an inventory holding a single named item.
+
+    Returns:
+        str: base64 gzipped NBT
+    """
+    name = b"Hyperion"
+    item = (
+        b"\x01\x00\x05Count"
+        + struct.pack(">b", 1)
+        + b"\x08\x00\x04Name"
+        + struct.pack(">H", len(name))
+        + name
+        + b"\x00"
+    )
+    root = (
+        b"\x0a\x00\x00"
+        + b"\x09\x00\x01i\x0a"
+        + struct.pack(">i", 2)
+        + item
+        + b"\x00"
+        + b"\x00"
+    )
+    return base64.b64encode(gzip.compress(root)).decode()
+
+
+def test_profile_sections_are_lazy() -> None:
+    """Sections are decoded on first access and cached."""
+    profile = Profile(
+        {
+            "profile_id": "abc",
+            "cute_name": "Apple",
+            "members": {
+                "uuid1": {
+                    "experience_skill_farming": 120.5,
+                    "collection": {"WHEAT": 50},
+                    "slayer_bosses": {"zombie": {"xp": 15}},
+                    "inv_contents": {"type": 0, "data": _inventory()},
+                }
+            },
+            "banking": {
+                "balance": 10.0,
+                "transactions": [
+                    {
+                        "amount": 5.0,
+                        "timestamp": 1600000000000,
+                        "action": "DEPOSIT",
+                        "initiator_name": "Steve",
+                    }
+                ],
+            },
+        }
+    )
+    assert "members" not in vars(profile)
+    member = profile.members["uuid1"]
+    assert profile.members is profile.members
+    assert member.skills == {"FARMING": 120.5}
+    assert member.collections == {"WHEAT": 50}
+    assert member.slayers == {"zombie": 15}
+    inventory = member.inventories["inv_contents"]
+    assert "items" not in vars(inventory)
+    assert inventory.items == [{"Count": 1, "Name": "Hyperion"}, {}]
+    assert profile.banking.balance == 10.0
+    assert profile.banking.transactions[0].action == "DEPOSIT"
+
+
+def test_empty_backpacks_are_skipped() -> None:
+    """Backpack slots without data do not break the inventories."""
+    profile = Profile(
+        {
+            "members": {
+                "uuid1": {
+                    "backpack_contents": {
+                        "0": {"type": 0, "data": _inventory()},
+                        "1": {"type": 0},
+                    }
+                }
+            }
+        }
+    )
+    assert profile.profile_id is None
+    assert list(profile.members["uuid1"].inventories) == ["backpack_0"]
+
+
+def test_unknown_profile_is_none() -> None:
+    """A null profile is returned as None."""
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        return json.dumps({"success": True, "profile": None}).encode()
+
+    async def run() -> None:
+        client = Client("key")
+        client._fetch = fetch  # type: ignore
+        try:
+            assert await client.get_profile("missing") is None
+        finally:
+            await client.close()
+
+    asyncio.run(run())
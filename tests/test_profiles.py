@@ -0,0 +1,93 @@
+"""Tests for the batched profile loader."""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from asyncpixel import Client
+from asyncpixel.profiles import ProfileLoader
+
+# Players a, b and c share the coop, a and d also have a solo profile.
+PROFILES = {
+    "coop": {"profile_id": "coop", "members": {"a": {}, "b": {}, "c": {}}},
+    "solo_a": {"profile_id": "solo_a", "members": {"a": {}}},
+    "solo_d": {"profile_id": "solo_d", "members": {"d": {}}},
+}
+
+
+def _client(requested: List[str]) -> Client:
+    async def fetch(path: str, params: Dict[str, Any], *args: Any) -> bytes:
+        uuid = params["uuid"]
+        requested.append(uuid)
+        await asyncio.sleep(0)
+        if uuid == "broken":
+            raise asyncio.TimeoutError
+        profiles = [p for p in PROFILES.values() if uuid in p["members"]]
+        return json.dumps({"success": True, "profiles": profiles}).encode()
+
+    client = Client("key")
+    client._fetch = fetch  # type: ignore
+    return client
+
+
+def test_coop_members_share_one_request() -> None:
+    """Coop members of a loaded profile are not fetched again."""
+
+    async def run() -> None:
+        requested: List[str] = []
+        client = _client(requested)
+        loader = ProfileLoader(client, concurrency=1)
+        try:
+            profiles = await loader.load(["a", "b", "c", "d", "a", "broken"])
+            again = await loader.load(["d"])
+        finally:
+            await client.close()
+        assert requested == ["a", "d", "broken"]
+        assert (loader.fetched, loader.skipped) == (2, 2)
+        assert [p.profile_id for p in profiles["a"]] == ["coop", "solo_a"]
+        assert profiles["b"][0] is profiles["a"][0] is profiles["c"][0]
+        assert [p.profile_id for p in again["d"]] == ["solo_d"]
+        assert "broken" not in profiles
+        assert isinstance(loader.errors["broken"], asyncio.TimeoutError)
+
+    asyncio.run(run())
+
+
+def test_coop_members_skipped_when_concurrent() -> None:
+    """Listings in flight are awaited before fetching another player."""
+
+    async def run() -> None:
+        requested: List[str] = []
+        client = _client(requested)
+        loader = ProfileLoader(client, concurrency=4)
+        try:
+            profiles = await loader.load(["a", "b", "c", "d"])
+        finally:
+            await client.close()
+        assert requested == ["a", "d"]
+        assert profiles["c"][0] is profiles["a"][0]
+        assert not loader._in_flight
+
+    asyncio.run(run())
+
+
+def test_complete_listings_still_share_objects() -> None:
+    """Without skipping every listing is fetched but profiles are shared."""
+
+    async def run() -> None:
+        requested: List[str] = []
+        client = _client(requested)
+        loader = ProfileLoader(client, concurrency=4, skip_known_members=False)
+        try:
+            profiles = await loader.load(["a", "b-"])
+        finally:
+            await client.close()
+        assert sorted(requested) == ["a", "b"]
+        assert profiles["b"] == [profiles["a"][0]]
+        assert loader.profiles_of("c") == profiles["b"]
+        with pytest.raises(ValueError):
+            ProfileLoader(client, concurrency=0)
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+"""Tests for progression calculators."""
+
+from asyncpixel import progression
+
+
+def test_network_levels_match_scalar() -> None:
+    """Batch network levels agree with the scalar formula."""
+    xps = [0, 9999, 10000, 22499, 22500, 1_000_000, 45_000_000]
+    assert progression.network_levels(xps) == [
+        progression.network_level(xp) for xp in xps
+    ]
+    assert progression.network_levels([10000, 22500]) == [2, 3]
+
+
+def test_network_exp_for_level_round_trip() -> None:
+    """Experience for a level maps back onto that level."""
+    for level in range(1, 300):
+        xp = progression.network_exp_for_level(level)
+        assert progression.network_level(xp + 1) == level
+
+
+def test_guild_levels() -> None:
+    """Guild levels follow the table and its overflow."""
+    assert progression.guild_levels([0, 99999, 100000, 250000]) == [0, 0, 1, 2]
+    table_end = sum(progression.GUILD_EXP_NEEDED)
+    assert progression.guild_level(table_end) == 15
+    assert progression.guild_level(table_end + 6_000_000) == 17
+
+
+def test_skill_tables() -> None:
+    """Skill tables are built from the resources response and capped."""
+    resources = {
+        "skills": {
+            "FARMING": {
+                "maxLevel": 3,
+                "levels": [
+                    {"level": 2, "totalExpRequired": 175.0},
+                    {"level": 1, "totalExpRequired": 50.0},
+                    {"level": 3, "totalExpRequired": 375.0},
+                ],
+            }
+        }
+    }
+    table = progression.skill_tables(resources)["FARMING"]
+    assert table.levels([0, 50, 174, 175, 10_000]) == [0, 1, 1, 2, 3]
+    assert table.progress(112.5) == 1.5
@@ -0,0 +1,51 @@
+"""Tests for the resource catalogue."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from asyncpixel.resources import ResourceCatalogue, RESOURCES
+
+CANNED = {
+    "achievements": {"bedwars": {"one_time": {"FIRST_WIN": {"points": 5}}}},
+    "challenges": {"BEDWARS": [{"id": "BEDWARS__support"}]},
+    "quests": {"bedwars": [{"id": "bedwars_daily_win"}]},
+    "guilds_achievements": {"one_time": {"SIX_MEMBERS": {"name": "6"}}},
+    "guilds_permissions": [{"en_us": {"name": "Modify Guild Name"}}],
+    "skyblock_collections": {"FARMING": {"items": {"WHEAT": {"maxTiers": 11}}}},
+    "skyblock_skills": {"FARMING": {"maxLevel": 50}},
+}
+
+
+class _FakeClient:
+    """Client returning canned resources."""
+
+    def __init__(self) -> None:
+        """Init object."""
+        self.calls = 0
+        for name, method in RESOURCES.items():
+            setattr(self, method, self._fetcher(name))
+
+    def _fetcher(self, name: str) -> Callable[[], Coroutine[Any, Any, Any]]:
+        async def fetch() -> Any:
+            self.calls += 1
+            return CANNED[name]
+
+        return fetch
+
+
+def test_catalogue_snapshot(tmp_path: Path) -> None:
+    """The catalogue indexes resources and restores them from disk."""
+    path = str(tmp_path / "resources.json")
+    client = _FakeClient()
+    catalogue = ResourceCatalogue(client, snapshot_path=path)  # type: ignore
+    asyncio.run(catalogue.start())
+    assert client.calls == len(RESOURCES)
+    assert catalogue.get("achievements", "bedwars_first_win") == {"points": 5}
+    assert catalogue.get("quests", "bedwars_daily_win") is not None
+    assert catalogue.get("skyblock_collections", "WHEAT") == {"maxTiers": 11}
+
+    cold = ResourceCatalogue(client, snapshot_path=path)  # type: ignore
+    assert cold.load_snapshot()
+    assert cold.get("guilds_permissions", "0") is not None
+    assert cold.get("skyblock_skills", "FARMING") == {"maxLevel": 50}
@@ -0,0 +1,41 @@
+"""Tests for the counter sampler."""
+
+import asyncio
+from typing import Dict
+
+from asyncpixel.sampler import RingBuffer, Sampler, Series
+
+
+def test_ring_buffer_wraps_and_ranges() -> None:
+    """Old points are overwritten and ranges span the wrap."""
+    buffer = RingBuffer(4)
+    for timestamp in range(6):
+        buffer.append(timestamp, timestamp * 10)
+    assert len(buffer) == 4
+    assert buffer.range() == ([2, 3, 4, 5], [20, 30, 40, 50])
+    assert buffer.range(3, 5) == ([3, 4], [30, 40])
+
+
+def test_series_downsamples_to_bucket_means() -> None:
+    """Coarser resolutions keep the mean of each bucket."""
+    series = Series({0: 10, 60: 10})
+    for timestamp, value in ((0, 1), (30, 3), (60, 10), (90, 20)):
+        series.add(timestamp, value)
+    assert series.range(resolution=0)[1] == [1, 3, 10, 20]
+    assert series.range(resolution=60) == ([0, 60], [2, 15])
+
+
+def test_sampler_records_sources_and_errors() -> None:
+    """Values land in named series and failing sources are reported."""
+
+    async def count(client: object) -> Dict[str, float]:
+        return {"players": 100}
+
+    async def broken(client: object) -> Dict[str, float]:
+        raise RuntimeError("down")
+
+    sampler = Sampler(None, sources={"count": count, "broken": broken})  # type: ignore
+    asyncio.run(sampler.sample(now=120))
+    assert sampler.range("players") == ([120], [100])
+    assert isinstance(sampler.errors["broken"], RuntimeError)
+    assert sampler.range("missing") == ([], [])
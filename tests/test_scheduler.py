@@ -0,0 +1,105 @@
+"""Tests for the priority scheduler."""
+
+import asyncio
+from typing import List
+
+from asyncpixel.scheduler import AdaptiveLimiter, Priority, PriorityScheduler
+
+
+async def _run_order(scheduler: PriorityScheduler, classes: List[Priority]) -> List:
+    order = []
+
+    async def job(priority: Priority) -> None:
+        async with scheduler.request(priority):
+            order.append(priority)
+
+    await scheduler.acquire(Priority.NORMAL)
+    tasks = [asyncio.ensure_future(job(priority)) for priority in classes]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_interactive_jumps_queue() -> None:
+    """Interactive requests are served before queued bulk requests."""
+    scheduler = PriorityScheduler(burst=100, max_concurrency=1, min_shares={})
+    classes = [Priority.BULK] * 3 + [Priority.INTERACTIVE]
+    order = asyncio.run(_run_order(scheduler, classes))
+    assert order[0] == Priority.INTERACTIVE
+    assert scheduler.stats[Priority.BULK].granted == 3
+    assert scheduler.stats[Priority.BULK].waiting == 0
+
+
+def test_bulk_gets_minimum_share() -> None:
+    """Bulk requests are not starved by a steady interactive load."""
+    scheduler = PriorityScheduler(
+        burst=1000,
+        max_concurrency=1,
+        min_shares={Priority.BULK: 0.25},
+        starve_after=0,
+    )
+    classes = [Priority.INTERACTIVE] * 40 + [Priority.BULK] * 40
+    order = asyncio.run(_run_order(scheduler, classes))
+    assert order[:40].count(Priority.BULK) >= 8
+
+
+def test_fresh_bulk_does_not_preempt_interactive() -> None:
+    """With default shares a bulk request that just queued waits its turn."""
+    scheduler = PriorityScheduler(burst=100, max_concurrency=1)
+    classes = [Priority.BULK, Priority.INTERACTIVE]
+    order = asyncio.run(_run_order(scheduler, classes))
+    assert order == [Priority.INTERACTIVE, Priority.BULK]
+
+
+def test_limiter_grows_while_latency_is_steady() -> None:
+    """A fully used limit grows while latency stays at its usual level."""
+    limiter = AdaptiveLimiter(initial=4, max_limit=32)
+    for _ in range(50):
+        limiter.on_success(0.1, limiter.limit)
+    assert limiter.limit > 4
+
+
+def test_limiter_does_not_grow_when_unused() -> None:
+    """A limit the caller does not use is left alone."""
+    limiter = AdaptiveLimiter(initial=8)
+    for _ in range(50):
+        limiter.on_success(0.1, 1)
+    assert limiter.limit == 8
+
+
+def test_limiter_shrinks_on_latency_and_drops() -> None:
+    """Rising latency and 429s lower the limit, never below the minimum."""
+    limiter = AdaptiveLimiter(initial=16, min_limit=2)
+    for _ in range(20):
+        limiter.on_success(0.1, 16)
+    before = limiter.limit
+    for _ in range(10):
+        limiter.on_success(1.0, 16)
+    assert limiter.limit < before
+    for _ in range(10):
+        limiter.on_drop()
+    assert limiter.limit == 2
+    assert limiter.drops == 10
+
+
+def test_limiter_respects_remaining_quota() -> None:
+    """The limit never exceeds the requests left in the rate limit window."""
+    limiter = AdaptiveLimiter(initial=16)
+    assert limiter.on_success(0.1, 16, {"RateLimit-Remaining": "3"}) == 3
+
+
+def test_raising_concurrency_dispatches_queued_requests() -> None:
+    """Queued requests start as soon as the limit is raised."""
+
+    async def run() -> int:
+        scheduler = PriorityScheduler(burst=100, max_concurrency=1)
+        await scheduler.acquire()
+        waiter = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        scheduler.set_concurrency(2)
+        await asyncio.wait_for(waiter, 1)
+        return scheduler.in_flight
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,166 @@
+"""Tests for declarative schemas."""
+
+import asyncio
+import datetime as dt
+import json
+import tracemalloc
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import pytest
+
+from asyncpixel import Client
+from asyncpixel.schema import AUCTION_ITEM, BAZAAR_ITEM, Field, PLAYER, Schema
+
+
+class _Point(NamedTuple):
+    x: int
+    y: int
+    label: Optional[str]
+
+
+POINT = Schema(
+    _Point,
+    [
+        Field("x", "X", int, default=0),
+        Field("y", default=-1),
+        Field("label", mapping_key=True),
+    ],
+)
+
+
+def test_missing_keys_use_defaults() -> None:
+    """Missing and null values fall back to the field default."""
+    point = POINT.parse({"X": None})
+    assert (point.x, point.y, point.label) == (0, -1, None)
+    point = POINT.parse({"X": "3", "y": 4})
+    assert (point.x, point.y) == (3, 4)
+
+
+def test_batch_parsing() -> None:
+    """Lists and mappings of records are parsed in order."""
+    assert [p.x for p in POINT.parse_many([{"X": 1}, {"X": 2}])] == [1, 2]
+    assert POINT.parse_many(None) == []
+    points = POINT.parse_mapping({"a": {"X": 1}, "b": {"X": 2}})
+    assert [(p.label, p.x) for p in points] == [("a", 1), ("b", 2)]
+
+
+def test_player_without_optional_fields() -> None:
+    """Players lacking rarely set fields still parse."""
+    player = PLAYER.parse(
+        {"uuid": "abc", "displayname": "Abc", "networkExp": 0, "lastLogin": 0}
+    )
+    assert player.uuid == "abc"
+    assert player.spec_always_flying is False
+    assert player.knownAliases == ()
+    assert player.level == 1
+    assert player.lastLogin == dt.datetime.fromtimestamp(0)
+    assert player.firstLogin is None
+
+
+def test_nested_schemas() -> None:
+    """Bazaar products parse their order summaries."""
+    product = {
+        "product_id": "SUGAR",
+        "sell_summary": [{"amount": 1, "pricePerUnit": 2.0, "orders": 1}],
+        "buy_summary": [],
+        "quick_status": {"productId": "SUGAR", "buyPrice": 3.0},
+    }
+    (item,) = BAZAAR_ITEM.parse_mapping({"SUGAR": product})
+    assert item.name == "SUGAR"
+    assert item.sell_book.best_price == 2.0
+    assert item.quick_status.buyPrice == 3.0
+    assert item.quick_status.sellVolume is None
+
+
+def test_auction_claimed_defaults_to_false() -> None:
+    """Auctions without the claimed flag are unclaimed."""
+    auction = AUCTION_ITEM.parse({"uuid": "a", "end": 1000})
+    assert auction.claimed is False
+    assert auction.end == dt.datetime.fromtimestamp(1)
+
+
+def test_client_get_player_with_missing_fields() -> None:
+    """get_player no longer raises on partial player records."""
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        player = {"uuid": "abc", "displayname": "Abc"}
+        return json.dumps({"success": True, "player": player}).encode()
+
+    async def run() -> None:
+        client = Client("key")
+        client._fetch = fetch  # type: ignore
+        try:
+            player = await client.get_player("abc")
+        finally:
+            await client.close()
+        assert player.displayname == "Abc"
+        assert client.names.get("abc") == "abc"
+
+    asyncio.run(run())
+
+
+def test_projection_skips_other_fields() -> None:
+    """Fields left out of a projection are never read and stay None."""
+    point = POINT.parse({"X": "3", "y": 4}, ("x",))
+    assert (point.x, point.y) == (3, None)
+    assert POINT.parser(["x"]) is POINT.parser(("x",))
+    with pytest.raises(ValueError):
+        POINT.parser(("z",))
+
+
+def _auction(index: int) -> Dict[str, Any]:
+    return {
+        "uuid": f"auction{index}",
+        "item_name": "Hyperion",
+        "starting_bid": index,
+        "item_lore": "lore " * 200,
+        "item_bytes": "H4sIAAAAAAAAAE" * 100,
+        "bids": [{"amount": index, "bidder": "b"}] * 5,
+    }
+
+
+def test_projected_auctions_use_less_memory() -> None:
+    """A price only parse keeps a fraction of the memory of full auctions."""
+    body = json.dumps([_auction(index) for index in range(500)])
+
+    def retained(fields: Optional[Tuple[str, ...]]) -> int:
+        tracemalloc.start()
+        records = json.loads(body)
+        auctions = AUCTION_ITEM.parse_many(records, fields)
+        del records
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(auctions) == 500
+        return size
+
+    full = retained(None)
+    prices = retained(("uuid", "item_name", "starting_bid"))
+    assert prices * 4 < full
+
+
+def test_client_auctions_with_projection() -> None:
+    """Fetch methods forward the projection to the parser."""
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        page = {
+            "success": True,
+            "page": 0,
+            "totalPages": 1,
+            "totalAuctions": 1,
+            "lastUpdated": 0,
+            "auctions": [_auction(1)],
+        }
+        return json.dumps(page).encode()
+
+    async def run() -> None:
+        client = Client("key")
+        client._fetch = fetch  # type: ignore
+        try:
+            page = await client.auctions(0, ("uuid", "starting_bid"))
+        finally:
+            await client.close()
+        (auction,) = page.auctions
+        assert (auction.uuid, auction.starting_bid) == ("auction1", 1)
+        assert auction.item_bytes is None and auction.item_name is None
+
+    asyncio.run(run())
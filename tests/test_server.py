@@ -0,0 +1,83 @@
+"""Tests for the caching proxy."""
+
+import asyncio
+from typing import Any, Dict
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from asyncpixel.models.raw import RawResponse
+from asyncpixel.scheduler import PriorityScheduler
+from asyncpixel.server import ProxyServer
+
+
+class _FakeClient:
+    """Client answering raw requests slowly."""
+
+    def __init__(self) -> None:
+        """Init object."""
+        self.scheduler = PriorityScheduler()
+        self.calls = 0
+
+    async def get_raw(self, path: str, params: Dict, **kwargs: Any) -> RawResponse:
+        """Return a canned response after a short delay.
+
+        Args:
+            path (str): requested path
+            params (Dict): query parameters
+            **kwargs (Any): ignored options
+
+        Returns:
+            RawResponse: canned response
+
+        Raises:
+            TimeoutError: for the status path
+        """
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if path == "status":
+            raise asyncio.TimeoutError
+        return RawResponse(200, {}, b'{"success":true,"path":"%s"}' % path.encode())
+
+
+def test_identical_requests_are_coalesced() -> None:
+    """Concurrent identical requests share one upstream request."""
+
+    async def run() -> None:
+        upstream = _FakeClient()
+        server = ProxyServer(upstream)  # type: ignore
+        async with TestClient(TestServer(server.app())) as http:
+            responses = await asyncio.gather(
+                *(
+                    http.get("/player", params={"uuid": "a", "key": str(n)})
+                    for n in range(3)
+                )
+            )
+            bodies = [await response.read() for response in responses]
+            assert bodies == [b'{"success":true,"path":"player"}'] * 3
+            assert upstream.calls == 1
+            await http.get("/player", params={"uuid": "b"})
+            assert upstream.calls == 2
+
+            metrics = await (await http.get("/metrics")).text()
+            assert 'asyncpixel_requests_total{path="player"} 4' in metrics
+            assert "asyncpixel_coalesced_total 2" in metrics
+
+    asyncio.run(run())
+
+
+def test_timeouts_and_unknown_paths() -> None:
+    """Upstream timeouts are 504s and unknown paths share one label."""
+
+    async def run() -> None:
+        server = ProxyServer(_FakeClient())  # type: ignore
+        async with TestClient(TestServer(server.app())) as http:
+            response = await http.get("/status", params={"uuid": "a"})
+            assert response.status == 504
+            for path in ("/a", "/b/c"):
+                await http.get(path)
+            metrics = await (await http.get("/metrics")).text()
+            assert 'asyncpixel_errors_total{error="TimeoutError"} 1' in metrics
+            assert 'asyncpixel_requests_total{path="other"} 2' in metrics
+            assert 'path="a"' not in metrics
+
+    asyncio.run(run())
@@ -0,0 +1,145 @@
+"""Tests for the player snapshot store."""
+
+import asyncio
+import copy
+import json
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from asyncpixel import Client
+from asyncpixel.snapshots import flatten, SnapshotStore, unflatten
+
+
+def _records(count: int) -> List[Dict[str, Any]]:
+    rng = random.Random(2)
+    record: Dict[str, Any] = {
+        "uuid": "abc",
+        "displayname": "Abc",
+        "networkExp": 0,
+        "knownAliases": ["Abc"],
+        "stats": {
+            game: {f"stat{index}": 0 for index in range(50)}
+            for game in ("Bedwars", "SkyWars", "Arcade")
+        },
+    }
+    records = []
+    for _ in range(count):
+        record = copy.deepcopy(record)
+        record["networkExp"] += rng.randrange(100)
+        game = rng.choice(list(record["stats"]))
+        record["stats"][game][f"stat{rng.randrange(50)}"] += 1
+        if rng.random() < 0.2:
+            record.pop("mostRecentGameType", None)
+        else:
+            record["mostRecentGameType"] = game
+        records.append(record)
+    return records
+
+
+def test_flatten_round_trip() -> None:
+    """Nested objects survive flattening, lists stay values."""
+    record = {"a": {"b": 1, "c": {"d": [1, 2]}}, "e": {}, "f": None}
+    assert flatten(record) == {"a.b": 1, "a.c.d": [1, 2], "e": {}, "f": None}
+    assert unflatten(flatten(record)) == record
+
+
+def test_keys_with_dots_round_trip() -> None:
+    """Dots and backslashes inside keys are escaped, not nested."""
+    record = {"uuid": "abc", "stats": {"v1.8": {"a\\b.": 1}, "v1": {"8": 2}}}
+    assert flatten(record)["stats.v1\\.8.a\\\\b\\."] == 1
+    assert unflatten(flatten(record)) == record
+    store = SnapshotStore()
+    store.add(record, 0)
+    assert store.record("abc") == record
+
+
+def test_every_snapshot_is_rebuilt() -> None:
+    """Records are rebuilt at any time from keyframes and deltas."""
+    records = _records(30)
+    store = SnapshotStore(keyframe_every=8)
+    for time, record in enumerate(records):
+        store.add(record, time)
+    for time, record in enumerate(records):
+        assert store.record("abc", time + 0.5) == record
+    assert store.record("abc", -1) is None
+    assert store.record("abc") == records[-1]
+    player = store.player("abc", 3)
+    assert player is not None and player.networkExp == records[3]["networkExp"]
+    history = store._histories["abc"]
+    stored = sum(map(len, history.deltas)) + sum(map(len, history.keyframes.values()))
+    assert stored * 5 < sum(len(flatten(record)) for record in records)
+
+
+def test_diff_between_times() -> None:
+    """Diffs hold the paths whose value differs between two snapshots."""
+    records = _records(30)
+    store = SnapshotStore(keyframe_every=8)
+    for time, record in enumerate(records):
+        store.add(record, time)
+    for start, end in [(0, 29), (5, 9), (7, 8), (12, 12)]:
+        before, after = flatten(records[start]), flatten(records[end])
+        expected = {
+            path: (before.get(path), after.get(path))
+            for path in before.keys() | after.keys()
+            if before.get(path, KeyError) != after.get(path, KeyError)
+        }
+        assert store.diff("abc", start, end) == expected
+    assert store.diff("abc", -1, 0)["displayname"] == (None, "Abc")
+    assert store.diff("missing", 0) == {}
+
+
+def test_snapshots_in_order() -> None:
+    """Snapshots older than the last one are refused."""
+    store = SnapshotStore()
+    assert store.add({"uuid": "abc", "karma": 1}, 10) == 2
+    assert store.add({"uuid": "abc", "karma": 1}, 11) == 0
+    with pytest.raises(ValueError):
+        store.add({"uuid": "abc"}, 5)
+    assert list(store) == ["abc"] and store.times("abc") == [10, 11]
+
+
+def test_poll() -> None:
+    """Polling fetches the raw record and indexes the player name."""
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        player = {"uuid": "abc", "displayname": "Abc", "stats": {"Arcade": {}}}
+        return json.dumps({"success": True, "player": player}).encode()
+
+    async def run() -> None:
+        client = Client("key")
+        client._fetch = fetch  # type: ignore
+        store = SnapshotStore()
+        try:
+            player = await store.poll(client, "abc", 100)
+        finally:
+            await client.close()
+        assert player is not None and player.displayname == "Abc"
+        assert store.record("abc") == {
+            "uuid": "abc",
+            "displayname": "Abc",
+            "stats": {"Arcade": {}},
+        }
+        assert client.names.get("abc") == "abc"
+
+    asyncio.run(run())
+
+
+def test_poll_unknown_player() -> None:
+    """Unknown players are not stored."""
+
+    async def fetch(path: str, *args: Any) -> bytes:
+        return json.dumps({"success": True, "player": None}).encode()
+
+    async def run() -> None:
+        client = Client("key")
+        client._fetch = fetch  # type: ignore
+        store = SnapshotStore()
+        try:
+            assert await store.poll(client, "abc") is None
+        finally:
+            await client.close()
+        assert len(store) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,83 @@
+"""Tests for the status watcher."""
+
+import asyncio
+from typing import List
+
+from asyncpixel import Client
+from asyncpixel.models.status import Status
+from asyncpixel.watchers import GAME_CHANGE, OFFLINE, ONLINE, StatusWatcher
+
+
+class _FakeClient:
+    """Client answering status requests from a script."""
+
+    priority = staticmethod(Client.priority)
+
+    def __init__(self, statuses: List[Status]) -> None:
+        """Init object.
+
+        Args:
+            statuses (List[Status]): statuses returned in order
+        """
+        self.statuses = statuses
+
+    async def get_player_status(self, uuid: str) -> Status:
+        """Return the next scripted status.
+
+        Args:
+            uuid (str): uuid of player
+
+        Returns:
+            Status: scripted status
+        """
+        return self.statuses.pop(0)
+
+
+def test_watcher_emits_transitions_and_backs_off() -> None:
+    """Only transitions are emitted and offline players back off."""
+
+    async def run() -> None:
+        statuses = [
+            Status(online=False),
+            Status(online=False),
+            Status(online=True, gameType="BEDWARS", _mode="EIGHT_ONE"),
+            Status(online=True, gameType="SKYWARS", _mode="SOLO"),
+            Status(online=False),
+        ]
+        watcher = StatusWatcher(
+            _FakeClient(statuses), min_interval=10, backoff=2  # type: ignore
+        )
+        watcher.watch("a-b")
+        for _ in range(2):
+            await watcher._poll("ab")
+        assert watcher._players["ab"].interval == 40
+        for _ in range(3):
+            await watcher._poll("ab")
+        assert watcher._players["ab"].interval == 10
+        kinds = [watcher.events.get_nowait().kind for _ in range(3)]
+        assert kinds == [ONLINE, GAME_CHANGE, OFFLINE]
+        assert watcher.events.empty()
+
+    asyncio.run(run())
+
+
+def test_watcher_built_outside_the_loop() -> None:
+    """A watcher created before the event loop runs in it."""
+    statuses = [Status(online=False), Status(online=True, gameType="BEDWARS")]
+    watcher = StatusWatcher(
+        _FakeClient(statuses),  # type: ignore
+        ["ab"],
+        share=1,
+        key_limit=6000,
+        min_interval=0.01,
+    )
+
+    async def run() -> None:
+        watcher.start()
+        try:
+            event = await asyncio.wait_for(watcher.events.get(), 5)
+        finally:
+            await watcher.stop()
+        assert event.kind == ONLINE
+
+    asyncio.run(run())